@@ -3,6 +3,7 @@ from flask import Flask
 from flask_socketio import SocketIO
 from dotenv import load_dotenv
 from app.utils import validate_all_interview_files
+from app.cluster import socketio_queue_options
 
 # Load environment variables from .env file
 load_dotenv()
@@ -10,13 +11,14 @@ load_dotenv()
 # Initialize Flask-SocketIO
 socketio = SocketIO()
 
-def create_app():
+def create_app(async_mode=None):
     app = Flask(__name__)
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'default-secret-key')
     
     # Configure app settings
     app.config['UPLOAD_FOLDER'] = os.path.join(app.root_path, 'uploads')
     app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16 MB limit
+    app.config['MAX_CONNECTIONS'] = int(os.getenv('MAX_CONNECTIONS', '0'))  # 0 = unlimited
     
     # Ensure upload directory exists
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -36,6 +38,15 @@ def create_app():
     app.register_blueprint(main_blueprint)
     
     # Initialize Socket.IO with the app
-    socketio.init_app(app, cors_allowed_origins="*")
+    # Recordings are sent as single Socket.IO messages, so allow messages up to the upload limit.
+    # With several workers, room events are shared through SOCKETIO_MESSAGE_QUEUE.
+    # async_mode is chosen by run.py (None lets Flask-SocketIO pick).
+    socketio.init_app(
+        app,
+        async_mode=async_mode,
+        cors_allowed_origins="*",
+        max_http_buffer_size=app.config['MAX_CONTENT_LENGTH'],
+        **socketio_queue_options(os.getenv("SOCKETIO_MESSAGE_QUEUE"))
+    )
     
     return app 
\ No newline at end of file
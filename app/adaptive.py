@@ -0,0 +1,168 @@
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.metrics import metrics
+from app.resilience import provider_health
+
+# Spans whose duration reflects how fast the LLM is answering
+LLM_STAGES = ("llm", "evaluation")
+
+metrics.describe("adaptive_mode_degraded", "gauge", "1 while turns are switched to quick mode because an SLO is exceeded.")
+metrics.describe("adaptive_mode_downgrades_total", "counter", "Turns switched to quick mode by the adaptive controller.")
+
+
+class TurnDecision:
+    """How one turn should be generated."""
+
+    def __init__(self, quick: bool, downgraded: bool = False, reason: str = "",
+                 llm_latency: Optional[float] = None, queue_depth: int = 0):
+        self.quick = quick
+        self.downgraded = downgraded
+        self.reason = reason
+        self.llm_latency = llm_latency
+        self.queue_depth = queue_depth
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "mode": "quick" if self.quick else "full",
+            "reason": self.reason,
+            "llm_latency_s": round(self.llm_latency, 3) if self.llm_latency is not None else None,
+            "queue_depth": self.queue_depth,
+        }
+
+
+class AdaptiveModeController:
+    """
+    Switches turns to quick mode (precomputed questions, no LLM calls) while the
+    LLM is slower than its latency SLO or too many turns are queued, and back to
+    the full LLM path once both have recovered.
+
+    The LLM latency signal is a percentile of the ``llm``/``evaluation`` spans of
+    the last ``window_secs``. Hysteresis avoids flapping: the controller only
+    recovers once the signals are below ``recovery_ratio`` of their SLOs and it
+    has stayed degraded for at least ``min_hold_secs``. Quick turns make no LLM
+    calls, so when all samples have expired the next turn is let through as a
+    probe of the full path.
+    """
+
+    def __init__(self, enabled: bool = True, llm_latency_slo_secs: float = 8.0, queue_depth_slo: int = 20,
+                 percentile: float = 90.0, window_secs: float = 60.0, min_samples: int = 3,
+                 recovery_ratio: float = 0.7, min_hold_secs: float = 30.0, max_recent_decisions: int = 200):
+        self.enabled = enabled
+        self.llm_latency_slo_secs = llm_latency_slo_secs
+        self.queue_depth_slo = queue_depth_slo
+        self.percentile = percentile
+        self.window_secs = window_secs
+        self.min_samples = min_samples
+        self.recovery_ratio = recovery_ratio
+        self.min_hold_secs = min_hold_secs
+        self._samples: deque = deque(maxlen=1000)
+        self._recent_decisions: deque = deque(maxlen=max_recent_decisions)
+        self._degraded = False
+        self._degraded_since = 0.0
+        self._reason = ""
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "AdaptiveModeController":
+        return cls(
+            enabled=os.getenv("ADAPTIVE_QUICK_MODE", "true").lower() in ("1", "true", "yes"),
+            llm_latency_slo_secs=float(os.getenv("LLM_LATENCY_SLO", "8")),
+            queue_depth_slo=int(os.getenv("TURN_QUEUE_DEPTH_SLO", "20")),
+            min_hold_secs=float(os.getenv("ADAPTIVE_MIN_HOLD", "30")),
+        )
+
+    def record_latency(self, seconds: float):
+        """Add one LLM call duration to the latency window."""
+        with self._lock:
+            self._samples.append((time.monotonic(), seconds))
+
+    def on_span(self, stage: str, duration: float, error: bool):
+        if stage in LLM_STAGES:
+            self.record_latency(duration)
+
+    def llm_latency(self) -> Optional[float]:
+        """Percentile of LLM latency over the window, or None without enough recent samples."""
+        cutoff = time.monotonic() - self.window_secs
+        with self._lock:
+            recent = sorted(d for t, d in self._samples if t >= cutoff)
+        if len(recent) < self.min_samples:
+            return None
+        index = min(len(recent) - 1, int(round(self.percentile / 100.0 * (len(recent) - 1))))
+        return recent[index]
+
+    def decide(self, requested_quick: bool, queue_depth: int, interview_id: Optional[str] = None) -> TurnDecision:
+        """
+        Choose quick or full mode for the next turn.
+
+        Args:
+            requested_quick: The candidate enabled quick mode themselves
+            queue_depth: Turns currently in flight on this worker
+            interview_id: Interview the turn belongs to (for the decision log)
+
+        Returns:
+            TurnDecision: ``downgraded`` is True when the controller, not the
+            candidate, switched the turn to quick mode
+        """
+        latency = self.llm_latency()
+        if requested_quick or not self.enabled:
+            return TurnDecision(requested_quick, llm_latency=latency, queue_depth=queue_depth)
+
+        reasons = []
+        if latency is not None and latency > self.llm_latency_slo_secs:
+            reasons.append(f"llm_latency {latency:.1f}s > {self.llm_latency_slo_secs:.1f}s")
+        if queue_depth > self.queue_depth_slo:
+            reasons.append(f"queue_depth {queue_depth} > {self.queue_depth_slo}")
+        if provider_health.breaker("groq").is_open():
+            reasons.append("groq circuit open")
+
+        with self._lock:
+            now = time.monotonic()
+            if reasons:
+                if not self._degraded:
+                    print(f"Adaptive mode: switching turns to quick mode ({', '.join(reasons)})")
+                    self._degraded_since = now
+                self._degraded = True
+                self._reason = ", ".join(reasons)
+            elif self._degraded:
+                recovered = (
+                    (latency is None or latency < self.llm_latency_slo_secs * self.recovery_ratio)
+                    and queue_depth < self.queue_depth_slo * self.recovery_ratio
+                )
+                if recovered and now - self._degraded_since >= self.min_hold_secs:
+                    print("Adaptive mode: SLOs recovered, switching back to full mode")
+                    self._degraded = False
+                    self._reason = ""
+            degraded, reason = self._degraded, self._reason
+
+        metrics.set_gauge("adaptive_mode_degraded", 1 if degraded else 0)
+        decision = TurnDecision(degraded, downgraded=degraded, reason=reason, llm_latency=latency, queue_depth=queue_depth)
+        if degraded:
+            metrics.inc("adaptive_mode_downgrades_total")
+            with self._lock:
+                self._recent_decisions.append(dict(decision.to_dict(), interview_id=interview_id))
+        return decision
+
+    def status(self) -> Dict[str, Any]:
+        """Current state and recent downgrade decisions, for the admin endpoint."""
+        latency = self.llm_latency()
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "degraded": self._degraded,
+                "reason": self._reason,
+                "llm_latency_s": round(latency, 3) if latency is not None else None,
+                "llm_latency_slo_s": self.llm_latency_slo_secs,
+                "queue_depth_slo": self.queue_depth_slo,
+                "recent_decisions": list(self._recent_decisions),
+            }
+
+
+# Process-wide controller fed by the turn timing spans
+adaptive_mode = AdaptiveModeController.from_env()
+metrics.add_span_listener(adaptive_mode.on_span)
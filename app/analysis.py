@@ -0,0 +1,258 @@
+import re
+from collections import Counter
+from typing import Any, Dict, List
+
+# Bump when the analysis output changes so stored analyses are recomputed
+ANALYSIS_VERSION = 3
+
+MAX_SKILL_QUESTIONS = 3
+MAX_RESPONSIBILITY_QUESTIONS = 2
+MAX_PHRASE_CHARS = 90
+
+OPENING_QUESTION = "Could you tell me about your background and why you're interested in this position?"
+CLOSING_QUESTION = "Thank you for all your answers. Based on our conversation, is there anything else you'd like to add before we conclude the interview?"
+
+GENERIC_FOLLOWUPS = [
+    "Could you elaborate more on your previous answer?",
+    "That's interesting. How does that experience relate to the position you're applying for?",
+    "Can you provide another example that demonstrates your skills in this area?",
+    "What would you do differently if you encountered a similar situation in this role?",
+    "How do you think your approach would benefit our team?",
+    "What metrics or methods would you use to measure success in these efforts?",
+]
+
+# "experience with Python, Django and AWS" -> "Python, Django and AWS"
+SKILL_CONTEXT = re.compile(
+    r"\b(?:experience (?:with|in|using)|knowledge of|proficiency (?:in|with)|proficient (?:in|with)|"
+    r"skills? in|familiarity with|familiar with|expertise in|background in|understanding of)\s+([^.;:\n()]+)",
+    re.IGNORECASE,
+)
+RESPONSIBILITY_CONTEXT = re.compile(
+    r"\b(?:you will|you'll|responsible for|responsibilities include|duties include)\s+([^.;\n]+)",
+    re.IGNORECASE,
+)
+LIST_SEPARATOR = re.compile(r",|/|;|\band\b|\bor\b", re.IGNORECASE)
+BULLET = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+(.+)$")
+# Bullets that list requirements rather than responsibilities
+REQUIREMENT_BULLET = re.compile(
+    r"^(?:\d+\+?\s+years|strong|excellent|solid|proven|degree|bachelor|master|nice to have)\b", re.IGNORECASE
+)
+SENTENCE_END = re.compile(r"(?<=[.?!])\s+")
+WORD = re.compile(r"[A-Za-z][A-Za-z0-9+#.]*[A-Za-z0-9+#]|[A-Za-z]")
+
+# Capitalized words that are not skills
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "we", "you", "our", "your", "they", "i", "in", "on", "at", "for", "with",
+    "of", "to", "as", "is", "are", "be", "this", "that", "these", "it", "its", "team", "company", "role",
+    "position", "job", "candidate", "experience", "skills", "requirements", "responsibilities", "strong",
+    "excellent", "good", "ability", "years", "plus", "bonus", "nice", "required", "preferred", "must",
+    "will", "about", "us", "who", "what", "why", "how", "senior", "junior", "engineer", "developer",
+}
+
+IRREGULAR_VERBS = {"has": "have", "is": "are", "was": "were", "does": "do"}
+
+
+def _base_form(verb: str) -> str:
+    """Second-person form of a third-person singular verb ("handles" -> "handle"); other words unchanged."""
+    lower = verb.lower()
+    if lower in IRREGULAR_VERBS:
+        return IRREGULAR_VERBS[lower]
+    if lower.endswith("ies") and len(lower) > 4:
+        return verb[:-3] + "y"
+    if lower.endswith(("ches", "shes", "sses", "xes", "zes", "oes", "cuses")):
+        return verb[:-2]
+    if lower.endswith("s") and not lower.endswith(("ss", "us", "is")):
+        return verb[:-1]
+    return verb
+
+
+# Singular subject, an optional adverb, and the word after it (the verb, if it agrees with the subject)
+SINGULAR_SUBJECT_VERB = (
+    r"\b(?:the candidate|he|she)\s+((?:(?:always|often|usually|still|also|never|ever|really|\w+ly)\s+)?)([A-Za-z]+)\b"
+)
+
+# Third person (the candidate, he/she, singular they) to second person, in order: verb forms before pronouns
+SECOND_PERSON = [
+    (re.compile(p, re.IGNORECASE), replacement) for p, replacement in (
+        (r"\bthe candidate's\b", "your"),
+        (SINGULAR_SUBJECT_VERB, lambda m: f"you {m.group(1)}{_base_form(m.group(2))}"),
+        (r"\bthey've\b", "you've"),
+        (r"\bthey're\b", "you're"),
+        (r"\bthey'd\b", "you'd"),
+        (r"\bthey'll\b", "you'll"),
+        (r"\b(?:the candidate|he|she|they)\b", "you"),
+        (r"\b(?:themselves|themself|himself|herself)\b", "yourself"),
+        (r"\b(?:theirs|his|hers)\b(?=\s*[?.!,]|$)", "yours"),
+        (r"\b(?:their|his)\b", "your"),
+        # "her" before a noun is possessive ("her team"), otherwise an object ("ask her")
+        (r"\bher\b(?=\s+[a-z])", "your"),
+        (r"\b(?:them|him|her)\b", "you"),
+    )
+]
+
+QUESTION_OPENERS = (
+    "can", "could", "would", "will", "what", "how", "why", "when", "where", "which", "who", "tell",
+    "describe", "have", "has", "do", "did", "does", "are", "is", "share", "walk", "explain",
+)
+
+
+def _clean_phrase(text: str) -> str:
+    """Trim a phrase to a readable length without cutting words in half."""
+    text = re.sub(r"\s+", " ", text).strip(" -*•.,:;")
+    text = re.sub(r"^(?:a|an|the)\s+", "", text, flags=re.IGNORECASE)
+    text = re.sub(r"\s+(?:is|are|would be)\s+(?:a\s+)?(?:plus|bonus|preferred|required)$", "", text, flags=re.IGNORECASE)
+    if len(text) > MAX_PHRASE_CHARS:
+        text = text[:MAX_PHRASE_CHARS].rsplit(" ", 1)[0]
+    return text
+
+
+def _unique(items: List[str]) -> List[str]:
+    seen = set()
+    result = []
+    for item in items:
+        key = item.lower()
+        if item and key not in seen:
+            seen.add(key)
+            result.append(item)
+    return result
+
+
+def extract_skills(job_description: str, cv: str = "") -> List[str]:
+    """
+    Extract skills from a job description, most relevant first.
+
+    Skills come from phrases like "experience with X, Y and Z" and from technical
+    looking tokens (capitalized mid-sentence, or containing digits, "+", "#" or
+    inner capitals). Skills that also appear in the CV rank first.
+    """
+    return _rank_skills(_skill_candidates(job_description), cv)
+
+
+def _skill_candidates(job_description: str) -> List[str]:
+    candidates = []
+    for match in SKILL_CONTEXT.finditer(job_description):
+        for item in LIST_SEPARATOR.split(match.group(1)):
+            item = _clean_phrase(item)
+            if 1 < len(item) <= 40 and len(item.split()) <= 4 and item.lower() not in STOPWORDS:
+                candidates.append(item)
+
+    for sentence in SENTENCE_END.split(job_description.replace("\n", ". ")):
+        words = WORD.findall(sentence)
+        for position, word in enumerate(words):
+            word = word.rstrip(".")
+            if word.lower() in STOPWORDS or len(word) < 2:
+                continue
+            technical = any(c.isdigit() or c in "+#" for c in word) or any(c.isupper() for c in word[1:])
+            if technical or (position > 0 and word[0].isupper()):
+                candidates.append(word)
+    return candidates
+
+
+def _rank_skills(candidates: List[str], cv: str) -> List[str]:
+    counts = Counter(c.lower() for c in candidates)
+    cv_lower = cv.lower()
+    first_seen = {}
+    for index, candidate in enumerate(candidates):
+        first_seen.setdefault(candidate.lower(), (index, candidate))
+
+    def score(key):
+        in_cv = bool(re.search(r"(?<![A-Za-z0-9])" + re.escape(key) + r"(?![A-Za-z0-9])", cv_lower))
+        return (-(counts[key] + (2 if in_cv else 0)), first_seen[key][0])
+
+    return [first_seen[key][1] for key in sorted(first_seen, key=score)]
+
+
+def extract_responsibilities(job_description: str) -> List[str]:
+    """Extract responsibilities from bullet points (other than requirements) and "you will ..." sentences."""
+    responsibilities = []
+    for line in job_description.splitlines():
+        bullet = BULLET.match(line)
+        if bullet:
+            text = bullet.group(1).strip()
+            if SKILL_CONTEXT.match(text) or REQUIREMENT_BULLET.match(text):
+                continue
+            responsibilities.append(_clean_phrase(text))
+    for match in RESPONSIBILITY_CONTEXT.finditer(job_description):
+        responsibilities.append(_clean_phrase(match.group(1)))
+    return _unique([r for r in responsibilities if len(r.split()) >= 3])
+
+
+def _as_candidate_question(sentence: str) -> str:
+    """Turn an instruction such as "Ask how the candidate has used X?" into a question for the candidate."""
+    question = sentence.strip()
+    question = re.sub(r"^ask\s+(?:the candidate\s+|them\s+)?", "", question, flags=re.IGNORECASE)
+    if question != sentence.strip():
+        for pattern, replacement in SECOND_PERSON:
+            question = pattern.sub(replacement, question)
+        if question.lower().startswith("about "):
+            return "Could you tell me " + question
+        return "Could you tell me " + question[0].lower() + question[1:]
+
+    first_word = question.split(" ", 1)[0].lower()
+    if first_word in QUESTION_OPENERS:
+        return question[0].upper() + question[1:]
+    return "Could you " + question[0].lower() + question[1:]
+
+
+def extract_prompt_questions(system_prompt: str) -> List[str]:
+    """Extract the explicit questions from the interviewer instructions."""
+    questions = []
+    for sentence in SENTENCE_END.split(system_prompt or ""):
+        sentence = sentence.strip()
+        if sentence.endswith("?") and len(sentence) > 15:
+            questions.append(_as_candidate_question(sentence))
+    return _unique(questions)
+
+
+def analyze_interview(cv: str, job_description: str, system_prompt: str) -> Dict[str, Any]:
+    """
+    One-time analysis of an interview's inputs, stored with the interview.
+
+    Returns:
+        dict: ``skills``, ``responsibilities`` and ``prompt_questions`` plus
+        ``questions``, the ordered quick-mode question bank indexed by turn
+    """
+    return analyze_interviews([cv], job_description, system_prompt)[0]
+
+
+def analyze_interviews(cvs: List[str], job_description: str, system_prompt: str) -> List[Dict[str, Any]]:
+    """``analyze_interview`` for several CVs applying to the same job; the job is only parsed once."""
+    skill_candidates = _skill_candidates(job_description)
+    responsibilities = extract_responsibilities(job_description)
+    prompt_questions = extract_prompt_questions(system_prompt)
+
+    analyses = []
+    for cv in cvs:
+        skills = _rank_skills(skill_candidates, cv)
+        questions = [OPENING_QUESTION]
+        for skill in skills[:MAX_SKILL_QUESTIONS]:
+            questions.append(f"The role calls for {skill}. Can you share a specific example of how you've used it?")
+        for responsibility in responsibilities[:MAX_RESPONSIBILITY_QUESTIONS]:
+            questions.append(f'This role includes "{responsibility}". How has your previous experience prepared you for this?')
+        questions.extend(prompt_questions)
+        questions.extend(GENERIC_FOLLOWUPS)
+
+        analyses.append({
+            "version": ANALYSIS_VERSION,
+            "skills": skills,
+            "responsibilities": list(responsibilities),
+            "prompt_questions": list(prompt_questions),
+            "questions": questions,
+        })
+    return analyses
+
+
+def ensure_analysis(interview) -> Dict[str, Any]:
+    """Return the interview's analysis, computing it once for interviews created before it existed."""
+    analysis = interview.analysis
+    if not analysis or analysis.get("version") != ANALYSIS_VERSION:
+        analysis = interview.analysis = analyze_interview(interview.cv, interview.job_description, interview.system_prompt)
+    return analysis
+
+
+def question_for_turn(analysis: Dict[str, Any], question_num: int) -> str:
+    """Look up the quick-mode question for a turn; the closing question once the bank is used up."""
+    questions = analysis["questions"]
+    if question_num >= len(questions):
+        return CLOSING_QUESTION
+    return questions[question_num]
@@ -0,0 +1,293 @@
+"""
+Cohort analytics over the interview archive: rating distributions per job
+description, interview length, completion rates and time per turn.
+
+Interviews are read once into columnar NumPy arrays (one entry per interview,
+plus one flat array of turn durations) that are cached in
+``interviews/.analytics.npz``. A refresh only re-reads interview files that were
+added or changed since the last one, and drops interviews whose file is gone;
+all aggregates are computed on the arrays.
+"""
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.models.serialization import read_interview_file
+
+CACHE_FILENAME = ".analytics.npz"
+
+# Ratings are whole numbers from 1 to 10; unrated interviews are NaN
+RATING_BINS = 11
+
+# Job descriptions are grouped by their first line (usually the title)
+JOB_LABEL_CHARS = 80
+
+# Per-interview columns and their dtypes (ids and job labels are kept separately)
+COLUMNS = {
+    "mtime_ns": np.int64,
+    "created_at": np.float64,
+    "completed": np.bool_,
+    "rating": np.float64,
+    "turns": np.int32,
+    "duration_s": np.float64,
+}
+
+
+def _timestamp(value: Any) -> float:
+    # Epoch seconds in current interview files, ISO strings in older ones
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def job_label(job_description: str) -> str:
+    """Group key for a job description: its first non-empty line."""
+    for line in (job_description or "").splitlines():
+        line = line.strip(" \t-*#:")
+        if line:
+            return line[:JOB_LABEL_CHARS]
+    return "(no job description)"
+
+
+def extract_row(data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[float]]:
+    """
+    Columns of one stored interview dict, and its turn durations.
+
+    A turn lasts from one interviewer message to the next, so it covers the
+    candidate's answer and the time taken to produce the next question.
+    """
+    transcripts = data.get("transcripts") or []
+    ai_times = []
+    first = last = None
+    candidate_turns = 0
+    for message in transcripts:
+        t = _timestamp(message.get("timestamp"))
+        if message.get("role") == "candidate":
+            candidate_turns += 1
+        elif t == t:  # not NaN
+            ai_times.append(t)
+        if t == t:
+            first = t if first is None else min(first, t)
+            last = t if last is None else max(last, t)
+
+    rating = data.get("rating")
+    row = {
+        "created_at": _timestamp(data.get("created_at")),
+        "completed": bool(data.get("completed")),
+        "rating": float(rating) if rating is not None else np.nan,
+        "turns": candidate_turns,
+        "duration_s": (last - first) if first is not None else 0.0,
+    }
+    return row, [b - a for a, b in zip(ai_times, ai_times[1:])]
+
+
+def _percentiles(values: np.ndarray) -> Dict[str, Optional[float]]:
+    if values.size == 0:
+        return {"mean": None, "p50": None, "p90": None}
+    p50, p90 = np.percentile(values, [50, 90])
+    return {"mean": round(float(values.mean()), 2), "p50": round(float(p50), 2), "p90": round(float(p90), 2)}
+
+
+class CohortAnalytics:
+    """Columnar interview metrics with delta refresh."""
+
+    def __init__(self, storage_dir: str, max_age_secs: float = 60.0):
+        self.storage_dir = storage_dir
+        self.cache_path = os.path.join(storage_dir, CACHE_FILENAME)
+        self.max_age_secs = max_age_secs
+        self.ids = np.array([], dtype=str)
+        self.job_labels = np.array([], dtype=str)
+        self.columns = {name: np.array([], dtype=dtype) for name, dtype in COLUMNS.items()}
+        # Flat turn durations and the row each one belongs to
+        self.turn_seconds = np.array([], dtype=np.float64)
+        self.turn_rows = np.array([], dtype=np.int64)
+        self._refreshed_at = 0.0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> Dict[str, int]:
+        """
+        Bring the arrays up to date with the interview files.
+
+        Skipped if the last refresh is less than ``max_age_secs`` old, unless
+        ``force`` is set.
+
+        Returns:
+            dict: Interviews ``added``, ``updated`` and ``removed``, and the ``total``
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load_cache()
+                self._loaded = True
+            if not force and time.monotonic() - self._refreshed_at < self.max_age_secs:
+                return {"added": 0, "updated": 0, "removed": 0, "total": len(self.ids)}
+
+            on_disk = {}
+            with os.scandir(self.storage_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.endswith(".json") and not name.endswith("_corrupted.json"):
+                        on_disk[name[:-5]] = entry.stat().st_mtime_ns
+
+            rows = {interview_id: i for i, interview_id in enumerate(self.ids.tolist())}
+            mtimes = self.columns["mtime_ns"]
+            changed = [interview_id for interview_id, mtime in on_disk.items()
+                       if interview_id not in rows or mtimes[rows[interview_id]] != mtime]
+            keep = np.array([interview_id in on_disk for interview_id in rows], dtype=bool)
+            removed = int((~keep).sum())
+
+            # Re-read the delta: changed rows are dropped and appended again
+            delta_ids, delta_labels, delta_rows, delta_turns, delta_turn_rows = [], [], [], [], []
+            for interview_id in changed:
+                try:
+                    data = read_interview_file(os.path.join(self.storage_dir, f"{interview_id}.json"),
+                                               iso_timestamps=False)
+                except (OSError, ValueError) as e:
+                    print(f"Analytics: skipping interview {interview_id}: {e}")
+                    continue
+                row, turns = extract_row(data)
+                row["mtime_ns"] = on_disk[interview_id]
+                delta_turn_rows.extend([len(delta_ids)] * len(turns))
+                delta_turns.extend(turns)
+                delta_ids.append(interview_id)
+                delta_labels.append(job_label(data.get("job_description", "")))
+                delta_rows.append(row)
+            updated = sum(1 for interview_id in delta_ids if interview_id in rows)
+            if updated:
+                keep &= ~np.isin(self.ids, delta_ids)
+
+            if changed or removed:
+                self._apply(keep, delta_ids, delta_labels, delta_rows, delta_turns, delta_turn_rows)
+                self._save_cache()
+            self._refreshed_at = time.monotonic()
+            return {"added": len(delta_ids) - updated, "updated": updated, "removed": removed, "total": len(self.ids)}
+
+    def _apply(self, keep, delta_ids, delta_labels, delta_rows, delta_turns, delta_turn_rows):
+        # Caller holds self._lock
+        kept_rows = int(keep.sum())
+        # Old row index -> new row index for the turns of kept interviews
+        new_index = np.cumsum(keep) - 1
+        turn_keep = keep[self.turn_rows] if self.turn_rows.size else np.array([], dtype=bool)
+
+        self.ids = np.concatenate([self.ids[keep], np.array(delta_ids, dtype=str)])
+        self.job_labels = np.concatenate([self.job_labels[keep], np.array(delta_labels, dtype=str)])
+        for name, dtype in COLUMNS.items():
+            added = np.array([row[name] for row in delta_rows], dtype=dtype)
+            self.columns[name] = np.concatenate([self.columns[name][keep], added])
+        self.turn_seconds = np.concatenate([self.turn_seconds[turn_keep], np.array(delta_turns, dtype=np.float64)])
+        self.turn_rows = np.concatenate([
+            new_index[self.turn_rows[turn_keep]],
+            np.array(delta_turn_rows, dtype=np.int64) + kept_rows,
+        ]).astype(np.int64)
+
+    def report(self, since: Optional[float] = None, until: Optional[float] = None,
+               min_interviews: int = 1) -> Dict[str, Any]:
+        """
+        Aggregate metrics for interviews created in ``[since, until)`` (epoch seconds).
+
+        Args:
+            since: Only interviews created at or after this time
+            until: Only interviews created before this time
+            min_interviews: Leave out job descriptions with fewer interviews
+
+        Returns:
+            dict: ``overall`` metrics and ``by_job`` (one entry per job description,
+            most interviews first)
+        """
+        self.refresh()
+        with self._lock:
+            created = self.columns["created_at"]
+            mask = np.ones(len(self.ids), dtype=bool)
+            if since is not None:
+                mask &= created >= since
+            if until is not None:
+                mask &= created < until
+            completed = self.columns["completed"][mask]
+            rating = self.columns["rating"][mask]
+            turns = self.columns["turns"][mask]
+            duration = self.columns["duration_s"][mask]
+            labels = self.job_labels[mask]
+            turn_seconds = self.turn_seconds[mask[self.turn_rows]] if self.turn_rows.size else self.turn_seconds
+
+        rated = rating[~np.isnan(rating)]
+        overall = {
+            "interviews": int(mask.sum()),
+            "completed": int(completed.sum()),
+            "completion_rate": round(float(completed.mean()), 4) if completed.size else None,
+            "rating": self._rating_summary(rated),
+            "turns_per_interview": _percentiles(turns.astype(np.float64)),
+            "interview_duration_s": _percentiles(duration[completed]),
+            "seconds_per_turn": _percentiles(turn_seconds),
+        }
+
+        by_job = []
+        if labels.size:
+            names, group = np.unique(labels, return_inverse=True)
+            counts = np.bincount(group, minlength=len(names))
+            completed_counts = np.bincount(group, weights=completed, minlength=len(names))
+            has_rating = ~np.isnan(rating)
+            rated_counts = np.bincount(group[has_rating], minlength=len(names))
+            rating_sums = np.bincount(group[has_rating], weights=rating[has_rating], minlength=len(names))
+            # Rating histogram per job: one bincount over (job, rating) pairs
+            histograms = np.bincount(
+                group[has_rating] * RATING_BINS + rating[has_rating].astype(np.int64).clip(0, RATING_BINS - 1),
+                minlength=len(names) * RATING_BINS,
+            ).reshape(len(names), RATING_BINS)
+            mean_turns = np.bincount(group, weights=turns, minlength=len(names)) / counts
+
+            for i in np.argsort(-counts, kind="stable"):
+                if counts[i] < min_interviews:
+                    continue
+                by_job.append({
+                    "job": str(names[i]),
+                    "interviews": int(counts[i]),
+                    "completion_rate": round(float(completed_counts[i] / counts[i]), 4),
+                    "rated": int(rated_counts[i]),
+                    "mean_rating": round(float(rating_sums[i] / rated_counts[i]), 2) if rated_counts[i] else None,
+                    "rating_histogram": histograms[i, 1:].tolist(),
+                    "mean_turns": round(float(mean_turns[i]), 2),
+                })
+
+        return {"overall": overall, "by_job": by_job}
+
+    @staticmethod
+    def _rating_summary(rated: np.ndarray) -> Dict[str, Any]:
+        histogram = np.bincount(rated.astype(np.int64).clip(0, RATING_BINS - 1), minlength=RATING_BINS)
+        return {
+            "rated": int(rated.size),
+            "mean": round(float(rated.mean()), 2) if rated.size else None,
+            "median": float(np.median(rated)) if rated.size else None,
+            # Counts for ratings 1 to 10
+            "histogram": histogram[1:].tolist(),
+        }
+
+    def _load_cache(self):
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with np.load(self.cache_path, allow_pickle=False) as cache:
+                self.ids = cache["ids"]
+                self.job_labels = cache["job_labels"]
+                self.columns = {name: cache[name] for name in COLUMNS}
+                self.turn_seconds = cache["turn_seconds"]
+                self.turn_rows = cache["turn_rows"]
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Analytics: ignoring unreadable cache {self.cache_path}: {e}")
+
+    def _save_cache(self):
+        # Written to a temporary name and renamed, like interview files
+        tmp_path = f"{self.cache_path}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+        try:
+            np.savez(tmp_path, ids=self.ids, job_labels=self.job_labels, turn_seconds=self.turn_seconds,
+                     turn_rows=self.turn_rows, **self.columns)
+            os.replace(tmp_path, self.cache_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
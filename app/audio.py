@@ -0,0 +1,178 @@
+import os
+import shutil
+import subprocess
+from typing import Optional, Tuple
+
+import numpy as np
+
+# ffmpeg is used to decode the browser's webm/opus recordings to PCM; without it
+# audio preprocessing is skipped and recordings are passed through unchanged
+FFMPEG_PATH = os.getenv("FFMPEG_PATH") or shutil.which("ffmpeg")
+FFMPEG_TIMEOUT_SECS = 20
+
+# Sample rate used for analysis (speech energy sits well below 8 kHz)
+ANALYSIS_SAMPLE_RATE = 16000
+
+
+class AudioProcessingError(Exception):
+    pass
+
+
+def ffmpeg_available() -> bool:
+    """Check whether an ffmpeg binary is available."""
+    return bool(FFMPEG_PATH)
+
+
+def _run_ffmpeg(args, audio_data: bytes) -> bytes:
+    """Run ffmpeg reading from stdin and writing to stdout."""
+    if not FFMPEG_PATH:
+        raise AudioProcessingError("ffmpeg is not available")
+    try:
+        result = subprocess.run(
+            [FFMPEG_PATH, "-hide_banner", "-loglevel", "error", *args],
+            input=audio_data,
+            capture_output=True,
+            timeout=FFMPEG_TIMEOUT_SECS,
+        )
+    except subprocess.TimeoutExpired:
+        raise AudioProcessingError(f"ffmpeg timed out after {FFMPEG_TIMEOUT_SECS} seconds")
+    if result.returncode != 0:
+        raise AudioProcessingError(result.stderr.decode("utf-8", "replace").strip() or "ffmpeg failed")
+    return result.stdout
+
+
+def decode_to_pcm(audio_data: bytes, sample_rate: int = ANALYSIS_SAMPLE_RATE) -> np.ndarray:
+    """
+    Decode a recording to mono float32 PCM samples in [-1, 1].
+
+    Args:
+        audio_data: Encoded recording (any format ffmpeg understands)
+        sample_rate: Output sample rate in Hz
+
+    Returns:
+        numpy.ndarray: 1-D array of samples
+    """
+    raw = _run_ffmpeg(["-i", "pipe:0", "-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "pipe:1"], audio_data)
+    return np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def frame_energy_db(samples: np.ndarray, sample_rate: int, frame_ms: int = 20) -> np.ndarray:
+    """Compute the RMS energy (dBFS) of consecutive, non-overlapping frames."""
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    frame_count = len(samples) // frame_length
+    if frame_count == 0:
+        return np.empty(0, dtype=np.float32)
+    frames = samples[:frame_count * frame_length].reshape(frame_count, frame_length)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+    return 20.0 * np.log10(rms + 1e-10)
+
+
+def find_speech_bounds(
+    samples: np.ndarray,
+    sample_rate: int,
+    threshold_db: float = -45.0,
+    noise_margin_db: float = 12.0,
+    speech_level_db: float = -35.0,
+    frame_ms: int = 20,
+    min_speech_ms: int = 150,
+    padding_ms: int = 250,
+) -> Optional[Tuple[float, float]]:
+    """
+    Find where speech starts and ends using a simple energy-based voice activity detector.
+
+    A frame counts as voiced if it is louder than both ``threshold_db`` and the
+    estimated noise floor (10th percentile frame energy) plus ``noise_margin_db``.
+    Speech at a steady level (close-mic or compressed audio) raises the noise
+    floor estimate to the speech itself, so a clip without such frames is only
+    silent if it also has no frames louder than the absolute ``speech_level_db``;
+    otherwise those frames bound the speech.
+
+    Returns:
+        tuple: (start_seconds, end_seconds) padded by ``padding_ms``, or None if the
+        clip has less than ``min_speech_ms`` of voiced audio by both measures (near-silent)
+    """
+    energy = frame_energy_db(samples, sample_rate, frame_ms)
+    if energy.size == 0:
+        return None
+
+    noise_floor = float(np.percentile(energy, 10))
+    threshold = max(threshold_db, noise_floor + noise_margin_db)
+    voiced = np.flatnonzero(energy > threshold)
+
+    if voiced.size * frame_ms < min_speech_ms:
+        voiced = np.flatnonzero(energy > speech_level_db)
+        if voiced.size * frame_ms < min_speech_ms:
+            return None
+
+    duration = len(samples) / sample_rate
+    start = max(0.0, voiced[0] * frame_ms / 1000 - padding_ms / 1000)
+    end = min(duration, (voiced[-1] + 1) * frame_ms / 1000 + padding_ms / 1000)
+    return start, end
+
+
+def trim_audio(audio_data: bytes, start: float, end: float) -> bytes:
+    """Cut a webm/opus recording to [start, end] seconds without re-encoding."""
+    return _run_ffmpeg(
+        ["-ss", f"{start:.3f}", "-i", "pipe:0", "-t", f"{end - start:.3f}", "-c", "copy", "-f", "webm", "pipe:1"],
+        audio_data,
+    )
+
+
+def transcode_audio(audio_data: bytes, bitrate: str = "16k", sample_rate: int = ANALYSIS_SAMPLE_RATE,
+                    start: Optional[float] = None, end: Optional[float] = None) -> bytes:
+    """
+    Re-encode a recording as mono, low sample rate Opus speech in a webm container.
+
+    Args:
+        audio_data: Encoded recording
+        bitrate: Target Opus bitrate (ffmpeg syntax, e.g. "16k")
+        sample_rate: Output sample rate in Hz
+        start: Optional start of the clip to keep, in seconds
+        end: Optional end of the clip to keep, in seconds
+
+    Returns:
+        bytes: The transcoded webm/opus recording
+    """
+    args = []
+    if start is not None:
+        args += ["-ss", f"{start:.3f}"]
+    args += ["-i", "pipe:0"]
+    if start is not None and end is not None:
+        args += ["-t", f"{end - start:.3f}"]
+    args += [
+        "-vn", "-ac", "1", "-ar", str(sample_rate),
+        "-c:a", "libopus", "-b:a", bitrate, "-application", "voip",
+        "-f", "webm", "pipe:1",
+    ]
+    return _run_ffmpeg(args, audio_data)
+
+
+class PreprocessedAudio:
+    """Result of preprocessing one recording before speech-to-text."""
+
+    def __init__(self, audio: bytes, original_bytes: int, is_silent: bool = False,
+                 original_duration: float = 0.0, speech_duration: float = 0.0,
+                 processing_time: float = 0.0, skipped: bool = False, transcoded: bool = False):
+        self.audio = audio
+        self.original_bytes = original_bytes
+        self.is_silent = is_silent
+        self.original_duration = original_duration
+        self.speech_duration = speech_duration
+        self.processing_time = processing_time
+        self.skipped = skipped
+        self.transcoded = transcoded
+
+    @property
+    def bytes_saved(self) -> int:
+        return max(0, self.original_bytes - len(self.audio))
+
+    @property
+    def seconds_trimmed(self) -> float:
+        return max(0.0, self.original_duration - self.speech_duration)
+
+    @property
+    def bytes_per_minute(self) -> float:
+        """Size of the processed recording per minute of kept audio."""
+        if self.speech_duration <= 0:
+            return 0.0
+        return len(self.audio) * 60.0 / self.speech_duration
@@ -0,0 +1,84 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from app.metrics import metrics
+
+metrics.describe("llm_cache_requests_total", "counter", "LLM response cache lookups by result (hit or miss).")
+metrics.describe("llm_cache_hit_ratio", "gauge", "Share of LLM response cache lookups served from the cache.")
+metrics.describe("llm_cache_entries", "gauge", "Responses currently held in the LLM response cache.")
+
+
+def _normalize(text: str) -> str:
+    # Whitespace differences (indentation of prompt templates, trailing newlines) don't change the answer
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache with a TTL for deterministic LLM responses.
+
+    Keys hash the model, the request parameters and the whitespace-normalized
+    messages, so only requests that would produce the same answer share an entry.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_secs: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_secs = ttl_secs
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model: str, params: Dict[str, Any], messages: List[Dict[str, str]]) -> str:
+        payload = {
+            "model": model,
+            "params": params,
+            "messages": [{"role": m["role"], "content": _normalize(m["content"])} for m in messages],
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str, operation: str = "default") -> Optional[str]:
+        """Return the cached response, or None if missing or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < now:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            hit_ratio = self.hits / (self.hits + self.misses)
+            size = len(self._entries)
+
+        metrics.inc("llm_cache_requests_total", operation=operation, result="hit" if entry else "miss")
+        metrics.set_gauge("llm_cache_hit_ratio", round(hit_ratio, 4))
+        metrics.set_gauge("llm_cache_entries", size)
+        return entry[1] if entry else None
+
+    def put(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_secs, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            size = len(self._entries)
+        metrics.set_gauge("llm_cache_entries", size)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
@@ -0,0 +1,287 @@
+"""
+Multi-worker deployment support.
+
+Several worker processes share the interview storage directory and exchange
+Socket.IO room events through a message queue, so an event emitted by one worker
+reaches clients connected to any other. Each interview's Socket.IO connection is
+routed to a consistent worker (rendezvous hashing over ``SOCKETIO_WORKER_URLS``),
+which keeps its turns, streaming sessions and background work in one process.
+
+Message queue URLs (``SOCKETIO_MESSAGE_QUEUE``):
+    redis://host:6379/0     Redis (recommended for production)
+    amqp://..., kafka://... Other python-socketio backends
+    local://127.0.0.1:5590  Built-in TCP fan-out broker, a local stand-in for
+                            development, tests and single-host deployments
+"""
+import hashlib
+import json
+import os
+import secrets
+import signal
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse
+
+import socketio
+
+LOCAL_QUEUE_SCHEME = "local"
+DEFAULT_LOCAL_QUEUE_PORT = 5590
+
+
+# Flask's fallback SECRET_KEY is public, so it never authenticates anything
+INSECURE_KEYS = ("", "default-secret-key")
+
+
+def _explicit_authkey(env) -> Optional[str]:
+    key = env.get("SOCKETIO_QUEUE_AUTHKEY") or env.get("SECRET_KEY") or ""
+    return key if key not in INSECURE_KEYS else None
+
+
+def _queue_authkey() -> bytes:
+    """
+    Shared secret used to authenticate workers to the local broker.
+
+    Raises:
+        RuntimeError: If neither SOCKETIO_QUEUE_AUTHKEY nor a non-default SECRET_KEY is set
+    """
+    key = _explicit_authkey(os.environ)
+    if key is None:
+        raise RuntimeError("The local message queue needs SOCKETIO_QUEUE_AUTHKEY (or SECRET_KEY) set to a secret value")
+    return key.encode("utf-8")
+
+
+def parse_local_queue_url(url: str) -> Tuple[str, int]:
+    """Parse ``local://host:port`` into an address tuple."""
+    parsed = urlparse(url)
+    return parsed.hostname or "127.0.0.1", parsed.port or DEFAULT_LOCAL_QUEUE_PORT
+
+
+class LocalQueueBroker:
+    """
+    Minimal TCP fan-out broker: every message a worker publishes is forwarded to
+    all other connected workers. Messages are JSON, never pickles, so a client
+    that gets past the authkey still can't run code in the workers.
+    """
+
+    def __init__(self, address: Tuple[str, int] = ("127.0.0.1", DEFAULT_LOCAL_QUEUE_PORT), authkey: Optional[bytes] = None):
+        self.listener = Listener(address, authkey=authkey or _queue_authkey())
+        self.address = self.listener.address
+        self._connections = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def url(self) -> str:
+        host, port = self.address
+        return f"{LOCAL_QUEUE_SCHEME}://{host}:{port}"
+
+    def start(self) -> "LocalQueueBroker":
+        """Start accepting workers in a background thread."""
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        return self
+
+    def close(self):
+        self._closed = True
+        self.listener.close()
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+
+    def _accept_loop(self):
+        while not self._closed:
+            try:
+                conn = self.listener.accept()
+            except Exception as e:
+                if not self._closed:
+                    print(f"Message queue broker failed to accept a worker: {e}")
+                continue
+            with self._lock:
+                self._connections.append(conn)
+            threading.Thread(target=self._relay, args=(conn,), daemon=True).start()
+
+    def _relay(self, conn):
+        try:
+            while True:
+                message = conn.recv_bytes()
+                with self._lock:
+                    targets = [c for c in self._connections if c is not conn]
+                for target in targets:
+                    try:
+                        target.send_bytes(message)
+                    except Exception:
+                        self._drop(target)
+        except (EOFError, OSError):
+            pass
+        finally:
+            self._drop(conn)
+
+    def _drop(self, conn):
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+class LocalQueueManager(socketio.PubSubManager):
+    """python-socketio client manager that talks to a :class:`LocalQueueBroker`."""
+
+    name = "local"
+
+    def __init__(self, url: str, channel: str = "flask-socketio", write_only: bool = False, logger=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self.address = parse_local_queue_url(url)
+        # Checked here so a worker without a key fails at startup, not in its listener thread
+        self.authkey = _queue_authkey()
+        self._conn = None
+        self._send_lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+
+    def _connection(self):
+        with self._connect_lock:
+            if self._conn is None:
+                self._conn = Client(self.address, authkey=self.authkey)
+            return self._conn
+
+    def _reset(self):
+        with self._connect_lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except Exception:
+                    pass
+            self._conn = None
+
+    def _publish(self, data):
+        try:
+            message = json.dumps(data).encode("utf-8")
+        except (TypeError, ValueError) as e:
+            print(f"Cannot publish non-JSON Socket.IO message to {self.address}: {e}")
+            return
+        for attempt in range(2):
+            try:
+                conn = self._connection()
+                with self._send_lock:
+                    conn.send_bytes(message)
+                return
+            except (OSError, EOFError) as e:
+                self._reset()
+                if attempt:
+                    print(f"Failed to publish to message queue {self.address}: {e}")
+
+    def _listen(self):
+        retry_delay = 0.5
+        while True:
+            try:
+                conn = self._connection()
+                retry_delay = 0.5
+                while True:
+                    # Decoded here: PubSubManager would try unpickling raw bytes
+                    message = conn.recv_bytes()
+                    try:
+                        data = json.loads(message)
+                    except ValueError:
+                        print("Ignoring malformed message from the message queue")
+                        continue
+                    if isinstance(data, dict):
+                        yield data
+            except (OSError, EOFError) as e:
+                print(f"Message queue connection lost ({e}), reconnecting in {retry_delay:.1f}s")
+                self._reset()
+                time.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 10)
+
+
+def socketio_queue_options(url: Optional[str], write_only: bool = False) -> dict:
+    """
+    Build the Flask-SocketIO keyword arguments for a message queue URL.
+
+    ``local://`` URLs use :class:`LocalQueueManager`; everything else is handed to
+    Flask-SocketIO, which picks the matching python-socketio backend.
+    """
+    if not url:
+        return {}
+    if url.startswith(f"{LOCAL_QUEUE_SCHEME}://"):
+        return {"client_manager": LocalQueueManager(url, write_only=write_only)}
+    return {"message_queue": url}
+
+
+def worker_urls() -> List[str]:
+    """Public base URLs of all Socket.IO workers, from ``SOCKETIO_WORKER_URLS``."""
+    return [u.strip().rstrip("/") for u in os.getenv("SOCKETIO_WORKER_URLS", "").split(",") if u.strip()]
+
+
+def owner_worker(interview_id: str, workers: List[str]) -> Optional[str]:
+    """
+    Pick the worker that owns an interview using rendezvous (highest random weight)
+    hashing, so adding or removing a worker only moves the interviews it owned.
+    """
+    if not workers:
+        return None
+    return max(workers, key=lambda w: hashlib.sha1(f"{w}|{interview_id}".encode("utf-8")).digest())
+
+
+def socket_url_for(interview_id: str) -> Optional[str]:
+    """Socket.IO URL the candidate page should connect to, or None for single-process mode."""
+    workers = worker_urls()
+    if len(workers) < 2:
+        return None
+    return owner_worker(interview_id, workers)
+
+
+def run_workers(count: int, host: str = "127.0.0.1", base_port: int = 5000, extra_args: Optional[List[str]] = None):
+    """
+    Run ``count`` worker processes on consecutive ports behind a shared message queue.
+
+    Starts the built-in local broker unless ``SOCKETIO_MESSAGE_QUEUE`` is already set,
+    and exports ``SOCKETIO_WORKER_URLS`` so each worker can route interviews. Without
+    an explicit ``SOCKETIO_QUEUE_AUTHKEY`` or ``SECRET_KEY``, the broker and its
+    workers share a random key generated for this run.
+    """
+    env = os.environ.copy()
+    broker = None
+    if not env.get("SOCKETIO_MESSAGE_QUEUE"):
+        if _explicit_authkey(env) is None:
+            env["SOCKETIO_QUEUE_AUTHKEY"] = secrets.token_hex(32)
+        authkey = _explicit_authkey(env).encode("utf-8")
+        address = ("127.0.0.1", int(env.get("SOCKETIO_QUEUE_PORT", DEFAULT_LOCAL_QUEUE_PORT)))
+        broker = LocalQueueBroker(address, authkey=authkey).start()
+        env["SOCKETIO_MESSAGE_QUEUE"] = broker.url
+        print(f"Started local message queue broker at {broker.url}")
+
+    if not env.get("SOCKETIO_WORKER_URLS"):
+        public_host = "127.0.0.1" if host in ("0.0.0.0", "", "::") else host
+        env["SOCKETIO_WORKER_URLS"] = ",".join(f"http://{public_host}:{base_port + i}" for i in range(count))
+
+    script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "run.py")
+    processes = []
+    for i in range(count):
+        worker_env = dict(env, WORKER_INDEX=str(i))
+        cmd = [sys.executable, script, "--host", host, "--port", str(base_port + i), "--workers", "1",
+               *(extra_args or [])]
+        processes.append(subprocess.Popen(cmd, env=worker_env))
+        print(f"Started worker {i} (pid {processes[-1].pid}) on port {base_port + i}")
+
+    def shutdown(signum=None, frame=None):
+        for process in processes:
+            if process.poll() is None:
+                process.send_signal(signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    try:
+        for process in processes:
+            process.wait()
+    except KeyboardInterrupt:
+        shutdown()
+        for process in processes:
+            process.wait()
+    finally:
+        if broker:
+            broker.close()
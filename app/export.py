@@ -0,0 +1,222 @@
+"""
+Bulk export of interviews as gzip-compressed NDJSON or CSV.
+
+Interview files are read, projected and serialized one at a time and the
+output is compressed as it is produced, so memory use does not grow with the
+size of the archive. An incremental export (``since``) only includes
+interviews saved at or after that time; every export reports a ``watermark``
+(the time its directory scan started) to pass as ``since`` next time.
+
+Export from the command line with:
+    python -m app.export [--format csv] [--exclude cv,system_prompt] [--since 2024-05-01T00:00:00] > interviews.ndjson.gz
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from app.metrics import metrics
+from app.models.serialization import read_interview_file
+
+FORMATS = ("ndjson", "csv")
+
+# Fields of a stored interview, in export order; updated_at is the file's last save
+EXPORT_FIELDS = (
+    "id", "created_at", "updated_at", "completed", "rating", "verdict", "room_name", "cv", "job_description",
+    "system_prompt", "transcripts", "evaluations", "mode_decisions", "question_plan", "analysis",
+)
+
+# Compressed output is handed on in chunks of about this size
+CHUNK_SIZE = 64 * 1024
+
+metrics.describe("export_interviews_total", "counter", "Interviews written by bulk exports, by format.")
+
+
+def select_fields(fields: Optional[Sequence[str]] = None, exclude: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    Export columns after projection, in ``EXPORT_FIELDS`` order.
+
+    Raises:
+        ValueError: For an unknown field name
+    """
+    unknown = [f for f in list(fields or []) + list(exclude or []) if f not in EXPORT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown export fields: {', '.join(unknown)}; use {', '.join(EXPORT_FIELDS)}")
+    selected = [f for f in EXPORT_FIELDS if not fields or f in fields]
+    return [f for f in selected if f not in (exclude or [])]
+
+
+def parse_since(value: Union[str, float, None]) -> Optional[float]:
+    """
+    Epoch seconds of a ``since`` value given as epoch seconds or an ISO date.
+
+    Raises:
+        ValueError: If the value is neither
+    """
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def iter_interviews(storage_dir: str, since: Optional[float] = None,
+                    completed: Optional[bool] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stored interview dicts, one file at a time, with ``updated_at`` added.
+
+    Args:
+        storage_dir: Interview directory
+        since: Only interviews saved at or after this time (epoch seconds)
+        completed: Only completed (True) or unfinished (False) interviews
+    """
+    with os.scandir(storage_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.endswith(".json") or name.endswith("_corrupted.json"):
+                continue
+            try:
+                mtime = entry.stat().st_mtime
+                # Checked before the file is read, so incremental exports only open changed files
+                if since is not None and mtime < since:
+                    continue
+                data = read_interview_file(entry.path)
+            except FileNotFoundError:
+                continue  # deleted since the directory was listed
+            except (OSError, ValueError) as e:
+                print(f"Export: skipping interview file {name}: {e}")
+                continue
+            if completed is not None and bool(data.get("completed")) != completed:
+                continue
+            data["updated_at"] = datetime.fromtimestamp(mtime).isoformat()
+            yield data
+
+
+def _ndjson_lines(records: Iterable[Dict[str, Any]], fields: List[str]) -> Iterator[str]:
+    for data in records:
+        yield json.dumps({field: data.get(field) for field in fields}, ensure_ascii=False) + "\n"
+        metrics.inc("export_interviews_total", format="ndjson")
+
+
+def _csv_lines(records: Iterable[Dict[str, Any]], fields: List[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def take():
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    writer.writerow(fields)
+    yield take()
+    for data in records:
+        row = []
+        for field in fields:
+            value = data.get(field)
+            # Nested fields (transcripts, evaluations, ...) become JSON text in their cell
+            if isinstance(value, (list, dict)):
+                value = json.dumps(value, ensure_ascii=False)
+            row.append("" if value is None else value)
+        writer.writerow(row)
+        yield take()
+        metrics.inc("export_interviews_total", format="csv")
+
+
+def export_lines(records: Iterable[Dict[str, Any]], fmt: str = "ndjson",
+                 fields: Optional[List[str]] = None) -> Iterator[str]:
+    """
+    Serialize interview dicts one at a time.
+
+    Raises:
+        ValueError: For an unknown format
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    fields = fields or list(EXPORT_FIELDS)
+    return _ndjson_lines(records, fields) if fmt == "ndjson" else _csv_lines(records, fields)
+
+
+def gzip_stream(lines: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Compress text lines into a gzip stream, yielding chunks of about ``chunk_size`` bytes."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip header and trailer
+    pending = []
+    pending_size = 0
+    for line in lines:
+        compressed = compressor.compress(line.encode("utf-8"))
+        if compressed:
+            pending.append(compressed)
+            pending_size += len(compressed)
+            if pending_size >= chunk_size:
+                yield b"".join(pending)
+                pending = []
+                pending_size = 0
+    pending.append(compressor.flush())
+    yield b"".join(pending)
+
+
+def export_interviews(storage_dir: str, fmt: str = "ndjson", fields: Optional[List[str]] = None,
+                      since: Optional[float] = None, completed: Optional[bool] = None) -> Iterator[bytes]:
+    """
+    Gzip-compressed export of the interview archive.
+
+    Args:
+        storage_dir: Interview directory
+        fmt: ``ndjson`` or ``csv``
+        fields: Columns from :func:`select_fields`; all when None
+        since: Only interviews saved at or after this time (epoch seconds)
+        completed: Only completed (True) or unfinished (False) interviews
+
+    Returns:
+        iterator: Compressed chunks; nothing is read until iteration starts
+
+    Raises:
+        ValueError: For an unknown format
+    """
+    lines = export_lines(iter_interviews(storage_dir, since=since, completed=completed), fmt, fields)
+    return gzip_stream(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--storage-dir", default=os.path.join(os.getcwd(), "interviews"))
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument("--fields", help="Comma-separated columns to include (default: all)")
+    parser.add_argument("--exclude", help="Comma-separated columns to leave out, e.g. cv,system_prompt")
+    parser.add_argument("--since", help="Only interviews saved since this time (ISO date or epoch seconds)")
+    parser.add_argument("--completed", choices=["true", "false"], help="Only completed or unfinished interviews")
+    parser.add_argument("--output", help="Write to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    def split(value):
+        return [f.strip() for f in value.split(",") if f.strip()] if value else None
+
+    try:
+        fields = select_fields(split(args.fields), split(args.exclude))
+        since = parse_since(args.since)
+    except ValueError as e:
+        parser.error(str(e))
+    completed = None if args.completed is None else args.completed == "true"
+
+    watermark = time.time()
+    chunks = export_interviews(args.storage_dir, args.format, fields, since=since, completed=completed)
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if args.output:
+            out.close()
+    # Pass this as --since on the next run to export only what changed
+    print(f"Export watermark: {watermark}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+import itertools
+import json
+import os
+import queue
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process only
+    fcntl = None
+
+from app.metrics import metrics
+
+QUEUED = "queued"
+RUNNING = "running"
+FAILED = "failed"
+
+metrics.describe("background_jobs_queued", "gauge", "Background jobs waiting for a worker.")
+metrics.describe("background_jobs_total", "counter", "Background jobs finished, by kind and result.")
+metrics.describe("background_jobs_recovered_total", "counter", "Unfinished background jobs picked up again after a restart.")
+
+
+class JobQueue:
+    """
+    Persistent priority queue for slow background work (final assessments).
+
+    Every job is stored as a JSON file in ``storage_dir`` until it has finished,
+    so jobs that were queued or running when the server stopped are picked up
+    again by :meth:`recover`. Lower ``priority`` values run first; jobs of equal
+    priority run in submission order. While a job runs its lock file is held,
+    so several worker processes sharing the directory never run the same job.
+    A job that raises is retried up to ``max_attempts`` times and then kept
+    with status ``failed`` until a job with the same id is submitted again.
+    """
+
+    def __init__(self, storage_dir: str = "jobs", workers: int = 2, max_attempts: int = 3):
+        self.storage_dir = storage_dir
+        self.workers = workers
+        self.max_attempts = max_attempts
+        os.makedirs(self.storage_dir, exist_ok=True)
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._started = False
+        self._start_lock = threading.Lock()
+
+    def register(self, kind: str, handler: Callable[[Dict[str, Any]], None]):
+        """Set the function that runs jobs of ``kind``; it receives the job dict."""
+        self._handlers[kind] = handler
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, kind: str, payload: Dict[str, Any], priority: int = 0,
+               job_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Store a job and queue it for the worker pool.
+
+        Args:
+            kind: Registered job kind
+            payload: JSON-serializable job arguments
+            priority: Lower values run first
+            job_id: Optional fixed id; a job with the same id that hasn't finished
+                yet is not queued twice, and one that failed is replaced and
+                runs again with fresh attempts
+
+        Returns:
+            dict: The stored job, or None if a job with ``job_id`` is already pending
+        """
+        self.start()
+        job_id = job_id or str(uuid.uuid4())
+        if os.path.exists(self._job_path(job_id)):
+            existing = self._read(job_id)
+            if existing is None or existing["status"] != FAILED:
+                return None
+            print(f"Resubmitting failed background job {job_id} ({kind})")
+
+        now = datetime.now().isoformat()
+        job = {
+            "id": job_id,
+            "kind": kind,
+            "priority": priority,
+            "payload": payload,
+            "status": QUEUED,
+            "attempts": 0,
+            "created_at": now,
+            "updated_at": now,
+        }
+        self._write(job)
+        self._enqueue(job)
+        return job
+
+    def start(self):
+        """Recover unfinished jobs and start the worker pool (only once per process)."""
+        with self._start_lock:
+            if self._started:
+                return
+            self._started = True
+        self.recover()
+        for i in range(self.workers):
+            threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True).start()
+
+    def recover(self) -> int:
+        """Queue every stored job that was queued or running when the server stopped."""
+        recovered = 0
+        filenames = sorted(os.listdir(self.storage_dir))
+        for filename in filenames:
+            # Lock files left behind by finished jobs (e.g. by a crash between removing the job and its lock)
+            if filename.endswith(".lock") and f"{filename[1:-5]}.json" not in filenames:
+                self._remove_lock(filename[1:-5])
+                continue
+            if not filename.endswith(".json"):
+                continue
+            job = self._read(filename[:-5])
+            if job is None or job["status"] == FAILED:
+                continue
+            self._enqueue(job)
+            recovered += 1
+            metrics.inc("background_jobs_recovered_total", kind=job["kind"])
+        if recovered:
+            print(f"Recovered {recovered} unfinished background jobs")
+        return recovered
+
+    def _enqueue(self, job: Dict[str, Any]):
+        self._queue.put((job["priority"], next(self._sequence), job["id"]))
+        metrics.set_gauge("background_jobs_queued", self._queue.qsize())
+
+    def _work(self):
+        while True:
+            _, _, job_id = self._queue.get()
+            metrics.set_gauge("background_jobs_queued", self._queue.qsize())
+            try:
+                self._run(job_id)
+            except Exception as e:
+                print(f"Error running background job {job_id}: {e}")
+
+    def _run(self, job_id: str):
+        with self._claim(job_id) as claimed:
+            # Another worker process has it, or it finished since it was queued
+            if not claimed:
+                return
+            retry = self._run_claimed(job_id)
+        # Requeued only once the claim is released, or another worker could find it still locked and drop it
+        if retry is not None:
+            self._enqueue(retry)
+
+    def _run_claimed(self, job_id: str) -> Optional[Dict[str, Any]]:
+        # Returns the job if it failed and should be tried again
+        job = self._read(job_id)
+        if job is None or job["status"] == FAILED:
+            self._remove_lock(job_id)
+            return None
+
+        handler = self._handlers.get(job["kind"])
+        if handler is None:
+            print(f"No handler registered for background job kind '{job['kind']}'")
+            return None
+
+        job["status"] = RUNNING
+        job["attempts"] += 1
+        job["updated_at"] = datetime.now().isoformat()
+        self._write(job)
+
+        try:
+            handler(job)
+        except Exception as e:
+            print(f"Background job {job_id} ({job['kind']}) failed on attempt {job['attempts']}: {e}")
+            job["error"] = str(e)
+            job["updated_at"] = datetime.now().isoformat()
+            if job["attempts"] >= self.max_attempts:
+                job["status"] = FAILED
+                self._write(job)
+                self._remove_lock(job_id)
+                metrics.inc("background_jobs_total", kind=job["kind"], result="failed")
+                return None
+            job["status"] = QUEUED
+            self._write(job)
+            return job
+
+        os.remove(self._job_path(job_id))
+        self._remove_lock(job_id)
+        metrics.inc("background_jobs_total", kind=job["kind"], result="done")
+        return None
+
+    @contextmanager
+    def _claim(self, job_id: str):
+        if fcntl is None:
+            yield True
+            return
+        lock_path = self._lock_path(job_id)
+        with open(lock_path, "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                yield False
+                return
+            # The previous holder may have finished the job and removed the lock file after we
+            # opened it; a lock on a removed file protects nothing
+            try:
+                current = os.stat(lock_path).st_ino == os.fstat(lock_file.fileno()).st_ino
+            except FileNotFoundError:
+                current = False
+            if not current:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _remove_lock(self, job_id: str):
+        # Called with the lock held (or for a job that no longer exists), before it is released
+        try:
+            os.remove(self._lock_path(job_id))
+        except FileNotFoundError:
+            pass
+
+    def _job_path(self, job_id: str) -> str:
+        return os.path.join(self.storage_dir, f"{job_id}.json")
+
+    def _lock_path(self, job_id: str) -> str:
+        return os.path.join(self.storage_dir, f".{job_id}.lock")
+
+    def _read(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._job_path(job_id), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Skipping unreadable background job {job_id}: {e}")
+            return None
+
+    def _write(self, job: Dict[str, Any]):
+        # Same atomic write as interview files
+        path = self._job_path(job["id"])
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(job, f, indent=2)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
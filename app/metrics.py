@@ -0,0 +1,221 @@
+import time
+import threading
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple, Any
+
+# Latency buckets (seconds) covering everything from a disk write to a slow LLM call
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+# Stages of a single interview turn, in the order they normally happen
+TURN_STAGES = ("audio_decode", "audio_preprocess", "upload_save", "stt", "evaluation", "llm", "tts", "disk_write", "emit", "turn")
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: Optional[Tuple[str, str]] = None) -> str:
+    """Render a label set in Prometheus text format."""
+    pairs = list(labels)
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    rendered = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in pairs
+    )
+    return "{" + rendered + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Histogram:
+    """Cumulative histogram for one label set."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Thread-safe registry of counters, gauges and histograms rendered as Prometheus text."""
+
+    def __init__(self, recent_spans_per_interview: int = 100, max_tracked_interviews: int = 500):
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+        self._counters: Dict[str, Dict[Tuple, float]] = {}
+        self._gauges: Dict[str, Dict[Tuple, float]] = {}
+        self._histograms: Dict[str, Dict[Tuple, _Histogram]] = {}
+        self._recent_spans: "OrderedDict[str, deque]" = OrderedDict()
+        self._recent_spans_per_interview = recent_spans_per_interview
+        self._max_tracked_interviews = max_tracked_interviews
+        self._span_listeners: List[Callable[[str, float, bool], None]] = []
+
+    def describe(self, name: str, kind: str, help_text: str, buckets: Optional[Tuple[float, ...]] = None):
+        """Register a metric family with its type ("counter", "gauge" or "histogram") and help text."""
+        with self._lock:
+            self._help[name] = (kind, help_text)
+            if kind == "histogram":
+                self._buckets[name] = tuple(buckets or DEFAULT_BUCKETS)
+                self._histograms.setdefault(name, {})
+            elif kind == "counter":
+                self._counters.setdefault(name, {})
+            else:
+                self._gauges.setdefault(name, {})
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        """Increment a counter."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            family = self._counters.setdefault(name, {})
+            family[key] = family.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels):
+        """Set a gauge to an absolute value."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, value: float, **labels):
+        """Record an observation in a histogram."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            family = self._histograms.setdefault(name, {})
+            histogram = family.get(key)
+            if histogram is None:
+                histogram = family[key] = _Histogram(self._buckets.get(name, DEFAULT_BUCKETS))
+            histogram.observe(value)
+
+    def get_counter(self, name: str, **labels) -> float:
+        """Return the current value of a counter (0 if never incremented)."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            return self._counters.get(name, {}).get(key, 0)
+
+    @contextmanager
+    def span(self, stage: str, interview_id: Optional[str] = None, mode: Optional[str] = None):
+        """
+        Time a block as one stage of an interview turn.
+
+        The duration is aggregated into the ``interview_stage_seconds`` histogram by
+        stage and mode, and kept in a bounded per-interview buffer of recent spans.
+        Interview IDs are deliberately not used as histogram labels to keep the
+        number of Prometheus series bounded.
+        """
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except Exception:
+            error = True
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            self.record_span(stage, duration, interview_id=interview_id, mode=mode, error=error)
+
+    def add_span_listener(self, listener: Callable[[str, float, bool], None]):
+        """Call ``listener(stage, duration, error)`` for every recorded span."""
+        self._span_listeners.append(listener)
+
+    def record_span(self, stage: str, duration: float, interview_id: Optional[str] = None,
+                    mode: Optional[str] = None, error: bool = False):
+        """Record an already measured stage duration."""
+        self.observe("interview_stage_seconds", duration, stage=stage, mode=mode or "full")
+        if error:
+            self.inc("interview_stage_errors_total", stage=stage, mode=mode or "full")
+        for listener in self._span_listeners:
+            try:
+                listener(stage, duration, error)
+            except Exception as e:
+                print(f"Error in span listener: {e}")
+        if not interview_id:
+            return
+
+        with self._lock:
+            spans = self._recent_spans.get(interview_id)
+            if spans is None:
+                spans = self._recent_spans[interview_id] = deque(maxlen=self._recent_spans_per_interview)
+                while len(self._recent_spans) > self._max_tracked_interviews:
+                    self._recent_spans.popitem(last=False)
+            else:
+                self._recent_spans.move_to_end(interview_id)
+            spans.append({
+                "stage": stage,
+                "mode": mode or "full",
+                "duration_s": round(duration, 6),
+                "finished_at": time.time(),
+                "error": error,
+            })
+
+    def recent_spans(self, interview_id: str) -> List[Dict[str, Any]]:
+        """Return the most recent spans recorded for an interview."""
+        with self._lock:
+            return list(self._recent_spans.get(interview_id, ()))
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, family in sorted(self._counters.items()):
+                self._render_header(lines, name, "counter")
+                for labels, value in sorted(family.items()):
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+            for name, family in sorted(self._gauges.items()):
+                self._render_header(lines, name, "gauge")
+                for labels, value in sorted(family.items()):
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+            for name, family in sorted(self._histograms.items()):
+                self._render_header(lines, name, "histogram")
+                for labels, histogram in sorted(family.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                        cumulative += count
+                        le = ("le", _format_value(bound))
+                        lines.append(f"{name}_bucket{_format_labels(labels, le)} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def _render_header(self, lines: List[str], name: str, default_kind: str):
+        kind, help_text = self._help.get(name, (default_kind, ""))
+        if help_text:
+            lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+
+# Process-wide registry used by the routes and services
+metrics = MetricsRegistry()
+metrics.describe("interview_stage_seconds", "histogram", "Time spent in each stage of an interview turn.")
+metrics.describe("interview_stage_errors_total", "counter", "Interview turn stages that raised an exception.")
+metrics.describe("provider_errors_total", "counter", "Failed or timed out calls to external providers.")
+metrics.describe("provider_fallbacks_total", "counter", "Responses served from a fallback instead of the provider.")
+metrics.describe("audio_preprocess_bytes_saved_total", "counter", "Recording bytes removed by silence trimming before STT.")
+metrics.describe("audio_preprocess_seconds_trimmed_total", "counter", "Seconds of leading/trailing silence trimmed before STT.")
+metrics.describe("audio_silent_clips_total", "counter", "Recordings rejected as silent without calling STT.")
+
+
+def record_provider_error(provider: str, operation: str):
+    """Count a failed call to an external provider (Groq, Deepgram, LiveKit)."""
+    metrics.inc("provider_errors_total", provider=provider, operation=operation)
+
+
+def record_provider_fallback(provider: str, operation: str):
+    """Count a response that was served from a fallback instead of the provider."""
+    metrics.inc("provider_fallbacks_total", provider=provider, operation=operation)
@@ -0,0 +1,52 @@
+"""
+Rewrite interview files in the current storage format.
+
+Completed interviews are migrated the first time they are read and live ones
+on their next save, so this is only needed to convert a whole archive at once
+(or to convert it back with ``--format 2`` or ``--format 1`` before rolling
+back to older code).
+Unfinished interviews are only touched once they have been idle for
+``--idle-hours``, because their turn handlers save them from a copy loaded
+at the start of each turn.
+
+Usage:
+    python -m app.migrate [--storage-dir interviews] [--format 3] [--no-compress] [--idle-hours 24]
+"""
+import argparse
+import os
+import time
+
+from app.models import InterviewStorage
+from app.models.serialization import COMPACT_VERSION, FORMAT_VERSION, LEGACY_VERSION
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--storage-dir", default=os.path.join(os.getcwd(), "interviews"))
+    parser.add_argument("--format", type=int, choices=[LEGACY_VERSION, COMPACT_VERSION, FORMAT_VERSION], default=FORMAT_VERSION)
+    parser.add_argument("--no-compress", action="store_true", help="Don't compress completed interviews")
+    parser.add_argument("--idle-hours", type=float, default=24.0,
+                        help="Also migrate unfinished interviews not saved for this long")
+    args = parser.parse_args(argv)
+
+    storage = InterviewStorage(args.storage_dir, compress_completed=not args.no_compress,
+                               format_version=args.format)
+    start = time.perf_counter()
+    total = migrated = 0
+    before = after = 0
+    for name in sorted(os.listdir(args.storage_dir)):
+        if not name.endswith(".json") or name.endswith("_corrupted.json"):
+            continue
+        total += 1
+        path = os.path.join(args.storage_dir, name)
+        size = os.path.getsize(path)
+        if storage.migrate_file(name[:-5], wait=True, idle_secs=args.idle_hours * 3600):
+            migrated += 1
+            before += size
+            after += os.path.getsize(path)
+    print(f"Migrated {migrated} of {total} interview files to format {args.format} "
+          f"in {time.perf_counter() - start:.1f}s ({before / 1e6:.1f} MB -> {after / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
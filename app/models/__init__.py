@@ -1,3 +1,4 @@
 from app.models.interview import Interview, InterviewStorage
+from app.models.index import InterviewIndex
 
-__all__ = ['Interview', 'InterviewStorage'] 
\ No newline at end of file
+__all__ = ['Interview', 'InterviewStorage', 'InterviewIndex'] 
\ No newline at end of file
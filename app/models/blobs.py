@@ -0,0 +1,106 @@
+"""
+Content-addressed storage for long texts that many interviews share.
+
+Campaigns create thousands of interviews with the same job description and
+system prompt. Version 3 interview files store such texts once, as
+``.blobs/<sha256>.txt`` next to the interview files, and reference them by
+hash. Decoded texts are cached, so every interview loaded with the same job
+description holds the same string object.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict
+
+BLOB_DIR = ".blobs"
+
+# Shorter texts are stored inline: a reference would save little and cost a read
+MIN_BLOB_CHARS = 256
+
+
+def blob_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class BlobStore:
+    """
+    Write-once text blobs keyed by the SHA-256 of their content, with an LRU
+    cache of the decoded texts.
+
+    Blobs are never rewritten, so they need no locking: two workers storing
+    the same text write identical files.
+    """
+
+    def __init__(self, directory: str, max_cached: int = 256):
+        self.directory = directory
+        self.max_cached = max_cached
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, text: str) -> str:
+        """Store ``text`` (if it isn't stored yet) and return its key."""
+        key = blob_key(text)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return key
+        path = self._path(key)
+        if not os.path.exists(path):
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(text)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        self._remember(key, text)
+        return key
+
+    def get(self, key: str) -> str:
+        """
+        The text stored under ``key``.
+
+        Raises:
+            FileNotFoundError: If there is no such blob (an OSError, not a
+                ValueError, so a lost blob directory is never mistaken for
+                corrupted interview files and "repaired")
+        """
+        with self._lock:
+            text = self._cache.get(key)
+            if text is not None:
+                self._cache.move_to_end(key)
+                return text
+        if len(key) != 64 or not all(c in "0123456789abcdef" for c in key):
+            raise FileNotFoundError(f"Invalid blob key {key!r}")
+        with open(self._path(key), "r", encoding="utf-8") as f:
+            text = f.read()
+        return self._remember(key, text)
+
+    def _remember(self, key: str, text: str) -> str:
+        with self._lock:
+            # Another thread may have cached it meanwhile; keep one shared string
+            text = self._cache.setdefault(key, text)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        return text
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.txt")
+
+
+_stores: Dict[str, BlobStore] = {}
+_stores_lock = threading.Lock()
+
+
+def blob_store_for(storage_dir: str) -> BlobStore:
+    """The blob store of an interview directory, shared by everything in this process that reads it."""
+    directory = os.path.join(os.path.abspath(storage_dir), BLOB_DIR)
+    with _stores_lock:
+        store = _stores.get(directory)
+        if store is None:
+            store = _stores[directory] = BlobStore(directory)
+        return store
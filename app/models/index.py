@@ -0,0 +1,269 @@
+import base64
+import json
+import os
+import threading
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+# Fields kept per interview; everything the listing API can sort or filter on
+SUMMARY_FIELDS = ("id", "created_at", "completed", "rating")
+SORT_FIELDS = ("created_at", "rating")
+
+
+def summarize(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Listing summary of a stored interview dict."""
+    return {field: data[field] for field in SUMMARY_FIELDS}
+
+
+def _sort_key(summary: Dict[str, Any], sort: str) -> Tuple:
+    if sort == "rating":
+        # Unrated interviews sort below every rating
+        rating = summary["rating"] if summary["rating"] is not None else -1
+        return (rating, summary["created_at"], summary["id"])
+    return (summary["created_at"], summary["id"])
+
+
+def encode_cursor(sort: str, order: str, key: Tuple) -> str:
+    raw = json.dumps([sort, order, list(key)]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str, sort: str, order: str) -> Tuple:
+    """
+    Decode a cursor returned by :meth:`InterviewIndex.query`.
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another sort order
+    """
+    try:
+        cursor_sort, cursor_order, key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort or cursor_order != order:
+        raise ValueError("Cursor was issued for a different sort order")
+    return tuple(key)
+
+
+class InterviewIndex:
+    """
+    Incrementally maintained listing index of all interviews.
+
+    Summaries are kept in memory with one sorted key list per sort field, so a
+    page is a binary search plus ``limit`` steps no matter how many interviews
+    exist. Changes are appended to a JSON-lines log next to the interview files
+    (last line per id wins, ``deleted`` lines drop an id); every worker process tails the log before a query,
+    so summaries saved by other workers show up too. The log is compacted once
+    it holds more than twice as many lines as interviews, and rebuilt from a
+    directory scan (``rebuild``) only if it doesn't exist yet.
+    """
+
+    def __init__(self, log_path: str, rebuild: Callable[[], Iterable[Dict[str, Any]]]):
+        self.log_path = log_path
+        self._rebuild = rebuild
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+        self._keys: Dict[str, List[Tuple]] = {sort: [] for sort in SORT_FIELDS}
+        self._offset = 0
+        self._inode = None
+        self._log_lines = 0
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._summaries)
+
+    def update(self, data: Dict[str, Any]):
+        """Record a saved interview; the log is only written when its summary changed."""
+        summary = summarize(data)
+        with self._lock:
+            self._refresh()
+            if self._summaries.get(summary["id"]) == summary:
+                return
+            self._append([summary])
+
+    def update_many(self, items: Iterable[Dict[str, Any]]):
+        """Record several saved interviews with one write to the log."""
+        with self._lock:
+            self._refresh()
+            changed = [summary for summary in map(summarize, items) if self._summaries.get(summary["id"]) != summary]
+            if changed:
+                self._append(changed)
+
+    def remove(self, interview_id: str):
+        """Drop an interview whose file was deleted."""
+        with self._lock:
+            self._refresh()
+            if interview_id in self._summaries:
+                self._append([{"id": interview_id, "deleted": True}])
+
+    def _append(self, entries: List[Dict[str, Any]]):
+        # Caller holds self._lock
+        with self._log_lock():
+            with open(self.log_path, "a") as f:
+                f.write("".join(json.dumps(entry) + "\n" for entry in entries))
+            self._refresh()
+            if self._log_lines > 2 * max(len(self._summaries), 1000):
+                self._compact_locked()
+
+    def query(self, sort: str = "created_at", order: str = "desc", limit: int = 50, cursor: Optional[str] = None,
+              completed: Optional[bool] = None, min_rating: Optional[int] = None,
+              max_rating: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One page of interview summaries.
+
+        Args:
+            sort: ``created_at`` or ``rating`` (ties broken by creation time)
+            order: ``desc`` or ``asc``
+            limit: Maximum number of summaries to return
+            cursor: ``next_cursor`` of the previous page
+            completed: Only completed (True) or unfinished (False) interviews
+            min_rating: Lowest rating to include (excludes unrated interviews)
+            max_rating: Highest rating to include (excludes unrated interviews)
+
+        Returns:
+            tuple: (summaries, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            ValueError: For an unknown sort field or order, or an invalid cursor
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"sort must be one of {', '.join(SORT_FIELDS)}")
+        if order not in ("asc", "desc"):
+            raise ValueError("order must be asc or desc")
+        after = decode_cursor(cursor, sort, order) if cursor else None
+        descending = order == "desc"
+
+        def matches(summary):
+            if completed is not None and bool(summary["completed"]) != completed:
+                return False
+            rating = summary["rating"]
+            if min_rating is not None and (rating is None or rating < min_rating):
+                return False
+            if max_rating is not None and (rating is None or rating > max_rating):
+                return False
+            return True
+
+        with self._lock:
+            self._refresh()
+            keys = self._keys[sort]
+
+            # Rating-sorted pages start (and stop) at the rating bounds instead of scanning to them
+            low, high = 0, len(keys)
+            if sort == "rating":
+                if min_rating is not None:
+                    low = bisect_left(keys, (min_rating,))
+                if max_rating is not None:
+                    high = bisect_left(keys, (max_rating + 1,))
+            if after is not None:
+                if descending:
+                    high = min(high, bisect_left(keys, after))
+                else:
+                    low = max(low, bisect_right(keys, after))
+
+            positions = range(high - 1, low - 1, -1) if descending else range(low, high)
+            page = []
+            last_key = None
+            for position in positions:
+                key = keys[position]
+                summary = self._summaries[key[-1]]
+                if matches(summary):
+                    if len(page) == limit:
+                        return page, encode_cursor(sort, order, last_key)
+                    page.append(dict(summary))
+                    last_key = key
+            return page, None
+
+    def compact(self):
+        """Rewrite the log with one line per interview."""
+        with self._lock, self._log_lock():
+            self._compact_locked()
+
+    def _compact_locked(self):
+        # Caller holds self._lock and the log lock (flock is not reentrant across file descriptors)
+        self._refresh(locked=True)
+        self._write_log(self._summaries.values())
+        self._refresh(locked=True)
+
+    def _refresh(self, locked: bool = False):
+        # Caller holds self._lock; read log lines appended since the last refresh
+        if not self._loaded:
+            self._loaded = True
+            if not os.path.exists(self.log_path):
+                print("Building interview index from the interview files...")
+                with self._log_lock() if not locked else nullcontext():
+                    if not os.path.exists(self.log_path):
+                        self._write_log(summarize(data) for data in self._rebuild())
+
+        try:
+            stat = os.stat(self.log_path)
+        except FileNotFoundError:
+            return
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            # Compacted (or replaced) by some process: reload from the start
+            self._inode = stat.st_ino
+            self._offset = 0
+            self._log_lines = 0
+            self._summaries = {}
+            self._keys = {sort: [] for sort in SORT_FIELDS}
+        if stat.st_size == self._offset:
+            return
+
+        with open(self.log_path, "r") as f:
+            f.seek(self._offset)
+            chunk = f.read()
+        # Ignore a trailing line that is still being written
+        end = chunk.rfind("\n") + 1
+        self._offset += len(chunk[:end].encode("utf-8"))
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                self._apply(json.loads(line))
+            except (json.JSONDecodeError, KeyError) as e:
+                print(f"Skipping bad interview index line: {e}")
+            self._log_lines += 1
+
+    def _apply(self, summary: Dict[str, Any]):
+        deleted = summary.get("deleted", False)
+        previous = self._summaries.pop(summary["id"], None) if deleted else self._summaries.get(summary["id"])
+        for sort, keys in self._keys.items():
+            if previous is not None:
+                old_key = _sort_key(previous, sort)
+                position = bisect_left(keys, old_key)
+                if position < len(keys) and keys[position] == old_key:
+                    del keys[position]
+            if not deleted:
+                insort(keys, _sort_key(summary, sort))
+        if not deleted:
+            self._summaries[summary["id"]] = summary
+
+    def _write_log(self, summaries: Iterable[Dict[str, Any]]):
+        # Caller holds the log lock; atomic like interview files
+        tmp_path = f"{self.log_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                for summary in summaries:
+                    f.write(json.dumps(summary) + "\n")
+            os.replace(tmp_path, self.log_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @contextmanager
+    def _log_lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.log_path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -1,39 +1,191 @@
 import os
-import json
+import shutil
+import sys
+import time
 import uuid
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Callable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+from app.models.blobs import blob_store_for
+from app.models.index import InterviewIndex, summarize
+from app.models.serialization import (
+    FORMAT_VERSION, LEGACY_VERSION, SectionedFile, decode, encode, read_interview_file, to_epoch, to_iso,
+)
+
+
+class TranscriptEntry:
+    """
+    One transcript message or evaluation.
+
+    Stored with slots, an interned role and the timestamp as epoch seconds, but
+    read and written like the dict it replaces (``entry["role"]``,
+    ``entry.get("audio_file")``, ``entry["audio_file"] = ...``); ``timestamp``
+    is formatted as an ISO string when it is read.
+    """
+
+    __slots__ = ("role", "content", "ts", "audio_file", "extra")
+
+    def __init__(self, role: Optional[str], content: str, ts: Any = None,
+                 audio_file: Optional[str] = None, extra: Optional[Dict[str, Any]] = None):
+        self.role = sys.intern(role) if role is not None else None  # None for evaluations
+        self.content = content
+        self.ts = ts  # epoch seconds, or an unparseable timestamp string kept as it was
+        self.audio_file = audio_file
+        self.extra = extra  # any other keys, so unknown fields survive a load and save
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TranscriptEntry":
+        """Create an entry from its stored dict (ISO or epoch-second timestamp)."""
+        if isinstance(data, cls):
+            return data
+        extra = None
+        if not _ENTRY_KEYS.issuperset(data):
+            extra = {key: value for key, value in data.items() if key not in _ENTRY_KEYS}
+        return cls(data.get("role"), data["content"], to_epoch(data.get("timestamp")), data.get("audio_file"), extra)
+
+    def to_dict(self, iso_timestamps: bool = True) -> Dict[str, Any]:
+        """The entry as a dict, in the same shape as before it was loaded."""
+        data = {} if self.role is None else {"role": self.role}
+        data["content"] = self.content
+        if self.ts is not None:
+            data["timestamp"] = to_iso(self.ts) if iso_timestamps else self.ts
+        if self.audio_file is not None:
+            data["audio_file"] = self.audio_file
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __getitem__(self, key: str) -> Any:
+        # Fast path for the keys read on every turn
+        if key == "content":
+            return self.content
+        if key == "role" and self.role is not None:
+            return self.role
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == "timestamp":
+            return to_iso(self.ts) if self.ts is not None else default
+        if key in ("role", "content", "audio_file"):
+            value = getattr(self, key)
+            return value if value is not None else default
+        return self.extra.get(key, default) if self.extra else default
+
+    def __setitem__(self, key: str, value: Any):
+        if key == "timestamp":
+            self.ts = to_epoch(value)
+        elif key in ("role", "content", "audio_file"):
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __repr__(self) -> str:
+        return f"TranscriptEntry({self.to_dict()!r})"
+
+
+_MISSING = object()
+_ENTRY_KEYS = frozenset(("role", "content", "timestamp", "audio_file"))
+
+
+def _entries_to_dicts(entries: List[Any], iso_timestamps: bool) -> List[Dict[str, Any]]:
+    # Entries appended as plain dicts (e.g. by scripts) are passed through
+    return [entry.to_dict(iso_timestamps) if isinstance(entry, TranscriptEntry) else dict(entry) for entry in entries]
+
+
+_UNLOADED = object()
+
+# Fields that lazily loaded interviews read from their file on first access
+LAZY_FIELDS = ("cv", "job_description", "system_prompt", "transcripts", "evaluations",
+               "mode_decisions", "question_plan", "analysis")
+
+
+def _lazy_field(name: str) -> property:
+    slot = f"_{name}"
+
+    def get(self):
+        value = getattr(self, slot)
+        if value is _UNLOADED:
+            value = self._load_field(name)
+        return value
+
+    def set(self, value):
+        setattr(self, slot, value)
+
+    return property(get, set)
 
 
 class Interview:
     """Class representing an interview session with all related data."""
     
+    # Slots instead of a __dict__: many interviews are held in memory at once
+    __slots__ = ("id", "created_at", "room_name", "rating", "verdict", "completed", "_source") + tuple(f"_{name}" for name in LAZY_FIELDS)
+    
+    cv = _lazy_field("cv")
+    job_description = _lazy_field("job_description")
+    system_prompt = _lazy_field("system_prompt")
+    transcripts = _lazy_field("transcripts")
+    evaluations = _lazy_field("evaluations")
+    mode_decisions = _lazy_field("mode_decisions")
+    question_plan = _lazy_field("question_plan")
+    analysis = _lazy_field("analysis")
+    
     def __init__(self, cv: str, job_description: str, system_prompt: str):
         self.id = str(uuid.uuid4())
         self.cv = cv
         self.job_description = job_description
         self.system_prompt = system_prompt
         self.created_at = datetime.now().isoformat()
-        self.transcripts: List[Dict[str, Any]] = []
-        self.evaluations: List[Dict[str, Any]] = []  # Store evaluations separately
+        self.room_name = f"interview-{self.id}"  # LiveKit room; new interviews are given one from the room pool
+        self.transcripts: List[TranscriptEntry] = []
+        self.evaluations: List[TranscriptEntry] = []  # Store evaluations separately
+        self.mode_decisions: List[Dict[str, Any]] = []  # Turns switched to quick mode by the server
+        self.question_plan: List[str] = []  # Questions prepared in the background at creation
+        self.analysis: Optional[Dict[str, Any]] = None  # Skills, responsibilities and quick-mode questions
         self.rating: Optional[int] = None
         self.verdict: Optional[str] = None
         self.completed = False
+        self._source: Optional[SectionedFile] = None  # Open file of a lazily loaded interview
     
     def add_message(self, role: str, content: str):
         """Add a message to the transcript."""
         # If it's an evaluation, add to evaluations list instead
         if role == "evaluation":
-            self.evaluations.append({
-                "content": content,
-                "timestamp": datetime.now().isoformat()
-            })
+            self.evaluations.append(TranscriptEntry(None, content, time.time()))
         else:
-            self.transcripts.append({
-                "role": role,  # "ai" or "candidate"
-                "content": content,
-                "timestamp": datetime.now().isoformat()
-            })
+            self.transcripts.append(TranscriptEntry(role, content, time.time()))  # "ai" or "candidate"
+    
+    @property
+    def transcript_count(self) -> int:
+        """Number of transcript messages, without loading them."""
+        if self._transcripts is _UNLOADED:
+            return self._source.count("transcripts")
+        return len(self._transcripts)
+    
+    def transcript_tail(self, n: int = 1) -> List[TranscriptEntry]:
+        """The last ``n`` transcript messages.
+        
+        On a lazily loaded interview whose transcript hasn't been read yet only
+        these messages are read from the file; changing them doesn't change the
+        interview.
+        """
+        if self._transcripts is _UNLOADED:
+            return [TranscriptEntry.from_dict(entry) for entry in self._source.tail("transcripts", n)]
+        return self._transcripts[-n:] if n > 0 else []
     
     def set_rating(self, rating: int, verdict: str):
         """Set the final rating and verdict for the interview."""
@@ -41,16 +193,26 @@ class Interview:
         self.verdict = verdict
         self.completed = True
     
-    def to_dict(self):
-        """Convert instance to dictionary for storage."""
+    def to_dict(self, iso_timestamps: bool = True):
+        """Convert instance to dictionary for storage.
+        
+        Args:
+            iso_timestamps: Transcript and evaluation timestamps as ISO strings
+                (the API shape); epoch seconds when False, which saves skip
+                formatting them
+        """
         return {
             "id": self.id,
             "cv": self.cv,
             "job_description": self.job_description,
             "system_prompt": self.system_prompt,
             "created_at": self.created_at,
-            "transcripts": self.transcripts,
-            "evaluations": self.evaluations,  # Include evaluations
+            "room_name": self.room_name,
+            "transcripts": _entries_to_dicts(self.transcripts, iso_timestamps),
+            "evaluations": _entries_to_dicts(self.evaluations, iso_timestamps),  # Include evaluations
+            "mode_decisions": self.mode_decisions,
+            "question_plan": self.question_plan,
+            "analysis": self.analysis,
             "rating": self.rating,
             "verdict": self.verdict,
             "completed": self.completed
@@ -58,50 +220,283 @@ class Interview:
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]):
-        """Create an instance from a dictionary."""
+        """Create an instance from a dictionary (timestamps as ISO strings or epoch seconds)."""
         interview = cls(
             cv=data["cv"],
             job_description=data["job_description"],
             system_prompt=data["system_prompt"]
         )
         interview.id = data["id"]
-        interview.created_at = data["created_at"]
-        interview.transcripts = data["transcripts"]
+        interview.created_at = to_iso(data["created_at"])
+        # Older interviews have no stored room; theirs was named after the interview
+        interview.room_name = data.get("room_name") or f"interview-{interview.id}"
+        interview.transcripts = [TranscriptEntry.from_dict(entry) for entry in data["transcripts"]]
         # Handle evaluations field which might not exist in older files
-        interview.evaluations = data.get("evaluations", [])
+        interview.evaluations = [TranscriptEntry.from_dict(entry) for entry in data.get("evaluations", [])]
+        interview.mode_decisions = [
+            {**decision, "timestamp": to_iso(decision["timestamp"])} if "timestamp" in decision else decision
+            for decision in data.get("mode_decisions", [])
+        ]
+        interview.question_plan = data.get("question_plan", [])
+        interview.analysis = data.get("analysis")
         interview.rating = data["rating"]
         interview.verdict = data["verdict"]
         interview.completed = data["completed"]
         return interview
+    
+    @classmethod
+    def from_sectioned(cls, source: SectionedFile) -> "Interview":
+        """Create an interview whose heavy fields are read from ``source`` when first used."""
+        interview = cls.__new__(cls)
+        header = source.header
+        interview.id = header["id"]
+        interview.created_at = to_iso(header["created_at"])
+        interview.room_name = header.get("room_name") or f"interview-{interview.id}"
+        interview.rating = header.get("rating")
+        interview.verdict = header.get("verdict")
+        interview.completed = header.get("completed", False)
+        for name in LAZY_FIELDS:
+            setattr(interview, f"_{name}", _UNLOADED)
+        interview._source = source
+        return interview
+    
+    def _load_field(self, name: str) -> Any:
+        value = self._source.read(name)
+        if name in ("transcripts", "evaluations"):
+            value = [TranscriptEntry.from_dict(entry) for entry in value]
+        elif name == "mode_decisions":
+            value = [
+                {**decision, "timestamp": to_iso(decision["timestamp"])} if "timestamp" in decision else decision
+                for decision in value
+            ]
+        setattr(self, f"_{name}", value)
+        # Nothing more to read once every field is loaded
+        if all(getattr(self, f"_{field}") is not _UNLOADED for field in LAZY_FIELDS):
+            self._source.close()
+            self._source = None
+        return value
 
 
 class InterviewStorage:
     """Class for managing local storage of interviews."""
     
-    def __init__(self, storage_dir: str = "interviews"):
-        """Initialize storage with directory path."""
+    def __init__(self, storage_dir: str = "interviews", compress_completed: bool = True,
+                 format_version: int = FORMAT_VERSION, share_texts: bool = True):
+        """Initialize storage with directory path.
+        
+        Args:
+            storage_dir: Directory holding one file per interview
+            compress_completed: Gzip the files of completed interviews
+            format_version: File format to write (see ``app.models.serialization``);
+                files in another format are rewritten lazily
+            share_texts: Store long job descriptions and system prompts once, in
+                ``.blobs``, instead of in every interview file (format 3)
+        """
         self.storage_dir = storage_dir
+        self.compress_completed = compress_completed
+        self.format_version = format_version
+        self.share_texts = share_texts
         os.makedirs(self.storage_dir, exist_ok=True)
+        # Also used to read files with shared texts when share_texts is off
+        self.blobs = blob_store_for(self.storage_dir)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        # Listing index, updated on every save instead of scanning the directory
+        self.index = InterviewIndex(os.path.join(self.storage_dir, ".index.jsonl"), rebuild=self._scan_interviews)
+        self._save_listeners: List[tuple] = []  # (listener, batch listener or None)
+    
+    def add_save_listener(self, listener: Callable[[Dict[str, Any]], None],
+                          batch_listener: Optional[Callable[[List[Dict[str, Any]]], None]] = None):
+        """Call ``listener`` with the stored dict after every save (e.g. to update a search index).
+        
+        Transcript and evaluation timestamps in it are epoch seconds.
+        
+        Args:
+            listener: Called with each saved dict
+            batch_listener: Called instead with all dicts of a ``save_interviews`` call at once
+        """
+        self._save_listeners.append((listener, batch_listener))
     
     def save_interview(self, interview: Interview):
-        """Save interview to local storage."""
+        """Save interview to local storage.
+        
+        The file is written to a temporary name and atomically renamed, so other
+        workers sharing the directory never read a partially written interview.
+        """
         filepath = os.path.join(self.storage_dir, f"{interview.id}.json")
-        with open(filepath, "w") as f:
-            json.dump(interview.to_dict(), f, indent=2)
+        data = interview.to_dict(iso_timestamps=False)
+        self._write_file(filepath, self._encode(data))
+        self.index.update(data)
+        for listener, _ in self._save_listeners:
+            try:
+                listener(data)
+            except Exception as e:
+                # Derived indexes must never make a save fail
+                print(f"Error in save listener for interview {interview.id}: {e}")
         return filepath
     
-    def load_interview(self, interview_id: str) -> Optional[Interview]:
-        """Load interview from local storage."""
+    def save_interviews(self, interviews: List[Interview]) -> List[str]:
+        """Save several new interviews, updating the listing index and listeners once for all of them.
+        
+        Each file is written like in ``save_interview``.
+        """
+        filepaths = []
+        saved = []
+        for interview in interviews:
+            filepath = os.path.join(self.storage_dir, f"{interview.id}.json")
+            data = interview.to_dict(iso_timestamps=False)
+            self._write_file(filepath, self._encode(data))
+            filepaths.append(filepath)
+            saved.append(data)
+        
+        self.index.update_many(saved)
+        for listener, batch_listener in self._save_listeners:
+            try:
+                if batch_listener is not None:
+                    batch_listener(saved)
+                else:
+                    for data in saved:
+                        listener(data)
+            except Exception as e:
+                print(f"Error in save listener for {len(saved)} interviews: {e}")
+        return filepaths
+    
+    def _encode(self, data: Dict[str, Any]) -> bytes:
+        return encode(data, compress=self.compress_completed and bool(data.get("completed")),
+                      version=self.format_version, blobs=self.blobs if self.share_texts else None)
+    
+    def _write_file(self, filepath: str, contents: bytes, mtime_ns: Optional[int] = None):
+        tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(contents)
+            if mtime_ns is not None:
+                os.utime(tmp_path, ns=(mtime_ns, mtime_ns))
+            os.replace(tmp_path, filepath)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    def needs_migration(self, version: int, compressed: bool, data: Dict[str, Any]) -> bool:
+        """Whether a file read as ``version`` differs from how it would be saved now."""
+        if version != self.format_version:
+            return True
+        return version != LEGACY_VERSION and compressed != (self.compress_completed and bool(data.get("completed")))
+    
+    def migrate_file(self, interview_id: str, wait: bool = False, idle_secs: Optional[float] = None) -> bool:
+        """
+        Rewrite an interview file in the current format, keeping its contents
+        and modification time (so derived indexes and incremental exports don't
+        see a change).
+        
+        Only completed interviews are migrated by default: live interviews are
+        saved by their turn handlers from a copy loaded at the start of the
+        turn, and are migrated by their next save anyway.
+        
+        Args:
+            interview_id: Interview to migrate
+            wait: Wait for the interview's lock instead of giving up if it is held
+            idle_secs: Also migrate unfinished interviews whose file hasn't
+                changed for this long (abandoned interviews)
+        
+        Returns:
+            bool: True if the file was rewritten
+        """
+        filepath = os.path.join(self.storage_dir, f"{interview_id}.json")
+        with self._try_lock(interview_id, wait) as locked:
+            if not locked:
+                return False
+            try:
+                with open(filepath, "rb") as f:
+                    mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+                    data, version, compressed = decode(f.read(), iso_timestamps=False, blobs=self.blobs)
+            except (OSError, ValueError):
+                return False
+            idle = idle_secs is not None and time.time() - mtime_ns / 1e9 >= idle_secs
+            if not (data.get("completed") or idle) or not self.needs_migration(version, compressed, data):
+                return False
+            self._write_file(filepath, self._encode(data), mtime_ns=mtime_ns)
+            return True
+    
+    @contextmanager
+    def _try_lock(self, interview_id: str, wait: bool):
+        # Yields whether the lock was acquired; without ``wait`` it gives up instead of blocking
+        thread_lock = self._thread_lock(interview_id)
+        if not thread_lock.acquire(blocking=wait):
+            yield False
+            return
+        try:
+            if fcntl is None:
+                yield True
+                return
+            lock_path = os.path.join(self.storage_dir, f".{interview_id}.lock")
+            with open(lock_path, "a") as lock_file:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    yield False
+                    return
+                try:
+                    yield True
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        finally:
+            thread_lock.release()
+    
+    @contextmanager
+    def lock(self, interview_id: str):
+        """Hold an exclusive lock on an interview, across threads and worker processes."""
+        with self._try_lock(interview_id, wait=True):
+            yield
+    
+    def _thread_lock(self, interview_id: str) -> threading.Lock:
+        # flock is per open file, so threads of one process also need a regular lock
+        with self._locks_guard:
+            lock = self._locks.get(interview_id)
+            if lock is None:
+                lock = self._locks[interview_id] = threading.Lock()
+            return lock
+    
+    def update_interview(self, interview_id: str, mutate: Callable[[Interview], None]) -> Optional[Interview]:
+        """Load, modify and save an interview as one locked read-modify-write."""
+        with self.lock(interview_id):
+            interview = self.load_interview(interview_id)
+            if interview is None:
+                return None
+            mutate(interview)
+            self.save_interview(interview)
+            return interview
+    
+    def load_interview(self, interview_id: str, lazy: bool = False) -> Optional[Interview]:
+        """Load interview from local storage.
+        
+        Args:
+            interview_id: Interview to load
+            lazy: Only read the small fields now, and the CV, prompts,
+                transcripts and other heavy fields when they are first used
+                (for callers that need little more than the ID and status).
+                Files in older formats are loaded in full.
+        """
         filepath = os.path.join(self.storage_dir, f"{interview_id}.json")
         if not os.path.exists(filepath):
             return None
         
         try:
-            with open(filepath, "r") as f:
-                data = json.load(f)
+            if lazy:
+                source = SectionedFile.open(filepath)
+                if source is not None:
+                    return Interview.from_sectioned(source)
+            
+            with open(filepath, "rb") as f:
+                # Timestamps stay epoch seconds, which is how TranscriptEntry keeps them
+                data, version, compressed = decode(f.read(), iso_timestamps=False, blobs=self.blobs)
             
-            return Interview.from_dict(data)
-        except json.JSONDecodeError as e:
+            interview = Interview.from_dict(data)
+            # Older files are rewritten in the current format the first time they are read
+            if data.get("completed") and self.needs_migration(version, compressed, data):
+                self.migrate_file(interview_id)
+            return interview
+        except ValueError as e:
             # Handle corrupted JSON file
             print(f"Error loading interview {interview_id}: {e}")
             
@@ -110,8 +505,7 @@ class InterviewStorage:
             
             # Backup the corrupted file
             try:
-                with open(filepath, "r") as src, open(corrupted_path, "w") as dst:
-                    dst.write(src.read())
+                shutil.copyfile(filepath, corrupted_path)
                 print(f"Backed up corrupted file to {corrupted_path}")
             except Exception as backup_error:
                 print(f"Failed to backup corrupted file: {backup_error}")
@@ -134,39 +528,32 @@ class InterviewStorage:
             return None
     
     def list_interviews(self) -> List[Dict[str, Any]]:
-        """List all saved interviews with basic info."""
-        interviews = []
+        """List all saved interviews with basic info, newest first."""
+        summaries, _ = self.index.query(limit=max(len(self.index), 1))
+        return summaries
+    
+    def _scan_interviews(self) -> Iterator[Dict[str, Any]]:
+        """Read every interview file (used to build the listing index the first time)."""
         if not os.path.exists(self.storage_dir):
-            return interviews
+            return
         
         for filename in os.listdir(self.storage_dir):
             if filename.endswith(".json") and not filename.endswith("_corrupted.json"):
                 filepath = os.path.join(self.storage_dir, filename)
                 try:
-                    with open(filepath, "r") as f:
-                        data = json.load(f)
+                    data = read_interview_file(filepath)
                     
-                    # Return only summary info
-                    interviews.append({
-                        "id": data["id"],
-                        "created_at": data["created_at"],
-                        "completed": data["completed"],
-                        "rating": data["rating"]
-                    })
-                except json.JSONDecodeError as e:
+                    # Only the summary fields are kept
+                    yield summarize(data)
+                except ValueError as e:
                     print(f"Error decoding JSON in file {filename}: {e}")
                     # Mark the file as corrupted
                     corrupted_path = os.path.join(self.storage_dir, f"{os.path.splitext(filename)[0]}_corrupted.json")
                     try:
                         # Backup the corrupted file
-                        with open(filepath, "r") as src, open(corrupted_path, "w") as dst:
-                            dst.write(src.read())
+                        shutil.copyfile(filepath, corrupted_path)
                         print(f"Backed up corrupted file to {corrupted_path}")
                     except Exception as backup_error:
                         print(f"Failed to backup corrupted file: {backup_error}")
                 except Exception as e:
                     print(f"Unexpected error loading interview from {filename}: {e}")
-        
-        # Sort by creation date, newest first
-        interviews.sort(key=lambda x: x["created_at"], reverse=True)
-        return interviews 
\ No newline at end of file
@@ -0,0 +1,363 @@
+"""
+On-disk encoding of interview files.
+
+Version 1 (legacy) is the ``to_dict`` output as pretty-printed JSON with ISO
+timestamps. Version 2 is minified UTF-8 JSON with a ``format`` marker and
+epoch-second timestamps, gzip-compressed for completed interviews.
+
+Version 3 splits the file into sections so heavy fields can be read on their
+own: a one-line JSON header with the small fields, entry counts and the offset
+of every section, then the sections. Transcripts and evaluations are stored
+one JSON line per entry, so the end of a transcript can be read without
+parsing the rest. For completed interviews each section is zlib-compressed.
+Long job descriptions and system prompts are stored once for all interviews
+as content-addressed blobs (see ``app.models.blobs``) and referenced as
+``{"blob": "<sha256>"}``.
+
+All versions are stored as ``{id}.json`` and recognized by their first bytes,
+so readers never need to know which version they got.
+
+orjson is used when it is installed (several times faster than
+the json module); the files are the same either way.
+"""
+import gzip
+import json
+import os
+import threading
+import zlib
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+from app.models.blobs import MIN_BLOB_CHARS, BlobStore, blob_store_for
+
+FORMAT_VERSION = 3
+COMPACT_VERSION = 2
+LEGACY_VERSION = 1
+
+GZIP_MAGIC = b"\x1f\x8b"
+SECTIONED_MAGIC = b'{"format":3,'
+COMPRESS_LEVEL = 6
+
+# List fields whose entries carry a "timestamp"
+TIMESTAMPED_LISTS = ("transcripts", "evaluations", "mode_decisions")
+
+# Version 3: fields kept in the header, and the sections in file order
+HEADER_FIELDS = ("id", "created_at", "room_name", "rating", "verdict", "completed")
+SECTIONS = ("cv", "job_description", "system_prompt", "transcripts", "evaluations",
+            "mode_decisions", "question_plan", "analysis")
+# Sections stored one entry per line
+LINE_SECTIONS = ("transcripts", "evaluations")
+# Sections shared by many interviews, stored as blobs in version 3
+BLOB_FIELDS = ("job_description", "system_prompt")
+SECTION_DEFAULTS = {"transcripts": [], "evaluations": [], "mode_decisions": [], "question_plan": []}
+
+# Bytes read per step when reading a section backwards from its end
+TAIL_BLOCK = 8192
+
+
+def to_epoch(value: Any) -> Any:
+    """Epoch seconds of an ISO timestamp; other values (numbers, unparseable strings) are returned as they are."""
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return value
+    return value
+
+
+def to_iso(value: Any) -> Any:
+    """ISO string of an epoch-second timestamp; other values are returned as they are."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return datetime.fromtimestamp(value).isoformat()
+    return value
+
+
+def _converted_copy(data: Dict[str, Any], convert) -> Dict[str, Any]:
+    # Shallow copies: the caller's dict and entries are left as they are
+    data = dict(data)
+    data["created_at"] = convert(data.get("created_at"))
+    for field in TIMESTAMPED_LISTS:
+        entries = data.get(field)
+        if entries:
+            data[field] = [
+                {**entry, "timestamp": convert(entry["timestamp"])} if "timestamp" in entry else entry
+                for entry in entries
+            ]
+    return data
+
+
+def _iso_in_place(data: Dict[str, Any]):
+    # Only used on freshly parsed dicts, so nothing is copied
+    data["created_at"] = to_iso(data.get("created_at"))
+    for field in TIMESTAMPED_LISTS:
+        for entry in data.get(field) or ():
+            if "timestamp" in entry:
+                entry["timestamp"] = to_iso(entry["timestamp"])
+
+
+def _dumps(data: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(data)
+        except TypeError:  # e.g. integers beyond 64 bits; the json module handles them
+            pass
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Any:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _resolve(name: str, value: Any, blobs: Optional[BlobStore]) -> Any:
+    if blobs is not None and name in BLOB_FIELDS and isinstance(value, dict):
+        return blobs.get(value["blob"])
+    return value
+
+
+def _encode_sectioned(stored: Dict[str, Any], compress: bool, blobs: Optional[BlobStore]) -> bytes:
+    if blobs is not None:
+        for field in BLOB_FIELDS:
+            text = stored.get(field)
+            if isinstance(text, str) and len(text) >= MIN_BLOB_CHARS:
+                stored[field] = {"blob": blobs.put(text)}
+
+    body = []
+    sections = {}
+    offset = 0
+    for name in SECTIONS:
+        value = stored.get(name, SECTION_DEFAULTS.get(name))
+        if name in LINE_SECTIONS:
+            raw = b"".join(_dumps(entry) + b"\n" for entry in value or ())
+        else:
+            raw = _dumps(value)
+        if compress:
+            raw = zlib.compress(raw, COMPRESS_LEVEL)
+        sections[name] = [offset, len(raw), compress]
+        body.append(raw)
+        offset += len(raw)
+
+    # "format" has to come first: it is how version 3 files are recognized
+    header = {"format": FORMAT_VERSION}
+    header.update((field, stored.get(field)) for field in HEADER_FIELDS)
+    header["counts"] = {name: len(stored.get(name) or ()) for name in LINE_SECTIONS}
+    header["sections"] = sections
+    return _dumps(header) + b"\n" + b"".join(body)
+
+
+def _parse_section(name: str, raw: bytes, compressed: bool) -> Any:
+    if compressed:
+        raw = zlib.decompress(raw)
+    if name in LINE_SECTIONS:
+        return [_loads(line) for line in raw.split(b"\n") if line]
+    return _loads(raw)
+
+
+def _decode_sectioned(raw: bytes, blobs: Optional[BlobStore]) -> Tuple[Dict[str, Any], bool]:
+    end = raw.find(b"\n")
+    if end < 0:
+        raise ValueError("Interview file header is incomplete")
+    header = _loads(raw[:end])
+    body = memoryview(raw)[end + 1:]
+    data = {field: header.get(field) for field in HEADER_FIELDS}
+    compressed = False
+    for name, (offset, length, section_compressed) in header["sections"].items():
+        if offset + length > len(body):
+            raise ValueError(f"Interview file section {name} is truncated")
+        data[name] = _resolve(name, _parse_section(name, body[offset:offset + length].tobytes(), section_compressed), blobs)
+        compressed = compressed or section_compressed
+    return data, compressed
+
+
+def encode(data: Dict[str, Any], compress: bool = False, version: int = FORMAT_VERSION,
+           blobs: Optional[BlobStore] = None) -> bytes:
+    """
+    File contents for a ``to_dict`` interview dict.
+
+    Args:
+        data: Interview dict with ISO or epoch-second timestamps
+        compress: Compress the output (versions 2 and 3)
+        version: ``FORMAT_VERSION``, or an older version to write files older code can read
+        blobs: Store long shared texts here and reference them (version 3 only)
+    """
+    if version == LEGACY_VERSION:
+        return json.dumps(_converted_copy(data, to_iso), indent=2).encode("utf-8")
+
+    stored = _converted_copy(data, to_epoch)
+    if version == FORMAT_VERSION:
+        return _encode_sectioned(stored, compress, blobs)
+
+    stored["format"] = COMPACT_VERSION
+    raw = _dumps(stored)
+    if compress:
+        # mtime=0 keeps the bytes identical for identical interviews
+        return gzip.compress(raw, compresslevel=COMPRESS_LEVEL, mtime=0)
+    return raw
+
+
+def decode(raw: bytes, iso_timestamps: bool = True,
+           blobs: Optional[BlobStore] = None) -> Tuple[Dict[str, Any], int, bool]:
+    """
+    Parse file contents of any version.
+
+    Args:
+        raw: File contents
+        iso_timestamps: Return timestamps as ISO strings like ``to_dict`` does;
+            when False, version 2 and 3 timestamps stay epoch seconds
+        blobs: Resolve blob references from this store (they are left as they
+            are without one)
+
+    Returns:
+        tuple: (interview dict, format version, whether the file was compressed)
+
+    Raises:
+        ValueError: If the contents are not a valid interview file (including
+            ``json.JSONDecodeError`` and truncated compressed data)
+        FileNotFoundError: If a referenced blob is missing
+    """
+    try:
+        if raw.startswith(SECTIONED_MAGIC):
+            data, compressed = _decode_sectioned(raw, blobs)
+            version = FORMAT_VERSION
+        else:
+            compressed = raw[:2] == GZIP_MAGIC
+            if compressed:
+                raw = zlib.decompress(raw, 16 + zlib.MAX_WBITS)  # gzip wrapper
+            data = _loads(raw)
+            if not isinstance(data, dict):
+                raise ValueError("Interview file does not contain an object")
+            version = data.pop("format", LEGACY_VERSION)
+    except (zlib.error, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid interview file: {e}")
+
+    if version != LEGACY_VERSION and iso_timestamps:
+        _iso_in_place(data)
+    return data, version, compressed
+
+
+def read_interview_file(path: str, iso_timestamps: bool = True) -> Dict[str, Any]:
+    """
+    Read an interview file of any version, with blobs resolved from its directory.
+
+    Raises:
+        OSError: If the file or a blob it references can't be read
+        ValueError: If it is not a valid interview file
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    return decode(raw, iso_timestamps=iso_timestamps, blobs=blob_store_for(os.path.dirname(path)))[0]
+
+
+class SectionedFile:
+    """
+    Reads single sections of a version 3 interview file.
+
+    The file stays open until :meth:`close`, so every section comes from the
+    version that was opened even if a save replaces the file in the meantime.
+    Timestamps are epoch seconds; blobs are resolved from the file's directory.
+    """
+
+    def __init__(self, f: BinaryIO, header: Dict[str, Any], body_start: int, blobs: BlobStore):
+        self._file = f
+        self.header = header
+        self._body_start = body_start
+        self._blobs = blobs
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path: str) -> Optional["SectionedFile"]:
+        """
+        Open a version 3 file and read its header.
+
+        Returns:
+            SectionedFile: The open file, or None if the file has another version
+
+        Raises:
+            OSError: If the file can't be read
+            ValueError: If the header is invalid
+        """
+        f = open(path, "rb")
+        try:
+            chunk = f.read(4096)
+            if not chunk.startswith(SECTIONED_MAGIC):
+                f.close()
+                return None
+            while b"\n" not in chunk:
+                more = f.read(65536)
+                if not more:
+                    raise ValueError("Interview file header is incomplete")
+                chunk += more
+            end = chunk.index(b"\n")
+            header = _loads(chunk[:end])
+            if not isinstance(header, dict) or "sections" not in header:
+                raise ValueError("Interview file header is invalid")
+            return cls(f, header, end + 1, blob_store_for(os.path.dirname(path)))
+        except Exception:
+            f.close()
+            raise
+
+    def count(self, name: str) -> int:
+        """Number of entries in a line section (``transcripts`` or ``evaluations``)."""
+        return self.header["counts"][name]
+
+    def read(self, name: str) -> Any:
+        """
+        Parse one section.
+
+        Raises:
+            ValueError: If the section is truncated or invalid
+            FileNotFoundError: If it references a missing blob
+        """
+        offset, length, compressed = self.header["sections"][name]
+        raw = self._read_at(self._body_start + offset, length)
+        if len(raw) != length:
+            raise ValueError(f"Interview file section {name} is truncated")
+        try:
+            return _resolve(name, _parse_section(name, raw, compressed), self._blobs)
+        except zlib.error as e:
+            raise ValueError(f"Invalid interview file section {name}: {e}")
+
+    def tail(self, name: str, n: int) -> List[Dict[str, Any]]:
+        """
+        Last ``n`` entries of a line section.
+
+        Uncompressed sections are read backwards from their end, so the cost
+        depends on ``n`` and not on the length of the transcript. Compressed
+        sections (completed interviews) are read whole.
+        """
+        if n <= 0:
+            return []
+        offset, length, compressed = self.header["sections"][name]
+        if compressed:
+            return self.read(name)[-n:]
+
+        start = self._body_start + offset
+        position = start + length
+        buffer = b""
+        # Every entry ends with a newline; one more than n means the first kept line is complete
+        while position > start and buffer.count(b"\n") <= n:
+            size = min(TAIL_BLOCK, position - start)
+            position -= size
+            buffer = self._read_at(position, size) + buffer
+        lines = buffer.split(b"\n")[:-1]
+        if position > start:
+            lines = lines[1:]
+        return [_loads(line) for line in lines[-n:]]
+
+    def _read_at(self, position: int, size: int) -> bytes:
+        with self._lock:
+            self._file.seek(position)
+            return self._file.read(size)
+
+    def close(self):
+        self._file.close()
+
+    def __del__(self):
+        # Interviews that never load every section are dropped without close()
+        f = getattr(self, "_file", None)
+        if f is not None:
+            f.close()
@@ -0,0 +1,285 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.metrics import metrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Gauge values for provider_circuit_state
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+metrics.describe("provider_circuit_state", "gauge", "Circuit breaker state per provider (0 closed, 1 half-open, 2 open).")
+metrics.describe("provider_circuit_rejections_total", "counter", "Calls failed fast because the provider's circuit was open.")
+metrics.describe("provider_hedged_requests_total", "counter", "Duplicate requests started because the first was slower than the hedge threshold.")
+metrics.describe("provider_hedge_wins_total", "counter", "Hedged requests that answered before the original.")
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Tracks the health of one external provider.
+
+    After ``failure_threshold`` consecutive failures (errors or timeouts) the
+    circuit opens and calls fail fast into the caller's fallback. Once
+    ``reset_timeout_secs`` has passed, a limited number of probe calls are let
+    through (half-open); a successful probe closes the circuit again, a failed
+    one re-opens it.
+
+    Successful call latencies are kept per operation so slow requests can be
+    hedged once they pass a latency percentile.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout_secs: float = 30.0,
+                 half_open_max_calls: int = 1, hedging: bool = False, hedge_percentile: float = 95.0,
+                 hedge_min_samples: int = 20, latency_window: int = 200):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_secs = reset_timeout_secs
+        self.half_open_max_calls = half_open_max_calls
+        self.hedging = hedging
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self._latency_window = latency_window
+        self._latencies: Dict[str, deque] = {}
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._lock = threading.Lock()
+        metrics.set_gauge("provider_circuit_state", STATE_VALUES[CLOSED], provider=name)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def is_open(self) -> bool:
+        """
+        Whether calls are currently failing fast.
+
+        Unlike ``state``, this is False once ``reset_timeout_secs`` has passed
+        since the circuit opened, so callers that skip the provider while it is
+        open let the next call through as a half-open probe.
+        """
+        with self._lock:
+            return self._state == OPEN and time.monotonic() - self._opened_at < self.reset_timeout_secs
+
+    def allow_request(self) -> bool:
+        """Return True if a call may go to the provider now."""
+        with self._lock:
+            if self._state == OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout_secs:
+                    return False
+                self._set_state(HALF_OPEN)
+            if self._state == HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_max_calls:
+                    return False
+                self._probes_in_flight += 1
+            return True
+
+    def record_success(self, latency: float, operation: str = "default"):
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                print(f"Provider {self.name} recovered, closing circuit")
+            self._consecutive_failures = 0
+            self._set_state(CLOSED)
+            samples = self._latencies.get(operation)
+            if samples is None:
+                samples = self._latencies[operation] = deque(maxlen=self._latency_window)
+            samples.append(latency)
+
+    def record_failure(self):
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                self._open()
+            elif self._state == CLOSED and self._consecutive_failures >= self.failure_threshold:
+                self._open()
+
+    def hedge_delay(self, operation: str = "default") -> Optional[float]:
+        """Latency percentile after which a duplicate request is sent, or None if hedging is off."""
+        if not self.hedging:
+            return None
+        with self._lock:
+            samples = sorted(self._latencies.get(operation, ()))
+        if len(samples) < self.hedge_min_samples:
+            return None
+        index = min(len(samples) - 1, int(round(self.hedge_percentile / 100.0 * (len(samples) - 1))))
+        return samples[index]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current health, for the provider health endpoint."""
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "open_for_s": round(time.monotonic() - self._opened_at, 1) if self._state == OPEN else 0,
+                "latency_samples": {op: len(samples) for op, samples in self._latencies.items()},
+            }
+
+    def call(self, func: Callable[[], Any], timeout_secs: float, operation: str = "default",
+             hedge_func: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        Call a provider through the breaker.
+
+        ``func`` runs in a worker thread. A result of None or an exception counts
+        as a failure. If hedging is enabled and the call is slower than the
+        operation's latency percentile, ``hedge_func`` (or ``func`` again) is
+        started in parallel and the first successful result wins.
+
+        Args:
+            func: Zero-argument callable making the request
+            timeout_secs: Overall deadline for the call, including hedges
+            operation: Operation name used for latency tracking
+            hedge_func: Optional alternative request used for the hedge
+
+        Returns:
+            The first successful result, or None on failure or timeout
+
+        Raises:
+            CircuitOpenError: If the circuit is open (nothing was sent)
+        """
+        if not self.allow_request():
+            metrics.inc("provider_circuit_rejections_total", provider=self.name, operation=operation)
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+        start = time.monotonic()
+        done = threading.Event()
+        lock = threading.Lock()
+        state = {"result": None, "winner": None, "launched": 0, "failed": 0}
+
+        def attempt(target, label):
+            try:
+                value = target()
+            except Exception as e:
+                print(f"Error calling {self.name} ({operation}): {e}")
+                value = None
+            with lock:
+                if value is not None and state["result"] is None:
+                    state["result"] = value
+                    state["winner"] = label
+                    done.set()
+                elif value is None:
+                    state["failed"] += 1
+                    if state["failed"] == state["launched"]:
+                        done.set()
+
+        def launch(target, label):
+            with lock:
+                state["launched"] += 1
+            threading.Thread(target=attempt, args=(target, label), daemon=True).start()
+
+        launch(func, "primary")
+        delay = self.hedge_delay(operation)
+        if delay is not None and delay < timeout_secs and not done.wait(delay):
+            metrics.inc("provider_hedged_requests_total", provider=self.name, operation=operation)
+            launch(hedge_func or func, "hedge")
+
+        if not done.wait(max(0.0, timeout_secs - (time.monotonic() - start))):
+            print(f"{self.name} {operation} timed out after {timeout_secs} seconds")
+
+        with lock:
+            result, winner = state["result"], state["winner"]
+        if result is None:
+            self.record_failure()
+            return None
+        if winner == "hedge":
+            metrics.inc("provider_hedge_wins_total", provider=self.name, operation=operation)
+        self.record_success(time.monotonic() - start, operation)
+        return result
+
+    async def call_async(self, factory: Callable[[], Awaitable[Any]], timeout_secs: float,
+                         operation: str = "default") -> Any:
+        """Asyncio version of :meth:`call` for the Deepgram client (``factory`` returns a new coroutine)."""
+        if not self.allow_request():
+            metrics.inc("provider_circuit_rejections_total", provider=self.name, operation=operation)
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+        start = time.monotonic()
+        tasks = {asyncio.ensure_future(factory()): "primary"}
+        result = None
+        winner = None
+        try:
+            delay = self.hedge_delay(operation)
+            if delay is not None and delay < timeout_secs:
+                finished, _ = await asyncio.wait(list(tasks), timeout=delay)
+                if not finished:
+                    metrics.inc("provider_hedged_requests_total", provider=self.name, operation=operation)
+                    tasks[asyncio.ensure_future(factory())] = "hedge"
+
+            pending = set(tasks)
+            while pending and result is None:
+                remaining = timeout_secs - (time.monotonic() - start)
+                if remaining <= 0:
+                    print(f"{self.name} {operation} timed out after {timeout_secs} seconds")
+                    break
+                finished, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    if task.exception() is not None:
+                        print(f"Error calling {self.name} ({operation}): {task.exception()}")
+                    elif task.result() is not None and result is None:
+                        result, winner = task.result(), tasks[task]
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        if result is None:
+            self.record_failure()
+            return None
+        if winner == "hedge":
+            metrics.inc("provider_hedge_wins_total", provider=self.name, operation=operation)
+        self.record_success(time.monotonic() - start, operation)
+        return result
+
+    def _open(self):
+        print(f"Provider {self.name} is unhealthy, opening circuit for {self.reset_timeout_secs:.0f}s")
+        self._opened_at = time.monotonic()
+        self._set_state(OPEN)
+
+    def _set_state(self, state: str):
+        # Caller holds self._lock
+        if state != self._state:
+            self._state = state
+            metrics.set_gauge("provider_circuit_state", STATE_VALUES[state], provider=self.name)
+
+
+class ProviderHealth:
+    """Circuit breakers for all external providers, configured from the environment."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(provider)
+            if breaker is None:
+                breaker = self._breakers[provider] = CircuitBreaker(
+                    provider,
+                    failure_threshold=int(os.getenv("PROVIDER_FAILURE_THRESHOLD", "3")),
+                    reset_timeout_secs=float(os.getenv("PROVIDER_RESET_TIMEOUT", "30")),
+                    hedging=os.getenv("PROVIDER_HEDGING", "false").lower() in ("1", "true", "yes"),
+                    hedge_percentile=float(os.getenv("PROVIDER_HEDGE_PERCENTILE", "95")),
+                )
+            return breaker
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.snapshot() for name, breaker in breakers.items()}
+
+
+# Process-wide provider health used by the services
+provider_health = ProviderHealth()
@@ -0,0 +1,127 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
+from app.metrics import metrics
+
+metrics.describe("livekit_room_pool_available", "gauge", "Pre-created LiveKit rooms waiting to be assigned.")
+metrics.describe("livekit_room_assignments_total", "counter", "Rooms assigned to new interviews, by source (pool or created).")
+
+
+def new_room_name() -> str:
+    return f"interview-{uuid.uuid4()}"
+
+
+class RoomPool:
+    """
+    LiveKit rooms created ahead of time, so creating an interview never waits
+    for LiveKit.
+
+    A background thread keeps ``size`` empty rooms ready, creating them in
+    parallel on a pool of ``workers`` threads. Rooms are dropped from the pool
+    once they are ``max_age_secs`` old, before LiveKit closes them for being
+    empty. When the pool is empty, :meth:`acquire` still returns at once and
+    the room is created in the background. Without a LiveKit URL no rooms are
+    created at all; interviews are only given room names.
+    """
+
+    def __init__(self, livekit_service, size: int = 5, workers: int = 8,
+                 max_age_secs: Optional[float] = None, retry_secs: float = 30.0):
+        self.livekit_service = livekit_service
+        self.size = size
+        self.workers = workers
+        # A quarter of LiveKit's empty timeout is left for the candidate to join
+        self.max_age_secs = max_age_secs if max_age_secs is not None else livekit_service.ROOM_EMPTY_TIMEOUT_SECS * 0.75
+        self.retry_secs = retry_secs
+        self._rooms: List[tuple] = []  # (created at, name), oldest first
+        self._lock = threading.Lock()
+        self._wanted = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="livekit-room")
+        self._started = False
+        self._start_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether LiveKit is configured, so rooms can be created."""
+        return bool(self.livekit_service.url)
+
+    @property
+    def available(self) -> int:
+        with self._lock:
+            return len(self._rooms)
+
+    def start(self):
+        """Start filling the pool (only once per process)."""
+        with self._start_lock:
+            if self._started or self.size <= 0 or not self.enabled:
+                return
+            self._started = True
+        self._wanted.set()
+        threading.Thread(target=self._refill, name="livekit-room-pool", daemon=True).start()
+
+    def acquire(self) -> str:
+        """Name of a room for a new interview; never waits for LiveKit."""
+        return self.acquire_many(1)[0]
+
+    def acquire_many(self, count: int) -> List[str]:
+        """
+        Names of ``count`` rooms for new interviews; never waits for LiveKit.
+
+        Rooms the pool can't supply are created in the background, in parallel.
+        """
+        if not self.enabled:
+            return [new_room_name() for _ in range(count)]
+        self.start()
+        now = time.monotonic()
+        with self._lock:
+            # Rooms close to LiveKit's empty timeout are not handed out
+            while self._rooms and now - self._rooms[0][0] > self.max_age_secs:
+                self._rooms.pop(0)
+            taken = min(count, len(self._rooms))
+            rooms = [name for _, name in self._rooms[len(self._rooms) - taken:]]
+            del self._rooms[len(self._rooms) - taken:]
+            available = len(self._rooms)
+        metrics.set_gauge("livekit_room_pool_available", available)
+        self._wanted.set()
+
+        created = [new_room_name() for _ in range(count - taken)]
+        for room in created:
+            self._executor.submit(self.livekit_service.create_room, room)
+        if taken:
+            metrics.inc("livekit_room_assignments_total", taken, source="pool")
+        if created:
+            metrics.inc("livekit_room_assignments_total", len(created), source="created")
+        return rooms + created
+
+    def create_rooms(self, names: Iterable[str]) -> List[str]:
+        """Create rooms in parallel and return the names of those LiveKit accepted."""
+        return [name for name in self._executor.map(self.livekit_service.create_room, names) if name]
+
+    def _refill(self):
+        while True:
+            # Woken when a room is taken, and periodically to replace rooms that got too old
+            self._wanted.wait(timeout=max(self.max_age_secs / 4, 1.0))
+            self._wanted.clear()
+            now = time.monotonic()
+            with self._lock:
+                self._rooms = [room for room in self._rooms if now - room[0] <= self.max_age_secs]
+                missing = self.size - len(self._rooms)
+            if missing <= 0:
+                continue
+
+            try:
+                created = self.create_rooms([new_room_name() for _ in range(missing)])
+            except RuntimeError:
+                return  # The interpreter is shutting down
+            created_at = time.monotonic()
+            with self._lock:
+                self._rooms.extend((created_at, name) for name in created)
+                available = len(self._rooms)
+            metrics.set_gauge("livekit_room_pool_available", available)
+
+            if len(created) < missing:
+                # LiveKit is failing or unreachable; try again later instead of in a loop
+                time.sleep(self.retry_secs)
+                self._wanted.set()
@@ -1,78 +1,148 @@
 import os
 import json
 import uuid
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for, session, send_file, current_app
+from flask import Blueprint, render_template, request, jsonify, redirect, url_for, session, send_file, current_app, Response, stream_with_context
 from app.models import Interview, InterviewStorage
+from app.models.serialization import FORMAT_VERSION
 from app.services import LLMService, SpeechService, LiveKitService, Message
+from app.metrics import metrics, record_provider_fallback
+from app.resilience import provider_health
+from app.adaptive import adaptive_mode
+from app.analysis import analyze_interview, analyze_interviews, ensure_analysis, question_for_turn
+from app.cluster import socket_url_for
+from app.serving import in_flight_turns, connections
+from app.jobs import JobQueue
+from app.search import SearchIndex, INDEX_FILENAME
+from app.analytics import CohortAnalytics
+from app.rooms import RoomPool
+from app.export import FORMATS as EXPORT_FORMATS, export_interviews, parse_since, select_fields as select_export_fields
 from app import socketio
 from flask_socketio import join_room, leave_room
 from werkzeug.utils import secure_filename
 import asyncio
+from contextlib import nullcontext
 import base64
-from threading import Thread
+from threading import Event, Lock
 import random
+import time
+from datetime import datetime
 
 # Initialize services
 llm_service = LLMService()
 speech_service = SpeechService()
 livekit_service = LiveKitService()
-interview_storage = InterviewStorage(storage_dir=os.path.join(os.getcwd(), "interviews"))
+# Rooms are created ahead of time so creating an interview never waits for LiveKit
+room_pool = RoomPool(livekit_service,
+                     size=int(os.getenv("LIVEKIT_ROOM_POOL_SIZE", "5")),
+                     workers=int(os.getenv("LIVEKIT_ROOM_WORKERS", "8")))
+interview_storage = InterviewStorage(
+    storage_dir=os.path.join(os.getcwd(), "interviews"),
+    compress_completed=os.getenv("COMPRESS_COMPLETED_INTERVIEWS", "true").lower() in ("1", "true", "yes"),
+    format_version=int(os.getenv("INTERVIEW_FILE_FORMAT", str(FORMAT_VERSION))),
+)
+
+# Full-text search, kept up to date as interviews are saved
+search_index = SearchIndex(os.path.join(interview_storage.storage_dir, INDEX_FILENAME),
+                           rank_candidates=int(os.getenv("SEARCH_RANK_CANDIDATES", "5000")))
+interview_storage.add_save_listener(search_index.update, batch_listener=search_index.update_many)
+
+# Hiring report aggregates, refreshed from changed interview files at most once per ANALYTICS_MAX_AGE
+cohort_analytics = CohortAnalytics(interview_storage.storage_dir,
+                                   max_age_secs=float(os.getenv("ANALYTICS_MAX_AGE", "60")))
+
+# Stream audio to live transcription while the candidate is still speaking
+STREAMING_STT_ENABLED = os.getenv("STREAMING_STT", "true").lower() in ("1", "true", "yes")
+
+# Reply used when a recording contains no speech at all
+SILENT_CLIP_MESSAGE = "Sorry, I couldn't hear you. Could you please check your microphone and repeat your answer?"
+
+# Answers to the first few questions are followed by the interview's prepared question plan
+PLANNED_EARLY_TURNS = int(os.getenv("PLANNED_EARLY_TURNS", "2"))
+
+# Sent instead of starting a turn while the server drains for shutdown
+DRAINING_MESSAGE = "The server is restarting. Please try again in a moment."
+
+# Final assessments run on their own worker pool; interviews ended by a waiting
+# candidate go ahead of jobs recovered after a restart
+assessment_jobs = JobQueue(storage_dir=os.path.join(os.getcwd(), "jobs"),
+                           workers=int(os.getenv("ASSESSMENT_WORKERS", "2")))
+ASSESSMENT_PRIORITY_LIVE = 0
+# Question plans share the workers, after every live assessment; single interviews
+# go ahead of bulk batches so a few large batches don't delay them
+QUESTION_PLAN_PRIORITY_SINGLE = 5
+QUESTION_PLAN_PRIORITY = 10
+FINAL_ASSESSMENT_FALLBACK = "Thank you for participating in this interview. I've enjoyed our conversation. Based on your responses, I'd rate you a 7 out of 10. You appear to be a good fit for the position."
+
+# Active streaming transcription sessions, keyed by Socket.IO session id
+live_sessions = {}
+live_sessions_lock = Lock()
+
+# Joins generating an interview's next question, keyed by interview id; other joins wait for it
+join_generations = {}
+join_generations_lock = Lock()
+JOIN_WAIT_SECS = 30
+
+# Most interviews one bulk creation request may create
+BATCH_MAX_INTERVIEWS = int(os.getenv("BATCH_MAX_INTERVIEWS", "1000"))
+
+# Page size limits for the interview listing API
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
 
 # Define blueprint
 main = Blueprint("main", __name__)
 
 # Pre-defined fallback questions for quick mode
 def get_fallback_question(interview, question_num):
-    """Generate an interview question based on the job description and system prompt."""
-    # Extract key information from the interview
-    job_description = interview.job_description
-    system_prompt = interview.system_prompt
-    cv = interview.cv
-    
-    # Generate questions based on the job description and system prompt
-    job_specific_questions = [
-        f"Based on the job description that mentions {job_description[:50]}..., could you tell me about your background and why you're interested in this position?",
-        f"The role requires skills in {job_description[50:100]}... Can you share a specific example of how you've demonstrated these skills?",
-        f"How do your qualifications align with the requirements mentioned in the job description, particularly regarding {job_description[100:150]}...?",
-        f"What aspects of this role involving {job_description[150:200]}... are you most excited about?",
-        f"The job involves responsibilities related to {job_description[200:250]}... How has your previous experience prepared you for this?"
-    ]
-    
-    # Add questions from system prompt if it exists
-    if system_prompt and len(system_prompt) > 10:
-        # Extract potential questions from system prompt by looking for question marks
-        parts = system_prompt.split('?')
-        extracted_questions = []
-        for i in range(len(parts)-1):  # Exclude the last part which doesn't end with a question mark
-            # Get the text before the question mark and add it back
-            question = parts[i].strip()
-            # Only include if it's reasonably long (likely a full question)
-            if len(question) > 15:
-                if not question.startswith("Could you") and not question.startswith("Can you"):
-                    question = "Could you " + question.lower()
-                extracted_questions.append(f"{question}?")
-        
-        # Add any extracted questions to our list
-        job_specific_questions.extend(extracted_questions)
-    
-    # Ensure we have enough questions by adding generic follow-ups
-    generic_followups = [
-        "Could you elaborate more on your previous answer?",
-        "That's interesting. How does that experience relate to the position you're applying for?",
-        "Can you provide another example that demonstrates your skills in this area?",
-        "What would you do differently if you encountered a similar situation in this role?",
-        "How do you think your approach would benefit our team?",
-        "What metrics or methods would you use to measure success in these efforts?"
-    ]
-    
-    # Combine all questions
-    all_questions = job_specific_questions + generic_followups
+    """Look up the quick-mode question for a turn in the interview's precomputed analysis."""
+    return question_for_turn(ensure_analysis(interview), question_num)
+
+
+def next_planned_question(interview):
+    """Return the first prepared question that has not been asked yet, or None."""
+    if not interview.question_plan:
+        # The plan may have been stored after this copy of the interview was loaded
+        stored = interview_storage.load_interview(interview.id, lazy=True)
+        if stored:
+            interview.question_plan = stored.question_plan
+    asked = {m["content"] for m in interview.transcripts if m["role"] == "ai"}
+    for question in interview.question_plan:
+        if question not in asked:
+            return question
+    return None
+
+
+def use_planned_question(interview):
+    """Whether the next question should come from the plan instead of the live LLM."""
+    answers = sum(1 for m in interview.transcripts if m["role"] == "candidate")
+    return answers <= PLANNED_EARLY_TURNS
+
+
+def prepare_question_plan(interview_id, cv, job_description, system_prompt):
+    """Background job: generate the interview's question plan and store it."""
+    with metrics.span("question_plan", interview_id):
+        plan = llm_service.generate_question_plan(cv, job_description, system_prompt)
+    if not plan:
+        return
     
-    # Return closing question if we've gone through all questions
-    if question_num >= len(all_questions):
-        return "Thank you for all your answers. Based on our conversation, is there anything else you'd like to add before we conclude the interview?"
+    def store_plan(interview):
+        interview.question_plan = plan
     
-    return all_questions[question_num]
+    interview_storage.update_interview(interview_id, store_plan)
+    print(f"Prepared {len(plan)} questions for interview {interview_id}")
+
+def run_question_plans(job):
+    """Background job: prepare the question plans of new interviews."""
+    for interview_id in job["payload"]["interview_ids"]:
+        interview = interview_storage.load_interview(interview_id, lazy=True)
+        # Deleted, or already planned before a restart
+        if interview is None or interview.question_plan:
+            continue
+        try:
+            prepare_question_plan(interview_id, interview.cv, interview.job_description, interview.system_prompt)
+        except Exception as e:
+            # One failed plan must not hold up the rest; the interview works without it
+            print(f"Error preparing question plan for interview {interview_id}: {e}")
 
 # Helper to convert messages for LLM format
 def format_messages_for_llm(interview):
@@ -90,12 +160,96 @@ def format_messages_for_llm(interview):
     return messages
 
 
+def turn_mode(use_quick_mode):
+    """Label used to tag timing spans with the turn's generation mode."""
+    return "quick" if use_quick_mode else "full"
+
+
+def render_speech(text, interview_id=None, mode=None):
+    """
+    Convert text to speech and save it under static/temp.
+
+    Slow requests are hedged and failures counted by the Deepgram circuit breaker,
+    so a failed attempt is not retried here.
+
+    Returns:
+        str: The saved filename, or None if TTS failed
+    """
+    with metrics.span("tts", interview_id, mode):
+        audio_data = speech_service.text_to_speech(text)
+
+    if not audio_data or len(audio_data) < 100:  # Check if audio data is too small/empty
+        print("WARNING: TTS failed. Sending response without audio.")
+        # Empty audio URL will trigger the browser TTS fallback
+        record_provider_fallback("deepgram", "tts_browser")
+        return None
+
+    print(f"Successfully generated audio, size: {len(audio_data)} bytes")
+    filename = f"tts_{uuid.uuid4()}.mp3"
+    filepath = os.path.join(os.getcwd(), "app", "static", "temp", filename)
+    with metrics.span("disk_write", interview_id, mode):
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, "wb") as f:
+            f.write(audio_data)
+    return filename
+
+
+def remember_speech(interview, filename):
+    """Store the rendered audio filename on the latest AI message so reconnects can replay it."""
+    if filename and interview.transcripts and interview.transcripts[-1]["role"] == "ai":
+        interview.transcripts[-1]["audio_file"] = filename
+        return True
+    return False
+
+
+def speech_url(filename):
+    """Public URL of a rendered TTS file, or "" (browser TTS) if it is missing."""
+    if not filename or not os.path.exists(os.path.join(os.getcwd(), "app", "static", "temp", filename)):
+        return ""
+    return url_for("static", filename=f"temp/{filename}", _external=True)
+
+
+def start_turn_task(target, *args):
+    """Run a turn as a background task, counted as in flight until it finishes."""
+    in_flight_turns.begin()
+    
+    def run():
+        try:
+            target(*args)
+        finally:
+            in_flight_turns.end()
+    
+    socketio.start_background_task(run)
+
+
+def record_mode_decision(interview, decision):
+    """Log a turn the server switched to quick mode; call it where the turn's answer is saved."""
+    if decision is not None and decision.downgraded:
+        interview.mode_decisions.append(decision.to_dict())
+
+
+def save_interview_timed(interview, mode=None, locked=False):
+    """Save an interview, recording the write as a disk_write span.
+    
+    Turns load the interview before the background question plan may have
+    been stored, so an empty plan is filled from the stored file under the
+    interview's lock instead of overwriting it. Pass ``locked=True`` when
+    the caller already holds that lock.
+    """
+    with metrics.span("disk_write", interview.id, mode):
+        with nullcontext() if locked else interview_storage.lock(interview.id):
+            if not interview.question_plan:
+                stored = interview_storage.load_interview(interview.id, lazy=True)
+                if stored is not None and stored.question_plan:
+                    interview.question_plan = stored.question_plan
+            return interview_storage.save_interview(interview)
+
+
 # Routes
 @main.route("/")
 def index():
-    """Admin dashboard route."""
-    interviews = interview_storage.list_interviews()
-    return render_template("admin.html", interviews=interviews)
+    """Admin dashboard route (past interviews are loaded page by page from /api/interviews)."""
+    return render_template("admin.html")
 
 
 @main.route("/create_interview", methods=["POST"])
@@ -108,15 +262,19 @@ def create_interview():
     if not cv or not job_description:
         return jsonify({"error": "CV and Job Description are required"}), 400
     
-    # Create new interview
+    # Create new interview in a room from the pool
     interview = Interview(cv=cv, job_description=job_description, system_prompt=system_prompt)
+    interview.room_name = room_pool.acquire()
+    
+    # Extract skills, responsibilities and quick-mode questions once
+    interview.analysis = analyze_interview(cv, job_description, system_prompt)
     
     # Save interview
     interview_storage.save_interview(interview)
     
-    # Create LiveKit room
-    room_name = f"interview-{interview.id}"
-    livekit_service.create_room(room_name)
+    # Prepare tailored questions before the candidate joins, as a job that survives a restart
+    assessment_jobs.submit("question_plans", {"interview_ids": [interview.id]},
+                           priority=QUESTION_PLAN_PRIORITY_SINGLE, job_id=f"question-plan-{interview.id}")
     
     return jsonify({
         "interview_id": interview.id,
@@ -124,19 +282,73 @@ def create_interview():
     })
 
 
+@main.route("/api/interviews/batch", methods=["POST"])
+def create_interviews_batch():
+    """
+    Create one interview per CV for a shared job description and prompt.
+    
+    JSON body: ``job_description``, ``system_prompt`` (optional) and ``cvs``, a
+    list of CV texts (at most ``BATCH_MAX_INTERVIEWS``). The interviews are
+    returned in the order of ``cvs``. Rooms come from the room pool or are
+    created in the background, and question plans are prepared as background
+    jobs, so the response doesn't wait for LiveKit or the LLM.
+    """
+    data = request.get_json(silent=True) or {}
+    job_description = data.get("job_description") or ""
+    system_prompt = data.get("system_prompt") or ""
+    cvs = data.get("cvs")
+    
+    if not job_description:
+        return jsonify({"error": "Job Description is required"}), 400
+    if not isinstance(cvs, list) or not cvs:
+        return jsonify({"error": "cvs must be a non-empty list of CV texts"}), 400
+    if len(cvs) > BATCH_MAX_INTERVIEWS:
+        return jsonify({"error": f"At most {BATCH_MAX_INTERVIEWS} interviews can be created at once"}), 400
+    invalid = [i for i, cv in enumerate(cvs) if not isinstance(cv, str) or not cv.strip()]
+    if invalid:
+        return jsonify({"error": f"CV is required (missing at positions {', '.join(map(str, invalid[:10]))})"}), 400
+    
+    start = time.perf_counter()
+    rooms = room_pool.acquire_many(len(cvs))
+    analyses = analyze_interviews(cvs, job_description, system_prompt)
+    interviews = []
+    for cv, room_name, analysis in zip(cvs, rooms, analyses):
+        interview = Interview(cv=cv, job_description=job_description, system_prompt=system_prompt)
+        interview.room_name = room_name
+        interview.analysis = analysis
+        interviews.append(interview)
+    interview_storage.save_interviews(interviews)
+    
+    # One job for the whole batch: plans are prepared one at a time on a single worker
+    assessment_jobs.submit("question_plans", {"interview_ids": [interview.id for interview in interviews]},
+                           priority=QUESTION_PLAN_PRIORITY)
+    print(f"Created {len(interviews)} interviews in {time.perf_counter() - start:.2f}s")
+    
+    return jsonify({
+        "count": len(interviews),
+        "interviews": [
+            {
+                "interview_id": interview.id,
+                "invite_link": url_for("main.join_interview", interview_id=interview.id, _external=True)
+            }
+            for interview in interviews
+        ]
+    })
+
+
 @main.route("/interview/<interview_id>/join")
 def join_interview(interview_id):
     """Join an interview as a candidate."""
-    # Load the interview using the existing interview_storage
-    interview = interview_storage.load_interview(interview_id)
+    # The page only needs the ID and status, so the transcript and prompts are never read
+    interview = interview_storage.load_interview(interview_id, lazy=True)
     
     # Check if interview exists
     if not interview:
         return "Interview not found", 404
     
-    # Create LiveKit token for candidate
-    room_name = f"interview-{interview_id}"
-    token = livekit_service.create_token(room_name, f"candidate-{uuid.uuid4()}", is_admin=False)
+    # Create LiveKit token for candidate (one identity per interview, so reloading the page reuses the token)
+    room_name = interview.room_name
+    token = livekit_service.create_token(room_name, f"candidate-{interview_id}", is_admin=False)
     
     # Pass the interview object to the template
     return render_template(
@@ -146,6 +358,8 @@ def join_interview(interview_id):
         room_name=room_name,
         token=token,
         livekit_url=os.getenv("LIVEKIT_URL"),
+        streaming_stt=STREAMING_STT_ENABLED,
+        socket_url=socket_url_for(interview_id),
         is_admin=False
     )
 
@@ -164,6 +378,98 @@ def admin_view_interview(interview_id):
     )
 
 
+@main.route("/api/interviews", methods=["GET"])
+def list_interviews_api():
+    """
+    One page of interview summaries from the listing index.
+    
+    Query parameters: ``sort`` (created_at or rating), ``order`` (desc or asc),
+    ``limit``, ``cursor`` (``next_cursor`` of the previous page), ``completed``
+    (true or false), ``min_rating`` and ``max_rating``.
+    """
+    args = request.args
+    try:
+        limit = min(max(int(args.get("limit", DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        completed = args.get("completed")
+        if completed is not None:
+            completed = completed.lower() in ("1", "true", "yes")
+        min_rating = int(args["min_rating"]) if args.get("min_rating") else None
+        max_rating = int(args["max_rating"]) if args.get("max_rating") else None
+        interviews, next_cursor = interview_storage.index.query(
+            sort=args.get("sort", "created_at"),
+            order=args.get("order", "desc"),
+            limit=limit,
+            cursor=args.get("cursor") or None,
+            completed=completed,
+            min_rating=min_rating,
+            max_rating=max_rating,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    return jsonify({
+        "interviews": interviews,
+        "next_cursor": next_cursor,
+        "total": len(interview_storage.index)
+    })
+
+
+@main.route("/api/interviews/export", methods=["GET"])
+def export_interviews_api():
+    """
+    Stream all (or filtered) interviews as a gzip-compressed NDJSON or CSV file.
+
+    Query parameters: ``format`` (ndjson or csv), ``fields`` and ``exclude``
+    (comma-separated columns, e.g. ``exclude=cv,system_prompt``), ``since``
+    (ISO date or epoch seconds; only interviews saved since then) and
+    ``completed`` (true or false). The ``X-Export-Watermark`` response header
+    is the ``since`` to use for the next incremental export.
+    """
+    args = request.args
+    fmt = args.get("format", "ndjson")
+
+    def split(value):
+        return [f.strip() for f in value.split(",") if f.strip()]
+
+    try:
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}")
+        fields = select_export_fields(split(args.get("fields", "")), split(args.get("exclude", "")))
+        since = parse_since(args.get("since"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    completed = args.get("completed")
+    if completed is not None:
+        completed = completed.lower() in ("1", "true", "yes")
+
+    watermark = time.time()
+    chunks = export_interviews(interview_storage.storage_dir, fmt, fields, since=since, completed=completed)
+    filename = f"interviews-{datetime.fromtimestamp(watermark).strftime('%Y%m%dT%H%M%S')}.{fmt}.gz"
+    return Response(stream_with_context(chunks), mimetype="application/gzip", headers={
+        "Content-Disposition": f"attachment; filename={filename}",
+        "X-Export-Watermark": str(watermark),
+    })
+
+
+@main.route("/api/search", methods=["GET"])
+def search_interviews():
+    """
+    Ranked full-text search over transcripts, evaluations, verdicts and CVs.
+    
+    Query parameters: ``q`` (terms and "quoted phrases", all must match),
+    ``limit`` and ``fields`` (comma-separated, e.g. ``candidate,cv``).
+    """
+    query = request.args.get("q", "")
+    fields = [f.strip() for f in request.args.get("fields", "").split(",") if f.strip()] or None
+    try:
+        limit = min(max(int(request.args.get("limit", 20)), 1), MAX_PAGE_SIZE)
+        results = search_index.search(query, limit=limit, fields=fields)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    return jsonify({"query": query, "results": results})
+
+
 @main.route("/api/interviews/<interview_id>", methods=["GET"])
 def get_interview(interview_id):
     """Get interview data."""
@@ -174,6 +480,54 @@ def get_interview(interview_id):
     return jsonify(interview.to_dict())
 
 
+@main.route("/api/interviews/<interview_id>/timings", methods=["GET"])
+def get_interview_timings(interview_id):
+    """Get the most recent turn stage timings recorded for an interview."""
+    return jsonify({"interview_id": interview_id, "spans": metrics.recent_spans(interview_id)})
+
+
+@main.route("/metrics")
+def prometheus_metrics():
+    """Expose turn stage histograms and provider counters in Prometheus text format."""
+    return Response(metrics.render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+
+@main.route("/api/providers/health")
+def get_provider_health():
+    """Circuit breaker state of each external provider."""
+    return jsonify(provider_health.snapshot())
+
+
+@main.route("/api/admin/analytics")
+def get_analytics():
+    """
+    Hiring report: completion rate, rating distribution, interview length and
+    time per turn, overall and per job description.
+    
+    Query parameters: ``since`` and ``until`` (ISO dates, on creation time),
+    ``min_interviews`` (per job description) and ``refresh`` (re-read changed
+    interview files now instead of waiting for ANALYTICS_MAX_AGE).
+    """
+    args = request.args
+    try:
+        since = datetime.fromisoformat(args["since"]).timestamp() if args.get("since") else None
+        until = datetime.fromisoformat(args["until"]).timestamp() if args.get("until") else None
+        min_interviews = int(args.get("min_interviews", 1))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    refreshed = cohort_analytics.refresh(force=args.get("refresh", "").lower() in ("1", "true", "yes"))
+    report = cohort_analytics.report(since=since, until=until, min_interviews=min_interviews)
+    report["refresh"] = refreshed
+    return jsonify(report)
+
+
+@main.route("/api/admin/adaptive-mode")
+def get_adaptive_mode():
+    """Adaptive quick mode state and its recent downgrade decisions."""
+    return jsonify(adaptive_mode.status())
+
+
 @main.route("/api/tts", methods=["POST"])
 def text_to_speech_api():
     """Convert text to speech."""
@@ -201,12 +555,86 @@ def text_to_speech_api():
 # WebSocket handlers
 @socketio.on("connect")
 def handle_connect():
+    # Refuse new clients while draining or above the configured connection limit
+    if in_flight_turns.draining:
+        metrics.inc("socketio_connections_rejected_total", reason="draining")
+        print(f"Rejected client {request.sid} (draining)")
+        return False
+    if not connections.acquire(current_app.config.get("MAX_CONNECTIONS", 0)):
+        print(f"Rejected client {request.sid} ({connections.count} connected)")
+        return False
     print(f"Client connected: {request.sid}")
 
 
 @socketio.on("disconnect")
 def handle_disconnect():
     print(f"Client disconnected: {request.sid}")
+    connections.release()
+    
+    # Drop any recording that was still streaming
+    with live_sessions_lock:
+        session = live_sessions.pop(request.sid, None)
+    if session:
+        session.close()
+
+
+def claim_join(interview_id):
+    """
+    Decide what a join sends, holding the interview lock only to read and claim.
+
+    Returns:
+        tuple: the lazily loaded interview (None if missing), its last entry, and
+        whether this join claimed generating the next question
+    """
+    with interview_storage.lock(interview_id):
+        # Only the last message decides what to send, so a reconnect reads just that
+        interview = interview_storage.load_interview(interview_id, lazy=True)
+        if not interview:
+            return None, None, False
+        print(f"Interview has {interview.transcript_count} messages")
+        tail = interview.transcript_tail(1)
+        last_entry = tail[0] if tail else None
+        if last_entry and last_entry["role"] == "ai":
+            # Reconnect: replay the pending question and its audio without calling any provider
+            return interview, last_entry, False
+        # At most one join per interview generates, so a reconnect storm asks one question
+        with join_generations_lock:
+            if interview_id in join_generations:
+                return interview, last_entry, False
+            join_generations[interview_id] = Event()
+        return interview, last_entry, True
+
+
+def ask_join_question(interview, interview_id, last_entry):
+    """
+    Generate the greeting or the reply to an unanswered answer and save it.
+
+    Returns:
+        tuple: the saved question entry and whether it is a replay of the question
+        another worker saved meanwhile
+    """
+    if not last_entry:
+        print("Generating initial greeting")
+        ai_message = "Welcome to your interview! I'll be asking you some questions about your experience and skills. Let's start: Could you tell me about your background and why you're interested in this position?"
+    else:
+        # The candidate's last answer was never replied to
+        print("Generating next question")
+        with metrics.span("llm", interview_id):
+            ai_message = llm_service.generate_interview_question(format_messages_for_llm(interview))
+    
+    print("Converting to speech")
+    filename = render_speech(ai_message, interview_id)
+    
+    with interview_storage.lock(interview_id):
+        # Check again: the interview may have moved on while the providers ran
+        interview = interview_storage.load_interview(interview_id, lazy=True)
+        tail = interview.transcript_tail(1)
+        if tail and tail[0]["role"] == "ai":
+            return tail[0], True
+        interview.add_message("ai", ai_message)
+        remember_speech(interview, filename)
+        save_interview_timed(interview, locked=True)
+        return interview.transcripts[-1], False
 
 
 @socketio.on("join_interview")
@@ -220,67 +648,43 @@ def handle_join_interview(data):
     join_room(f"interview_{interview_id}")
     print(f"Client {request.sid} joined interview {interview_id}")
     
-    # Load interview
-    interview = interview_storage.load_interview(interview_id)
-    if not interview:
-        print(f"Interview {interview_id} not found")
-        socketio.emit("error", {"message": "Interview not found"}, to=request.sid)
-        return
-    
-    # If no messages yet, generate initial greeting
-    print(f"Interview has {len(interview.transcripts)} messages")
-    
-    # Always generate a greeting/first question when a user joins
-    # Format messages for LLM
-    messages = format_messages_for_llm(interview)
-    
-    # Generate greeting
     try:
-        if not interview.transcripts:
-            print("Generating initial greeting")
-            ai_message = "Welcome to your interview! I'll be asking you some questions about your experience and skills. Let's start: Could you tell me about your background and why you're interested in this position?"
-        else:
-            print("Generating next question")
-            ai_message = llm_service.generate_interview_question(messages)
-        
-        # Add to transcript if it's new
-        if not interview.transcripts or interview.transcripts[-1]["role"] != "ai":
-            interview.add_message("ai", ai_message)
-            interview_storage.save_interview(interview)
-        else:
-            # Use the last AI message
-            ai_message = interview.transcripts[-1]["content"]
-        
-        # Convert to speech
-        print("Converting to speech")
-        audio_data = speech_service.text_to_speech(ai_message)
-        
-        # If audio generation failed, try one more time with a fallback voice
-        if not audio_data or len(audio_data) < 100:  # Check if audio data is too small/empty
-            print("First audio generation attempt failed, retrying...")
-            audio_data = speech_service.text_to_speech(ai_message, fallback_voice=True)
-        
-        # Save audio to temporary file
-        filename = f"tts_{uuid.uuid4()}.mp3"
-        filepath = os.path.join(os.getcwd(), "app", "static", "temp", filename)
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        interview, last_entry, claimed = claim_join(interview_id)
+        if not interview:
+            print(f"Interview {interview_id} not found")
+            socketio.emit("error", {"message": "Interview not found"}, to=request.sid)
+            return
         
-        with open(filepath, "wb") as f:
-            f.write(audio_data)
+        replay = True
+        if claimed:
+            # The interview lock is not held while the providers run, so turns are not blocked
+            try:
+                last_entry, replay = ask_join_question(interview, interview_id, last_entry)
+            finally:
+                with join_generations_lock:
+                    join_generations.pop(interview_id).set()
+        elif last_entry is None or last_entry["role"] != "ai":
+            # Another join is generating this question; replay it once it is saved
+            waiting = join_generations.get(interview_id)
+            if waiting:
+                waiting.wait(JOIN_WAIT_SECS)
+            tail = interview_storage.load_interview(interview_id, lazy=True).transcript_tail(1)
+            last_entry = tail[0] if tail else None
+            if last_entry is None or last_entry["role"] != "ai":
+                raise RuntimeError("no question was generated")
         
-        # Emit greeting
-        print(f"Emitting AI message to room interview_{interview_id}")
-        socketio.emit("ai_message", {
-            "message": ai_message,
-            "audio_url": url_for("static", filename=f"temp/{filename}", _external=True)
-        }, to=f"interview_{interview_id}")
+        ai_message = last_entry["content"]
+        filename = last_entry.get("audio_file")
+        audio_url = speech_url(filename)
         
-        # Also send directly to the user who just joined
-        print(f"Emitting AI message directly to client {request.sid}")
-        socketio.emit("ai_message", {
-            "message": ai_message,
-            "audio_url": url_for("static", filename=f"temp/{filename}", _external=True)
-        }, to=request.sid)
+        # Send to the joining client only; others in the room already have this question
+        print(f"Emitting AI message to client {request.sid}")
+        with metrics.span("emit", interview_id):
+            socketio.emit("ai_message", {
+                "message": ai_message,
+                "audio_url": audio_url,
+                "replay": replay
+            }, to=request.sid)
     except Exception as e:
         print(f"Error generating greeting: {e}")
         socketio.emit("error", {"message": "Error starting interview"}, to=request.sid)
@@ -292,10 +696,15 @@ def handle_candidate_speech(data):
     audio_data = data.get("audio")
     text = data.get("text")  # For direct text input (e.g., "end the interview")
     use_quick_mode = data.get("quick_mode", False)  # Optional flag to skip LLM for faster responses
+    mode = turn_mode(use_quick_mode)
     
     if not interview_id:
         return
     
+    if in_flight_turns.draining:
+        socketio.emit("error", {"message": DRAINING_MESSAGE}, to=request.sid)
+        return
+    
     # Load interview
     interview = interview_storage.load_interview(interview_id)
     if not interview:
@@ -303,291 +712,391 @@ def handle_candidate_speech(data):
     
     if text:
         # Direct text input provided (e.g., from end interview button)
-        transcript = text
-        evaluation = None  # Initialize evaluation variable
-        
-        # Add to transcript
-        interview.add_message("candidate", transcript)
-        interview_storage.save_interview(interview)
-        
-        # Emit back to the client to acknowledge and update UI
+        with in_flight_turns.track():
+            decision = adaptive_mode.decide(use_quick_mode, in_flight_turns.count, interview_id)
+            with metrics.span("turn", interview_id, turn_mode(decision.quick)):
+                handle_text_response(interview, interview_id, text, turn_mode(decision.quick), decision)
+    elif audio_data:
+        try:
+            # Binary attachment (or legacy base64 data URL) to bytes
+            with metrics.span("audio_decode", interview_id, mode):
+                audio_bytes = speech_service.decode_audio_payload(audio_data)
+            
+            # Start processing in background (the recording is trimmed and saved there)
+            print("Starting audio processing thread...")
+            app = current_app._get_current_object()  # Get actual app object, not proxy
+            start_turn_task(process_audio, app, audio_bytes, interview, interview_id, use_quick_mode)
+            
+            # Return immediately to acknowledge receipt
+            return
+            
+        except Exception as e:
+            print(f"Error processing audio: {e}")
+            socketio.emit("error", {"message": "Failed to process audio"}, to=request.sid)
+            return
+    else:
+        socketio.emit("error", {"message": "No audio or text provided"}, to=request.sid)
+        return 
+
+
+def handle_text_response(interview, interview_id, transcript, mode, decision=None):
+    """Handle a typed candidate response (or the end-interview command).
+    
+    ``decision`` is the adaptive mode decision for the turn: quick turns take
+    their question from the plan or the question bank, and turns the server
+    switched to quick mode also skip the evaluation.
+    """
+    evaluation = None  # Initialize evaluation variable
+    use_quick_mode = decision is not None and decision.quick
+    
+    # Add to transcript
+    interview.add_message("candidate", transcript)
+    record_mode_decision(interview, decision)
+    save_interview_timed(interview, mode)
+    
+    # Emit back to the client to acknowledge and update UI
+    with metrics.span("emit", interview_id, mode):
         socketio.emit("transcription_result", {
             "transcript": transcript
         }, to=f"interview_{interview_id}")
+    
+    # Process the text response unless it's an end command (or the server switched the turn to quick mode)
+    if "end the interview" not in transcript.lower() and not (decision is not None and decision.downgraded):
+        # Send a processing update for evaluation
+        socketio.emit("processing_update", {
+            "status": "evaluating",
+            "message": "Evaluating your text response..."
+        }, to=f"interview_{interview_id}")
         
-        # Process the text response unless it's an end command
-        if "end the interview" not in transcript.lower():
-            # Send a processing update for evaluation
-            socketio.emit("processing_update", {
-                "status": "evaluating",
-                "message": "Evaluating your text response..."
-            }, to=f"interview_{interview_id}")
-            
-            # Generate evaluation for the text response
+        # Generate evaluation for the text response
+        with metrics.span("evaluation", interview_id, mode):
             evaluation = llm_service.generate_response_evaluation(transcript)
-            
-            # Add evaluation to interview data but don't show to user
-            interview.add_message("evaluation", evaluation)
-            interview_storage.save_interview(interview)
-            
-            # Let the user know we're generating a response
-            socketio.emit("processing_update", {
-                "status": "thinking",
-                "message": "AI is thinking about your text response..."
-            }, to=f"interview_{interview_id}")
         
-        # Continue with the original workflow for text
-        # Format messages for LLM
-        messages = format_messages_for_llm(interview)
+        # Add evaluation to interview data but don't show to user
+        interview.add_message("evaluation", evaluation)
+        save_interview_timed(interview, mode)
         
-        # Check if this is the end of the interview
-        if len(interview.transcripts) >= 10 or "end the interview" in transcript.lower():
-            try:
-                # Generate final assessment
-                rating, verdict = llm_service.generate_final_assessment(messages)
-                interview.set_rating(rating, verdict)
-                
-                # Save interview
-                interview_storage.save_interview(interview)
-                
-                # Generate thank you message
-                ai_message = f"Thank you for participating in this interview. I have completed my assessment. You received a rating of {rating}/10. {verdict}"
-                
-                # Add to transcript
-                interview.add_message("ai", ai_message)
-                interview_storage.save_interview(interview)
-                
-                # Convert to speech
-                audio_data = speech_service.text_to_speech(ai_message)
-                
-                # If audio generation failed, try one more time with a fallback voice
-                if not audio_data or len(audio_data) < 100:  # Check if audio data is too small/empty
-                    print("First audio generation attempt failed, retrying with fallback voice...")
-                    audio_data = speech_service.text_to_speech(ai_message, fallback_voice=True)
-                
-                # Debug the audio data
-                if not audio_data or len(audio_data) < 100:
-                    print("WARNING: Both TTS attempts failed for final assessment. Sending response without audio.")
-                    # Set empty audio URL - will trigger browser TTS fallback
-                    audio_url = ""
-                else:
-                    print(f"Successfully generated final assessment audio, size: {len(audio_data)} bytes")
-                    # Save audio to temporary file
-                    filename = f"tts_{uuid.uuid4()}.mp3"
-                    filepath = os.path.join(os.getcwd(), "app", "static", "temp", filename)
-                    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-                    
-                    with open(filepath, "wb") as f:
-                        f.write(audio_data)
-                    
-                    # Set the audio URL
-                    audio_url = url_for("static", filename=f"temp/{filename}", _external=True)
-                
-                # Emit final message
-                socketio.emit("ai_message", {
-                    "message": ai_message,
-                    "audio_url": audio_url,
-                    "is_final": True,
-                    "rating": rating,
-                    "verdict": verdict
-                }, to=f"interview_{interview_id}")
-            except Exception as e:
-                print(f"Error generating final assessment: {e}")
-                
-                # Fallback response
-                fallback_message = "Thank you for participating in this interview. I've enjoyed our conversation. Based on your responses, I'd rate you a 7 out of 10. You appear to be a good fit for the position."
-                
-                # Add to transcript
-                interview.add_message("ai", fallback_message)
-                interview_storage.save_interview(interview)
-                interview.set_rating(7, "Good fit for the position.")
-                interview_storage.save_interview(interview)
-                
-                # Try to generate speech with the fallback message
-                audio_data = speech_service.text_to_speech(fallback_message)
-                
-                # If audio generation failed, try one more time with a fallback voice
-                if not audio_data or len(audio_data) < 100:  # Check if audio data is too small/empty
-                    print("First audio generation attempt failed, retrying with fallback voice...")
-                    audio_data = speech_service.text_to_speech(fallback_message, fallback_voice=True)
-                
-                # Debug the audio data
-                if not audio_data or len(audio_data) < 100:
-                    print("WARNING: Both TTS attempts failed for fallback message. Sending response without audio.")
-                    # Set empty audio URL - will trigger browser TTS fallback
-                    audio_url = ""
-                else:
-                    print(f"Successfully generated fallback audio, size: {len(audio_data)} bytes")
-                    # Save audio to temporary file
-                    filename = f"tts_{uuid.uuid4()}.mp3"
-                    filepath = os.path.join(os.getcwd(), "app", "static", "temp", filename)
-                    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-                    
-                    with open(filepath, "wb") as f:
-                        f.write(audio_data)
-                    
-                    # Set the audio URL
-                    audio_url = url_for("static", filename=f"temp/{filename}", _external=True)
-                
-                # Emit final message
-                socketio.emit("ai_message", {
-                    "message": fallback_message,
-                    "audio_url": audio_url
-                }, to=f"interview_{interview_id}")
-        else:
-            try:
-                # If there was an evaluation, use it for a better response
-                if evaluation:
-                    # Create a new prompt that includes the evaluation
-                    next_question_prompt = f"""
-                    Based on the candidate's response and my evaluation, I need to ask a good follow-up question.
-                    The candidate's response was: "{transcript}"
-                    
-                    My evaluation was: "{evaluation}"
-                    
-                    Now I will ask a relevant follow-up question that probes deeper or shifts to a new area as appropriate:
-                    """
-                    
-                    next_question_message = Message(role="user", content=next_question_prompt)
-                    messages.append(next_question_message)
-                
-                # Generate next question
-                ai_message = llm_service.generate_interview_question(messages)
-                
-                # Add to transcript
-                interview.add_message("ai", ai_message)
-                interview_storage.save_interview(interview)
-                
-                # Send a processing update before attempting TTS
-                socketio.emit("processing_update", {
-                    "status": "speaking",
-                    "message": "Converting AI response to speech..."
-                }, to=f"interview_{interview_id}")
-                
-                # Convert to speech
-                print(f"Converting response to speech: '{ai_message[:50]}...'")
-                audio_data = speech_service.text_to_speech(ai_message)
+        # Let the user know we're generating a response
+        socketio.emit("processing_update", {
+            "status": "thinking",
+            "message": "AI is thinking about your text response..."
+        }, to=f"interview_{interview_id}")
+    
+    # Continue with the original workflow for text
+    # Format messages for LLM
+    messages = format_messages_for_llm(interview)
+    
+    # Check if this is the end of the interview
+    if len(interview.transcripts) >= 10 or "end the interview" in transcript.lower():
+        # The assessment can take most of a minute, so it runs as a background job
+        # and the result is pushed to the room when it is ready
+        job_id = f"assessment-{interview_id}"
+        socketio.emit("processing_update", {
+            "status": "queued",
+            "message": "Preparing your final assessment...",
+            "job_id": job_id,
+            "position": assessment_jobs.pending + 1,
+        }, to=f"interview_{interview_id}")
+        assessment_jobs.submit("final_assessment", {
+            "interview_id": interview_id,
+            "mode": mode,
+            "audio_base_url": url_for("static", filename="temp/", _external=True),
+        }, priority=ASSESSMENT_PRIORITY_LIVE, job_id=job_id)
+    else:
+        try:
+            # If there was an evaluation, use it for a better response
+            if evaluation:
+                # Create a new prompt that includes the evaluation
+                next_question_prompt = f"""
+                Based on the candidate's response and my evaluation, I need to ask a good follow-up question.
+                The candidate's response was: "{transcript}"
                 
-                # If audio generation failed, try one more time with a fallback voice
-                if not audio_data or len(audio_data) < 100:  # Check if audio data is too small/empty
-                    print("First audio generation attempt failed, retrying with fallback voice...")
-                    audio_data = speech_service.text_to_speech(ai_message, fallback_voice=True)
+                My evaluation was: "{evaluation}"
                 
-                # Debug the audio data
-                if not audio_data or len(audio_data) < 100:
-                    print("WARNING: Both TTS attempts failed for final assessment. Sending response without audio.")
-                    # Set empty audio URL - will trigger browser TTS fallback
-                    audio_url = ""
-                else:
-                    print(f"Successfully generated final assessment audio, size: {len(audio_data)} bytes")
-                    # Save audio to temporary file
-                    filename = f"tts_{uuid.uuid4()}.mp3"
-                    filepath = os.path.join(os.getcwd(), "app", "static", "temp", filename)
-                    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-                    
-                    with open(filepath, "wb") as f:
-                        f.write(audio_data)
-                    
-                    # Set the audio URL
-                    audio_url = url_for("static", filename=f"temp/{filename}", _external=True)
+                Now I will ask a relevant follow-up question that probes deeper or shifts to a new area as appropriate:
+                """
                 
-                # Emit next question
+                next_question_message = Message(role="user", content=next_question_prompt)
+                messages.append(next_question_message)
+            
+            # Generate next question (early and quick-mode turns come from the prepared plan)
+            ai_message = next_planned_question(interview) if use_quick_mode or use_planned_question(interview) else None
+            if not ai_message and use_quick_mode:
+                question_num = len([m for m in interview.transcripts if m["role"] == "candidate"])
+                ai_message = get_fallback_question(interview, question_num)
+            if not ai_message:
+                with metrics.span("llm", interview_id, mode):
+                    ai_message = llm_service.generate_interview_question(messages)
+            
+            # Add to transcript
+            interview.add_message("ai", ai_message)
+            save_interview_timed(interview, mode)
+            
+            # Send a processing update before attempting TTS
+            socketio.emit("processing_update", {
+                "status": "speaking",
+                "message": "Converting AI response to speech..."
+            }, to=f"interview_{interview_id}")
+            
+            # Convert to speech
+            print(f"Converting response to speech: '{ai_message[:50]}...'")
+            filename = render_speech(ai_message, interview_id, mode)
+            if remember_speech(interview, filename):
+                save_interview_timed(interview, mode)
+            audio_url = url_for("static", filename=f"temp/{filename}", _external=True) if filename else ""
+            
+            # Emit next question
+            with metrics.span("emit", interview_id, mode):
                 socketio.emit("ai_message", {
                     "message": ai_message,
                     "audio_url": audio_url
                 }, to=f"interview_{interview_id}")
-                
-            except Exception as e:
-                print(f"Error generating question: {e}")
-                
-                # Fallback question
-                fallback_message = "I'm interested in learning more about your experience. Could you tell me about a challenging situation at work and how you handled it?"
-                
-                # Add to transcript
-                interview.add_message("ai", fallback_message)
-                interview_storage.save_interview(interview)
-                
-                # Try to generate speech with the fallback message
-                audio_data = speech_service.text_to_speech(fallback_message)
-                
-                # If audio generation failed, try one more time with a fallback voice
-                if not audio_data or len(audio_data) < 100:  # Check if audio data is too small/empty
-                    print("First audio generation attempt failed, retrying with fallback voice...")
-                    audio_data = speech_service.text_to_speech(fallback_message, fallback_voice=True)
-                
-                # Debug the audio data
-                if not audio_data or len(audio_data) < 100:
-                    print("WARNING: Both TTS attempts failed for fallback message. Sending response without audio.")
-                    # Set empty audio URL - will trigger browser TTS fallback
-                    audio_url = ""
-                else:
-                    print(f"Successfully generated fallback audio, size: {len(audio_data)} bytes")
-                    # Save audio to temporary file
-                    filename = f"tts_{uuid.uuid4()}.mp3"
-                    filepath = os.path.join(os.getcwd(), "app", "static", "temp", filename)
-                    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-                    
-                    with open(filepath, "wb") as f:
-                        f.write(audio_data)
-                    
-                    # Set the audio URL
-                    audio_url = url_for("static", filename=f"temp/{filename}", _external=True)
-                
-                # Emit fallback question
+            
+        except Exception as e:
+            print(f"Error generating question: {e}")
+            record_provider_fallback("groq", "question")
+            
+            # Fallback question
+            fallback_message = "I'm interested in learning more about your experience. Could you tell me about a challenging situation at work and how you handled it?"
+            
+            # Add to transcript
+            interview.add_message("ai", fallback_message)
+            save_interview_timed(interview, mode)
+            
+            # Try to generate speech with the fallback message
+            filename = render_speech(fallback_message, interview_id, mode)
+            if remember_speech(interview, filename):
+                save_interview_timed(interview, mode)
+            audio_url = url_for("static", filename=f"temp/{filename}", _external=True) if filename else ""
+            
+            # Emit fallback question
+            with metrics.span("emit", interview_id, mode):
                 socketio.emit("ai_message", {
                     "message": fallback_message,
                     "audio_url": audio_url
                 }, to=f"interview_{interview_id}")
-    elif audio_data:
+
+
+def run_final_assessment(job):
+    """
+    Background job: assess a finished interview and send the closing message.
+    
+    Safe to run again after a restart: an interview that already has its rating
+    only has its closing message (re)sent.
+    """
+    payload = job["payload"]
+    interview_id = payload["interview_id"]
+    mode = payload.get("mode")
+    room = f"interview_{interview_id}"
+    
+    socketio.emit("processing_update", {
+        "status": "assessing",
+        "message": "AI is writing your final assessment...",
+        "job_id": job["id"],
+    }, to=room)
+    
+    interview = interview_storage.load_interview(interview_id)
+    if interview is None:
+        print(f"Interview {interview_id} not found, dropping final assessment job")
+        return
+    
+    if not interview.completed:
         try:
-            # Convert base64 to bytes
-            audio_bytes = base64.b64decode(audio_data.split(",")[1])
-            
-            # Save audio to file
-            audio_filename = f"response_{uuid.uuid4()}.webm"
-            audio_filepath = os.path.join(os.getcwd(), "app", "uploads", audio_filename)
-            speech_service.save_audio(audio_bytes, audio_filepath)
-            
-            # Start processing in background
-            print("Starting audio processing thread...")
-            app = current_app._get_current_object()  # Get actual app object, not proxy
-            Thread(target=process_audio, args=(app, audio_bytes, interview, interview_id, use_quick_mode)).start()
-            
-            # Return immediately to acknowledge receipt
-            return
-            
+            # Its own stage: one long call per interview must not count towards the per-turn LLM latency SLO
+            with metrics.span("assessment", interview_id, mode):
+                rating, verdict = llm_service.generate_final_assessment(format_messages_for_llm(interview))
+            ai_message = f"Thank you for participating in this interview. I have completed my assessment. You received a rating of {rating}/10. {verdict}"
         except Exception as e:
-            print(f"Error processing audio: {e}")
-            socketio.emit("error", {"message": "Failed to process audio"}, to=request.sid)
+            print(f"Error generating final assessment: {e}")
+            record_provider_fallback("groq", "assessment")
+            rating, verdict = 7, "Good fit for the position."
+            ai_message = FINAL_ASSESSMENT_FALLBACK
+        
+        def store_assessment(interview):
+            interview.set_rating(rating, verdict)
+            interview.add_message("ai", ai_message)
+        
+        with metrics.span("disk_write", interview_id, mode):
+            interview = interview_storage.update_interview(interview_id, store_assessment)
+        if interview is None:
             return
-    else:
-        socketio.emit("error", {"message": "No audio or text provided"}, to=request.sid)
-        return 
+    
+    closing = next((m for m in reversed(interview.transcripts) if m["role"] == "ai"), {})
+    ai_message = closing.get("content", FINAL_ASSESSMENT_FALLBACK)
+    filename = closing.get("audio_file")
+    if not filename:
+        socketio.emit("processing_update", {
+            "status": "speaking",
+            "message": "Converting AI response to speech..."
+        }, to=room)
+        filename = render_speech(ai_message, interview_id, mode)
+        if filename:
+            with metrics.span("disk_write", interview_id, mode):
+                interview_storage.update_interview(interview_id, lambda i: remember_speech(i, filename))
+    
+    with metrics.span("emit", interview_id, mode):
+        socketio.emit("ai_message", {
+            "message": ai_message,
+            "audio_url": payload["audio_base_url"] + filename if filename else "",
+            "is_final": True,
+            "rating": interview.rating,
+            "verdict": interview.verdict
+        }, to=room)
+
+
+assessment_jobs.register("final_assessment", run_final_assessment)
+assessment_jobs.register("question_plans", run_question_plans)
+
+
+@socketio.on("audio_stream_start")
+def handle_audio_stream_start(data):
+    """Open a live transcription session for a recording that is about to stream in."""
+    interview_id = data.get("interview_id")
+    if not interview_id:
+        return
+    
+    # Recordings already streaming are still finished while draining, new ones are refused
+    if in_flight_turns.draining:
+        socketio.emit("error", {"message": DRAINING_MESSAGE}, to=request.sid)
+        return
+    
+    room = f"interview_{interview_id}"
+    
+    def emit_interim(transcript):
+        socketio.emit("interim_transcript", {"transcript": transcript}, to=room)
+    
+    session = speech_service.start_live_transcription(on_interim=emit_interim)
+    with live_sessions_lock:
+        previous = live_sessions.pop(request.sid, None)
+        live_sessions[request.sid] = session
+    
+    # A new recording replaces one that was never stopped
+    if previous:
+        previous.close()
+
+
+@socketio.on("audio_stream_chunk")
+def handle_audio_stream_chunk(data):
+    """Relay one recorded chunk (binary) to the client's live transcription session."""
+    chunk = data.get("chunk")
+    with live_sessions_lock:
+        session = live_sessions.get(request.sid)
+    if session and chunk:
+        session.send(chunk)
+
+
+@socketio.on("audio_stream_stop")
+def handle_audio_stream_stop(data):
+    """Finish the live transcription and continue with the normal turn pipeline."""
+    interview_id = data.get("interview_id")
+    use_quick_mode = data.get("quick_mode", False)
+    
+    with live_sessions_lock:
+        session = live_sessions.pop(request.sid, None)
+    
+    if not interview_id or not session:
+        socketio.emit("error", {"message": "No active recording"}, to=request.sid)
+        return
+    
+    interview = interview_storage.load_interview(interview_id)
+    if not interview:
+        session.close()
+        return
+    
+    print("Starting streamed audio processing thread...")
+    app = current_app._get_current_object()  # Get actual app object, not proxy
+    start_turn_task(process_streamed_audio, app, session, interview, interview_id, use_quick_mode)
+
+
+def process_streamed_audio(app, session, interview, interview_id, use_quick_mode=False):
+    """Collect the final live transcript, archive the recording and run the rest of the turn."""
+    mode = turn_mode(use_quick_mode)
+    
+    # Only the tail of the stream is left to transcribe at this point
+    with metrics.span("stt", interview_id, mode):
+        transcript = session.finish()
+    
+    audio_bytes = bytes(session.audio)
+    if transcript is None:
+        # Live session failed: transcribe the buffered recording instead
+        print("Live transcription failed, falling back to prerecorded transcription")
+        record_provider_fallback("deepgram", "stt_live")
+    
+    process_audio(app, audio_bytes, interview, interview_id, use_quick_mode, transcript=transcript)
 
 
 # Process audio in a separate function outside the route handler
-def process_audio(app, audio_bytes, interview, interview_id, use_quick_mode=False):
-    """Process audio in a background thread with proper app context."""
+def process_audio(app, audio_bytes, interview, interview_id, use_quick_mode=False, transcript=None):
+    """Process audio in a background thread with proper app context.
+    
+    If ``transcript`` is given (streaming mode), speech-to-text is skipped.
+    Turns may be switched to quick mode while the LLM is missing its latency SLO
+    or too many turns are queued; those turns also skip the evaluation.
+    """
+    decision = adaptive_mode.decide(use_quick_mode, in_flight_turns.count, interview_id)
+    with metrics.span("turn", interview_id, turn_mode(decision.quick)):
+        _process_audio_turn(app, audio_bytes, interview, interview_id, decision, transcript)
+
+
+def archive_recording(audio_bytes, interview_id, mode=None, clip=None):
+    """Save a candidate recording under app/uploads, trimmed (and transcoded) first unless ``clip`` already is."""
+    if clip is None:
+        with metrics.span("audio_preprocess", interview_id, mode):
+            clip = speech_service.preprocess_audio(audio_bytes)
+    audio_filepath = os.path.join(os.getcwd(), "app", "uploads", f"response_{uuid.uuid4()}.webm")
+    with metrics.span("upload_save", interview_id, mode):
+        speech_service.save_audio(clip.audio, audio_filepath)
+
+
+def _process_audio_turn(app, audio_bytes, interview, interview_id, decision, transcript):
+    use_quick_mode = decision.quick
+    skip_evaluation = decision.downgraded
+    mode = turn_mode(use_quick_mode)
     try:
-        # Set up asyncio loop for transcription
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        # Get transcript
-        transcript_result = loop.run_until_complete(
-            speech_service.transcribe_audio(audio_bytes)
-        )
+        if transcript is not None:
+            # Streamed: the live transcript is ready, so the recording is trimmed and
+            # archived alongside the rest of the turn instead of ahead of it
+            transcript_result = transcript
+            socketio.start_background_task(archive_recording, audio_bytes, interview_id, mode)
+        else:
+            # Trim leading/trailing silence and detect clips with no speech at all
+            with metrics.span("audio_preprocess", interview_id, mode):
+                clip = speech_service.preprocess_audio(audio_bytes)
+            archive_recording(audio_bytes, interview_id, mode, clip)
+            
+            if clip.is_silent:
+                # Nothing was said: ask again right away without calling STT or the LLM
+                with app.app_context(), metrics.span("emit", interview_id, mode):
+                    socketio.emit("transcription_result", {"transcript": "", "silent": True}, to=f"interview_{interview_id}")
+                    socketio.emit("ai_message", {
+                        "message": SILENT_CLIP_MESSAGE,
+                        "audio_url": ""  # Empty URL will trigger browser TTS
+                    }, to=f"interview_{interview_id}")
+                return
+            
+            # Set up asyncio loop for transcription
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            
+            # Get transcript
+            with metrics.span("stt", interview_id, mode):
+                transcript_result = loop.run_until_complete(
+                    speech_service.transcribe_audio(clip.audio)
+                )
         
         # Fall back to a message if transcription failed
         if not transcript_result or transcript_result.strip() == "":
+            record_provider_fallback("deepgram", "stt")
             transcript_result = "I apologize, but I couldn't hear what you said. Could you please repeat?"
         
         # Save transcript and send back to client immediately
         interview.add_message("candidate", transcript_result)
-        interview_storage.save_interview(interview)
-        socketio.emit("transcription_result", {
-            "transcript": transcript_result
-        }, to=f"interview_{interview_id}")
+        record_mode_decision(interview, decision)
+        save_interview_timed(interview, mode)
+        with metrics.span("emit", interview_id, mode):
+            socketio.emit("transcription_result", {
+                "transcript": transcript_result
+            }, to=f"interview_{interview_id}")
         
         # Process with LLM - send progress updates
         socketio.emit("processing_update", {"status": "evaluating"}, to=f"interview_{interview_id}")
@@ -595,15 +1104,22 @@ def process_audio(app, audio_bytes, interview, interview_id, use_quick_mode=Fals
         # Get messages for LLM
         messages = format_messages_for_llm(interview)
         
-        # Generate evaluation
+        # Generate evaluation (skipped when the server switched this turn to quick mode)
         socketio.emit("processing_update", {"status": "thinking"}, to=f"interview_{interview_id}")
-        evaluation = llm_service.generate_response_evaluation(transcript_result)
-        interview.add_message("evaluation", evaluation)
-        interview_storage.save_interview(interview)
+        evaluation = None
+        if not skip_evaluation:
+            with metrics.span("evaluation", interview_id, mode):
+                evaluation = llm_service.generate_response_evaluation(transcript_result)
+            interview.add_message("evaluation", evaluation)
+            save_interview_timed(interview, mode)
         
         # Generate AI response - using quick mode or full LLM
         try:
-            if use_quick_mode:
+            planned_question = next_planned_question(interview) if use_quick_mode or use_planned_question(interview) else None
+            if planned_question:
+                # Early and quick-mode turns are served from the prepared question plan
+                ai_message = planned_question
+            elif use_quick_mode:
                 # Use pre-defined question for faster response
                 question_num = len([m for m in interview.transcripts if m["role"] == "candidate"])
                 ai_message = get_fallback_question(interview, question_num)
@@ -613,13 +1129,15 @@ def process_audio(app, audio_bytes, interview, interview_id, use_quick_mode=Fals
                 next_question_message = Message(role="user", content=next_question_prompt)
                 messages.append(next_question_message)
                 
-                ai_message = llm_service.generate_interview_question(messages)
+                with metrics.span("llm", interview_id, mode):
+                    ai_message = llm_service.generate_interview_question(messages)
                 
             # Update status before TTS
             socketio.emit("processing_update", {"status": "speaking"}, to=f"interview_{interview_id}")
             
         except Exception as llm_error:
             # Use a simple fallback question if generation fails
+            record_provider_fallback("groq", "question")
             fallback_responses = [
                 "Could you elaborate more on your experience and skills?",
                 "Tell me about a challenging project you worked on.",
@@ -631,29 +1149,19 @@ def process_audio(app, audio_bytes, interview, interview_id, use_quick_mode=Fals
         
         # Add AI message to transcript
         interview.add_message("ai", ai_message)
-        interview_storage.save_interview(interview)
+        save_interview_timed(interview, mode)
         
-        # Generate speech and send response
-        audio_data = speech_service.text_to_speech(ai_message)
-        if not audio_data or len(audio_data) < 100:
-            audio_data = speech_service.text_to_speech(ai_message, fallback_voice=True)
-        
-        # Create audio file if we have valid audio
+        # Generate speech and create audio file if we have valid audio
         audio_url = ""
-        if audio_data and len(audio_data) >= 100:
-            # Save audio to temporary file
-            filename = f"tts_{uuid.uuid4()}.mp3"
-            filepath = os.path.join(os.getcwd(), "app", "static", "temp", filename)
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            
-            with open(filepath, "wb") as f:
-                f.write(audio_data)
-            
+        filename = render_speech(ai_message, interview_id, mode)
+        if remember_speech(interview, filename):
+            save_interview_timed(interview, mode)
+        if filename:
             with app.app_context():
                 audio_url = url_for("static", filename=f"temp/{filename}", _external=True)
         
         # Send response to client
-        with app.app_context():
+        with app.app_context(), metrics.span("emit", interview_id, mode):
             socketio.emit("ai_message", {
                 "message": ai_message,
                 "audio_url": audio_url
@@ -670,4 +1178,4 @@ def process_audio(app, audio_bytes, interview, interview_id, use_quick_mode=Fals
             socketio.emit("ai_message", {
                 "message": fallback_message,
                 "audio_url": ""  # Empty URL will trigger browser TTS
-            }, to=f"interview_{interview_id}") 
\ No newline at end of file
+            }, to=f"interview_{interview_id}") 
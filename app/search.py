@@ -0,0 +1,239 @@
+"""
+Full-text search over interviews: transcripts, evaluations, verdicts and CVs.
+
+The index is a SQLite FTS5 table next to the interview files with one row per
+interview and one column per field. It is kept up to date by an
+``InterviewStorage`` save listener: a save re-indexes only that interview, and
+only if its searchable text changed since the last save.
+
+Rebuild it from the existing archive with:
+    python -m app.search rebuild [--storage-dir interviews]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.metrics import metrics
+from app.models.serialization import read_interview_file
+
+INDEX_FILENAME = ".search.sqlite3"
+
+# Searchable fields and their BM25 weights; candidate answers count most
+FIELD_WEIGHTS = {"cv": 1.0, "candidate": 2.0, "ai": 0.5, "evaluation": 1.0, "verdict": 1.0}
+FIELDS = tuple(FIELD_WEIGHTS)
+
+SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS interview_text USING fts5(
+    interview_id UNINDEXED, {", ".join(FIELDS)}, tokenize = 'porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS indexed_interviews (
+    interview_id TEXT PRIMARY KEY, text_rowid INTEGER NOT NULL, content_hash TEXT NOT NULL
+);
+"""
+
+# A quoted phrase or a single term
+QUERY_PART = re.compile(r'"([^"]*)"|(\S+)')
+WORD = re.compile(r"\w+", re.UNICODE)
+
+metrics.describe("search_query_seconds", "histogram", "Full-text search query latency.",
+                 buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+
+
+def to_match_expression(query: str) -> str:
+    """
+    Turn a user query into an FTS5 expression: every term and every "quoted
+    phrase" must match. Operators and punctuation are treated as plain text.
+
+    Raises:
+        ValueError: If the query has no searchable words
+    """
+    parts = []
+    for phrase, term in QUERY_PART.findall(query):
+        words = WORD.findall((phrase or term).lower())
+        if words:
+            parts.append('"' + " ".join(words) + '"')
+    if not parts:
+        raise ValueError("Query has no searchable words")
+    return " AND ".join(parts)
+
+
+def searchable_text(data: Dict[str, Any]) -> Dict[str, str]:
+    """Text of each searchable field of a stored interview dict."""
+    transcripts = data.get("transcripts") or []
+    return {
+        "cv": data.get("cv") or "",
+        "candidate": "\n".join(m["content"] for m in transcripts if m.get("role") == "candidate"),
+        "ai": "\n".join(m["content"] for m in transcripts if m.get("role") != "candidate"),
+        "evaluation": "\n".join(e["content"] for e in data.get("evaluations") or []),
+        "verdict": data.get("verdict") or "",
+    }
+
+
+class SearchIndex:
+    """
+    Incrementally maintained SQLite FTS5 index of interview text.
+
+    Results are ranked with BM25 (weighted by ``FIELD_WEIGHTS``). To keep
+    queries fast on large archives, only the ``rank_candidates`` most recently
+    updated matching interviews are ranked; queries with fewer matches than
+    that are ranked exactly.
+    """
+
+    def __init__(self, path: str, rank_candidates: int = 5000):
+        self.path = path
+        self.rank_candidates = rank_candidates
+        self._local = threading.local()
+        self._connection()  # create the schema up front
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread; WAL lets worker processes read while one writes
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def update(self, data: Dict[str, Any]):
+        """Index a saved interview dict if its text changed (used as a save listener)."""
+        conn = self._connection()
+        with conn:
+            self._index(conn, data)
+
+    def update_many(self, items: Iterable[Dict[str, Any]]):
+        """Index several interview dicts in one transaction."""
+        conn = self._connection()
+        with conn:
+            for data in items:
+                self._index(conn, data)
+
+    def _index(self, conn: sqlite3.Connection, data: Dict[str, Any]):
+        texts = searchable_text(data)
+        content_hash = hashlib.sha1(json.dumps(texts, sort_keys=True).encode("utf-8")).hexdigest()
+
+        row = conn.execute("SELECT text_rowid, content_hash FROM indexed_interviews WHERE interview_id = ?",
+                           (data["id"],)).fetchone()
+        if row is not None:
+            if row[1] == content_hash:
+                return
+            conn.execute("DELETE FROM interview_text WHERE rowid = ?", (row[0],))
+
+        cursor = conn.execute(
+            f"INSERT INTO interview_text (interview_id, {', '.join(FIELDS)}) VALUES (?{', ?' * len(FIELDS)})",
+            [data["id"]] + [texts[field] for field in FIELDS],
+        )
+        conn.execute("INSERT OR REPLACE INTO indexed_interviews (interview_id, text_rowid, content_hash) VALUES (?, ?, ?)",
+                     (data["id"], cursor.lastrowid, content_hash))
+
+    def search(self, query: str, limit: int = 20, fields: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Find interviews matching every term and phrase of ``query``, best first.
+
+        Args:
+            query: Terms and "quoted phrases"
+            limit: Maximum number of interviews to return
+            fields: Only search these fields (see ``FIELDS``); all when None
+
+        Returns:
+            list: ``interview_id``, ``score`` (BM25, higher is better) and a
+            ``snippet`` of the best matching text with matches in [brackets]
+
+        Raises:
+            ValueError: For an empty query or an unknown field
+        """
+        match = to_match_expression(query)
+        if fields:
+            fields = list(fields)
+            unknown = [f for f in fields if f not in FIELDS]
+            if unknown:
+                raise ValueError(f"Unknown search fields: {', '.join(unknown)}; use {', '.join(FIELDS)}")
+            match = "{" + " ".join(fields) + "} : (" + match + ")"
+
+        start = time.perf_counter()
+        conn = self._connection()
+        weights = ", ".join(str(FIELD_WEIGHTS[field]) for field in FIELDS)
+        # Matches stream in rowid order, so finding the newest N is cheap; BM25 is only computed for those
+        ranked = conn.execute(
+            f"SELECT rowid, interview_id, bm25(interview_text, 0, {weights}) AS score FROM interview_text "
+            "WHERE interview_text MATCH ?1 AND rowid >= (SELECT COALESCE(MIN(rowid), 0) FROM ("
+            "    SELECT rowid FROM interview_text WHERE interview_text MATCH ?1 ORDER BY rowid DESC LIMIT ?2)) "
+            "ORDER BY score LIMIT ?3",
+            (match, self.rank_candidates, limit),
+        ).fetchall()
+
+        snippets = {}
+        if ranked:
+            rowids = [r[0] for r in ranked]
+            snippets = dict(conn.execute(
+                "SELECT rowid, snippet(interview_text, -1, '[', ']', '...', 16) FROM interview_text "
+                f"WHERE interview_text MATCH ? AND rowid IN ({', '.join('?' * len(rowids))})",
+                [match] + rowids,
+            ).fetchall())
+        metrics.observe("search_query_seconds", time.perf_counter() - start)
+
+        return [
+            {"interview_id": interview_id, "score": round(-score, 6), "snippet": snippets.get(rowid, "")}
+            for rowid, interview_id, score in ranked
+        ]
+
+    def rebuild(self, storage_dir: str, batch_size: int = 500) -> int:
+        """
+        Re-index every interview file in ``storage_dir`` from scratch.
+
+        Returns:
+            int: Number of interviews indexed
+        """
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM interview_text")
+            conn.execute("DELETE FROM indexed_interviews")
+
+        def load(filenames):
+            for filename in filenames:
+                try:
+                    yield read_interview_file(os.path.join(storage_dir, filename), iso_timestamps=False)
+                except (OSError, ValueError) as e:
+                    print(f"Skipping {filename}: {e}")
+
+        filenames = [f for f in os.listdir(storage_dir) if f.endswith(".json") and not f.endswith("_corrupted.json")]
+        # Oldest first, so the most recently updated interviews get the newest rows (see rank_candidates)
+        filenames.sort(key=lambda f: os.path.getmtime(os.path.join(storage_dir, f)))
+        for start in range(0, len(filenames), batch_size):
+            self.update_many(load(filenames[start:start + batch_size]))
+            print(f"Indexed {min(start + batch_size, len(filenames))}/{len(filenames)} interview files")
+        with conn:
+            conn.execute("INSERT INTO interview_text (interview_text) VALUES ('optimize')")
+        return conn.execute("SELECT COUNT(*) FROM indexed_interviews").fetchone()[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["rebuild", "query"])
+    parser.add_argument("query", nargs="?", help="Search terms for the query command")
+    parser.add_argument("--storage-dir", default=os.path.join(os.getcwd(), "interviews"))
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    index = SearchIndex(os.path.join(args.storage_dir, INDEX_FILENAME),
+                        rank_candidates=int(os.getenv("SEARCH_RANK_CANDIDATES", "5000")))
+    if args.command == "rebuild":
+        start = time.perf_counter()
+        count = index.rebuild(args.storage_dir)
+        print(f"Rebuilt search index with {count} interviews in {time.perf_counter() - start:.1f}s")
+    else:
+        if not args.query:
+            parser.error("query needs search terms")
+        for result in index.search(args.query, limit=args.limit):
+            print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
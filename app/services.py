@@ -6,9 +6,15 @@ import jwt
 import time
 import threading
 import re
-from typing import Dict, Any, List, Tuple, Optional
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Any, List, NamedTuple, Tuple, Optional, Callable
 from deepgram import Deepgram
-from pydantic import BaseModel
+from deepgram._enums import LiveTranscriptionEvent
+from app.metrics import metrics, record_provider_error, record_provider_fallback
+from app.resilience import provider_health, CircuitOpenError
+from app.cache import ResponseCache
+from app import audio as audio_processing
 
 # Timeout handler for long-running operations
 class TimeoutException(Exception):
@@ -41,8 +47,8 @@ livekit_api_secret = os.getenv("LIVEKIT_API_SECRET")
 livekit_url = os.getenv("LIVEKIT_URL")
 groq_api_key = os.getenv("GROQ_API_KEY")  # Add your Groq API key to .env file
 
-class Message(BaseModel):
-    """Pydantic model for chat messages."""
+class Message(NamedTuple):
+    """Chat message for the LLM (a tuple, as one is built per transcript entry on every turn)."""
     role: str
     content: str
 
@@ -54,6 +60,16 @@ class LLMService:
         # Use Llama 3 8B model through Groq API
         self.model = "llama3-8b-8192"
         self.api_url = "https://api.groq.com/openai/v1/chat/completions"
+        # Sampling temperature of answer evaluations and final assessments; 0 makes them
+        # deterministic. Set on its own: enabling the cache never changes model output.
+        self.scoring_temperature = float(os.getenv("LLM_SCORING_TEMPERATURE", "0.7"))
+        # Opt-in cache for deterministic (temperature 0) calls only
+        self.cache = None
+        if os.getenv("LLM_CACHE", "false").lower() in ("1", "true", "yes"):
+            self.cache = ResponseCache(
+                max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000")),
+                ttl_secs=float(os.getenv("LLM_CACHE_TTL", "3600")),
+            )
     
     def generate_initial_prompt(self, cv: str, job_description: str, system_prompt: str) -> str:
         """Generate the initial system prompt for the LLM."""
@@ -75,6 +91,60 @@ Assess their responses, ask relevant follow-up questions, and provide a final as
         # We'll use this to set up the initial messages
         return system_content
     
+    def _chat_completion(self, messages: List[Dict[str, str]], max_tokens: int, timeout_secs: float, operation: str,
+                         temperature: float = 0.7) -> Optional[str]:
+        """
+        Call the Groq chat completions API through the provider circuit breaker.
+        
+        Deterministic calls (temperature 0) are served from the response cache when it is enabled.
+        
+        Returns:
+            str: The reply text, or None if the call failed, timed out or was skipped
+            because Groq is unhealthy (callers then use their fallback)
+        """
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        data = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "top_p": 1,
+            "stream": False
+        }
+        
+        cache_key = None
+        if self.cache is not None and temperature == 0:
+            cache_key = ResponseCache.make_key(self.model, {"temperature": 0, "max_tokens": max_tokens, "top_p": 1}, messages)
+            cached = self.cache.get(cache_key, operation)
+            if cached is not None:
+                return cached
+        
+        def call_api():
+            response = requests.post(self.api_url, headers=headers, json=data, timeout=timeout_secs)
+            if response.status_code == 200:
+                return response.json()
+            else:
+                print(f"API Error: {response.status_code} - {response.text}")
+                return None
+        
+        try:
+            result = provider_health.breaker("groq").call(call_api, timeout_secs, operation)
+        except CircuitOpenError:
+            print(f"Groq is unhealthy, skipping {operation} call")
+            return None
+        
+        if not result:
+            record_provider_error("groq", operation)
+            return None
+        content = result["choices"][0]["message"]["content"]
+        if cache_key is not None:
+            self.cache.put(cache_key, content)
+        return content
+    
     def generate_interview_question(self, messages: List[Message]) -> str:
         """Generate the next interview question using Groq API."""
         try:
@@ -104,35 +174,12 @@ Assess their responses, ask relevant follow-up questions, and provide a final as
             })
             
             # Call the Groq API
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            data = {
-                "model": self.model,
-                "messages": formatted_messages,
-                "temperature": 0.7,
-                "max_tokens": 200,
-                "top_p": 1,
-                "stream": False
-            }
-            
-            # Define the API call function to use with timeout
-            def call_api():
-                response = requests.post(self.api_url, headers=headers, json=data)
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    print(f"API Error: {response.status_code} - {response.text}")
-                    return None
-            
-            # Run with timeout
-            result = run_with_timeout(call_api, timeout_secs=30, default=None)
+            content = self._chat_completion(formatted_messages, max_tokens=200, timeout_secs=30, operation="question")
             
             # If API call failed or timed out, use fallback
-            if not result:
+            if content is None:
                 print("API call failed or timed out, using fallback response")
+                record_provider_fallback("groq", "question")
                 import random
                 fallback_responses = [
                     "Thank you for sharing that information. Could you tell me about a specific project or challenge you've worked on in your previous role?",
@@ -144,11 +191,12 @@ Assess their responses, ask relevant follow-up questions, and provide a final as
                 ]
                 return random.choice(fallback_responses)
             
-            # Extract the assistant's message
-            return result["choices"][0]["message"]["content"]
+            return content
             
         except Exception as e:
             print(f"Error generating question: {e}")
+            record_provider_error("groq", "question")
+            record_provider_fallback("groq", "question")
             return "I apologize, but I'm having trouble formulating my next question. Could you tell me more about your qualifications and how they relate to this position?"
     
     def generate_final_assessment(self, messages: List[Message]) -> Tuple[int, str]:
@@ -180,40 +228,15 @@ Assess their responses, ask relevant follow-up questions, and provide a final as
             })
             
             # Call the Groq API
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            data = {
-                "model": self.model,
-                "messages": formatted_messages,
-                "temperature": 0.7,
-                "max_tokens": 500,
-                "top_p": 1,
-                "stream": False
-            }
-            
-            # Define the API call function to use with timeout
-            def call_api():
-                response = requests.post(self.api_url, headers=headers, json=data)
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    print(f"API Error: {response.status_code} - {response.text}")
-                    return None
-            
-            # Run with timeout
-            result = run_with_timeout(call_api, timeout_secs=45, default=None)
+            assessment = self._chat_completion(formatted_messages, max_tokens=500, timeout_secs=45, operation="assessment",
+                                               temperature=self.scoring_temperature)
             
             # If API call failed or timed out, use fallback
-            if not result:
+            if assessment is None:
                 print("API call failed or timed out, using fallback assessment")
+                record_provider_fallback("groq", "assessment")
                 return 7, "The candidate shows potential for the role based on their responses. While the full assessment could not be generated, their communication skills and background appear to make them a good fit for the position."
             
-            # Extract the assessment
-            assessment = result["choices"][0]["message"]["content"]
-            
             # Try to extract rating and verdict
             try:
                 # Look for "RATING: X/10" pattern
@@ -240,8 +263,50 @@ Assess their responses, ask relevant follow-up questions, and provide a final as
                 return 7, "Error generating a proper assessment. Based on the conversation, the candidate has shown average performance."
         except Exception as e:
             print(f"Error generating final assessment: {e}")
+            record_provider_error("groq", "assessment")
+            record_provider_fallback("groq", "assessment")
             return 7, "An error occurred during assessment generation. The system was unable to fully evaluate the candidate."
     
+    def generate_question_plan(self, cv: str, job_description: str, system_prompt: str, count: int = 8) -> List[str]:
+        """
+        Prepare an ordered bank of interview questions tailored to the CV and job description.
+        
+        Returns:
+            list: The questions, or an empty list if generation failed
+        """
+        formatted_messages = [
+            {
+                "role": "system",
+                "content": "You are an expert interviewer preparing questions for a job interview."
+            },
+            {
+                "role": "user",
+                "content": f"""The candidate's CV:
+{cv}
+
+The job description:
+{job_description}
+
+Additional interviewer instructions:
+{system_prompt}
+
+Write {count} interview questions tailored to this candidate and role, ordered from opening questions to deeper technical and behavioural ones. Include any questions the instructions ask for. Reply with one question per line and nothing else."""
+            }
+        ]
+        
+        content = self._chat_completion(formatted_messages, max_tokens=800, timeout_secs=60, operation="question_plan")
+        if content is None:
+            print("Question plan generation failed")
+            return []
+        
+        questions = []
+        for line in content.splitlines():
+            # Drop list markers such as "1.", "2)" or "-"
+            question = re.sub(r"^\s*(?:\d+[.)]|[-*\u2022])\s*", "", line).strip()
+            if len(question) > 15 and question.endswith("?"):
+                questions.append(question)
+        return questions[:count]
+    
     def generate_response_evaluation(self, response_text: str) -> str:
         """Generate an evaluation of a candidate's response using Groq API."""
         try:
@@ -258,51 +323,107 @@ Assess their responses, ask relevant follow-up questions, and provide a final as
             ]
             
             # Call the Groq API
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            data = {
-                "model": self.model,
-                "messages": formatted_messages,
-                "temperature": 0.7,
-                "max_tokens": 200,
-                "top_p": 1,
-                "stream": False
-            }
-            
-            # Define the API call function to use with timeout
-            def call_api():
-                response = requests.post(self.api_url, headers=headers, json=data)
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    print(f"API Error: {response.status_code} - {response.text}")
-                    return None
-            
-            # Run with timeout
-            result = run_with_timeout(call_api, timeout_secs=15, default=None)
+            evaluation = self._chat_completion(formatted_messages, max_tokens=200, timeout_secs=15, operation="evaluation",
+                                               temperature=self.scoring_temperature)
             
             # If API call failed or timed out, use fallback
-            if not result:
+            if evaluation is None:
                 print("API call failed or timed out, using fallback evaluation")
+                record_provider_fallback("groq", "evaluation")
                 return "The response shows some relevant points but could benefit from more specific examples. Consider this a standard response that demonstrates basic qualifications."
             
-            # Extract the evaluation
-            return result["choices"][0]["message"]["content"]
+            return evaluation
         except Exception as e:
             print(f"Error generating response evaluation: {e}")
+            record_provider_error("groq", "evaluation")
+            record_provider_fallback("groq", "evaluation")
             return "Unable to evaluate the response due to a technical error. The system will continue with the interview."
 
 
 class SpeechService:
     """Service for speech-to-text and text-to-speech operations."""
     
-    async def transcribe_audio(self, audio_data: bytes) -> str:
-        """Convert spoken audio to text."""
+    def __init__(self):
+        # Trim silence / reject silent clips before STT (needs ffmpeg to decode webm)
+        self.preprocessing_enabled = os.getenv("AUDIO_PREPROCESSING", "true").lower() in ("1", "true", "yes")
+        self.silence_threshold_db = float(os.getenv("AUDIO_SILENCE_THRESHOLD_DB", "-45"))
+        # Clips with frames this loud are never rejected as silent, however steady their level
+        self.speech_level_db = float(os.getenv("AUDIO_SPEECH_LEVEL_DB", "-35"))
+        # Optional: re-encode recordings as mono low-rate Opus (e.g. "16k"); empty disables it
+        self.transcode_bitrate = os.getenv("AUDIO_TRANSCODE_BITRATE", "").strip()
+        self.transcode_sample_rate = int(os.getenv("AUDIO_TRANSCODE_SAMPLE_RATE", "16000"))
+        # Don't bother cutting the file for less silence than this
+        self.min_trim_secs = 0.5
+        # Deadlines for Deepgram calls (a slow provider counts as a failure for its circuit breaker)
+        self.stt_timeout_secs = float(os.getenv("STT_TIMEOUT", "30"))
+        self.tts_timeout_secs = float(os.getenv("TTS_TIMEOUT", "15"))
+    
+    def preprocess_audio(self, audio_data: bytes) -> audio_processing.PreprocessedAudio:
+        """
+        Trim leading/trailing silence, detect near-silent recordings and optionally
+        transcode to mono low-bitrate speech before upload and archival.
+        
+        Falls back to the unmodified recording if preprocessing is disabled,
+        ffmpeg is missing or decoding fails.
+        """
+        start = time.perf_counter()
+        if not (self.preprocessing_enabled or self.transcode_bitrate) or not audio_processing.ffmpeg_available():
+            return audio_processing.PreprocessedAudio(audio_data, len(audio_data), skipped=True)
+        
         try:
-            response = await deepgram.transcription.prerecorded(
+            sample_rate = audio_processing.ANALYSIS_SAMPLE_RATE
+            samples = audio_processing.decode_to_pcm(audio_data, sample_rate)
+            duration = len(samples) / sample_rate
+            speech_start, speech_end = 0.0, duration
+            
+            if self.preprocessing_enabled:
+                bounds = audio_processing.find_speech_bounds(samples, sample_rate, threshold_db=self.silence_threshold_db,
+                                                             speech_level_db=self.speech_level_db)
+                if bounds is None:
+                    result = audio_processing.PreprocessedAudio(
+                        audio_data, len(audio_data), is_silent=True, original_duration=duration,
+                        processing_time=time.perf_counter() - start
+                    )
+                    metrics.inc("audio_silent_clips_total")
+                    print(f"Audio preprocessing: {duration:.2f}s clip is silent, skipping transcription")
+                    return result
+                if duration - (bounds[1] - bounds[0]) >= self.min_trim_secs:
+                    speech_start, speech_end = bounds
+            
+            trimming = (speech_start, speech_end) != (0.0, duration)
+            processed = audio_data
+            transcoded = False
+            if self.transcode_bitrate:
+                encoded = audio_processing.transcode_audio(
+                    audio_data, self.transcode_bitrate, self.transcode_sample_rate,
+                    start=speech_start if trimming else None, end=speech_end if trimming else None
+                )
+                # Keep the original if re-encoding doesn't actually make it smaller
+                if len(encoded) < len(audio_data):
+                    processed, transcoded = encoded, True
+            if not transcoded and trimming:
+                processed = audio_processing.trim_audio(audio_data, speech_start, speech_end)
+            
+            result = audio_processing.PreprocessedAudio(
+                processed, len(audio_data), original_duration=duration,
+                speech_duration=speech_end - speech_start,
+                processing_time=time.perf_counter() - start, transcoded=transcoded
+            )
+            metrics.inc("audio_preprocess_bytes_saved_total", result.bytes_saved)
+            metrics.inc("audio_preprocess_seconds_trimmed_total", result.seconds_trimmed)
+            print(f"Audio preprocessing: {result.original_bytes} -> {len(result.audio)} bytes "
+                  f"({result.bytes_saved} saved, {result.bytes_per_minute / 1024:.0f} KiB/min"
+                  f"{', transcoded' if transcoded else ''}), trimmed {result.seconds_trimmed:.2f}s of silence "
+                  f"in {result.processing_time * 1000:.0f}ms")
+            return result
+        except Exception as e:
+            print(f"Error preprocessing audio, using original recording: {e}")
+            return audio_processing.PreprocessedAudio(audio_data, len(audio_data), skipped=True)
+    
+    async def transcribe_audio(self, audio_data: bytes) -> str:
+        """Convert spoken audio to text (empty string on failure or while Deepgram is unhealthy)."""
+        def request():
+            return deepgram.transcription.prerecorded(
                 {"buffer": audio_data, "mimetype": "audio/webm"},
                 {
                     "punctuate": True,
@@ -310,11 +431,42 @@ class SpeechService:
                     "model": "nova",
                 }
             )
+        
+        try:
+            response = await provider_health.breaker("deepgram").call_async(request, self.stt_timeout_secs, "stt")
+            if response is None:
+                record_provider_error("deepgram", "stt")
+                return ""
             return response["results"]["channels"][0]["alternatives"][0]["transcript"]
+        except CircuitOpenError:
+            print("Deepgram is unhealthy, skipping transcription")
+            return ""
         except Exception as e:
             print(f"Error transcribing audio: {e}")
+            record_provider_error("deepgram", "stt")
             return ""
     
+    @staticmethod
+    def decode_audio_payload(payload) -> bytes:
+        """
+        Get the raw recording bytes from a ``candidate_speech`` audio payload.
+        
+        Binary Socket.IO attachments arrive as bytes and are used as-is. The legacy
+        format, a base64 ``data:`` URL string, is still accepted.
+        """
+        if isinstance(payload, (bytes, bytearray, memoryview)):
+            return bytes(payload) if not isinstance(payload, bytes) else payload
+        if isinstance(payload, str):
+            # Skip the "data:audio/webm;base64," header without splitting the whole string
+            return base64.b64decode(payload[payload.index(",") + 1:])
+        raise ValueError(f"Unsupported audio payload type: {type(payload).__name__}")
+    
+    def start_live_transcription(self, on_interim: Optional[Callable[[str], None]] = None) -> "LiveTranscriptionSession":
+        """Open a streaming transcription session that audio chunks can be relayed to while recording."""
+        # While Deepgram is unhealthy the session starts failed, so the turn goes straight to the fallback
+        return LiveTranscriptionSession(on_interim=on_interim,
+                                        connect=not provider_health.breaker("deepgram").is_open())
+    
     def save_audio(self, audio_data: bytes, filepath: str) -> bool:
         """Save audio data to a file."""
         try:
@@ -326,7 +478,7 @@ class SpeechService:
             print(f"Error saving audio: {e}")
             return False
     
-    def text_to_speech(self, text: str, fallback_voice: bool = False) -> bytes:
+    def text_to_speech(self, text: str) -> bytes:
         """Convert text to spoken audio using Deepgram TTS."""
         try:
             # Validate and trim text if needed
@@ -343,36 +495,211 @@ class SpeechService:
                 'Content-Type': 'application/json',
             }
             
-            # Simple payload structure
-            data = {
-                'text': text,
-                'voice': 'aura-asteria' if fallback_voice else 'aura-professional',
-                'encoding': 'mp3',
-                'sample_rate': 24000
-            }
+            def request():
+                # Simple payload structure
+                data = {
+                    'text': text,
+                    'voice': 'aura-professional',
+                    'encoding': 'mp3',
+                    'sample_rate': 24000
+                }
+                
+                # Make API request
+                response = requests.post(
+                    'https://api.deepgram.com/v1/speak',
+                    headers=headers,
+                    json=data,
+                    timeout=self.tts_timeout_secs
+                )
+                if response.status_code != 200:
+                    print(f"TTS API Error: {response.status_code}")
+                    return None
+                return response.content or None
             
-            # Make API request
-            response = requests.post(
-                'https://api.deepgram.com/v1/speak',
-                headers=headers,
-                json=data
+            # A hedged request asks for the same voice, so the interviewer never changes voice
+            audio = provider_health.breaker("deepgram").call(
+                request, self.tts_timeout_secs, "tts", hedge_func=request
             )
             
             # Return audio content or empty bytes on failure
-            return response.content if response.status_code == 200 else b""
+            if audio is None:
+                record_provider_error("deepgram", "tts")
+                return b""
+            return audio
             
+        except CircuitOpenError:
+            print("Deepgram is unhealthy, skipping TTS")
+            return b""
         except Exception as e:
             print(f"TTS error: {str(e)}")
+            record_provider_error("deepgram", "tts")
             return b""
 
 
+class LiveTranscriptionSession:
+    """
+    Relays audio chunks to a Deepgram live transcription connection.
+    
+    The Deepgram client is asyncio based, so each session runs its own event loop
+    in a daemon thread; chunks are handed to that loop thread-safely. The full
+    recording is also buffered so it can be archived, or transcribed with the
+    prerecorded API if the live connection fails.
+    """
+    
+    CONNECT_TIMEOUT_SECS = 5
+    
+    def __init__(self, on_interim: Optional[Callable[[str], None]] = None, connect: bool = True):
+        self.on_interim = on_interim
+        self.audio = bytearray()
+        self.failed = False
+        self._closed = False
+        self._final_segments: List[str] = []
+        self._live = None
+        self._pending: List[bytes] = []
+        self._lock = threading.Lock()
+        self._connected = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        if connect:
+            self._thread.start()
+        else:
+            self.failed = True
+            self._connected.set()
+            self._loop.close()
+    
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            live = self._loop.run_until_complete(deepgram.transcription.live({
+                "punctuate": True,
+                "language": "en-US",
+                "model": "nova",
+                "interim_results": True,
+            }))
+            live.register_handler(LiveTranscriptionEvent.TRANSCRIPT_RECEIVED, self._handle_transcript)
+            with self._lock:
+                self._live = live
+                # Flush chunks that arrived while the connection was opening
+                for chunk in self._pending:
+                    live.send(chunk)
+                self._pending = []
+        except Exception as e:
+            print(f"Error opening live transcription: {e}")
+            record_provider_error("deepgram", "stt_live")
+            self.failed = True
+        finally:
+            self._connected.set()
+        
+        if not self.failed:
+            self._loop.run_forever()
+        self._loop.close()
+    
+    def _handle_transcript(self, result: Dict[str, Any]):
+        """Collect final segments and report interim text as it arrives."""
+        try:
+            alternatives = result.get("channel", {}).get("alternatives", [])
+            text = alternatives[0].get("transcript", "") if alternatives else ""
+        except (AttributeError, IndexError):
+            return
+        
+        if result.get("is_final"):
+            if text:
+                self._final_segments.append(text)
+            text = ""
+        
+        if self.on_interim:
+            interim = " ".join(self._final_segments + ([text] if text else []))
+            if interim:
+                try:
+                    self.on_interim(interim)
+                except Exception as e:
+                    print(f"Error in interim transcript handler: {e}")
+    
+    def send(self, chunk: bytes):
+        """Relay one recorded audio chunk to the live connection."""
+        if not chunk:
+            return
+        self.audio.extend(chunk)
+        with self._lock:
+            if self.failed or self._closed:
+                return
+            if self._live is None:
+                self._pending.append(bytes(chunk))
+            else:
+                self._loop.call_soon_threadsafe(self._live.send, bytes(chunk))
+    
+    def finish(self, timeout_secs: float = 5) -> Optional[str]:
+        """
+        Close the stream and wait for the final transcript.
+        
+        Returns:
+            str: The final transcript, or None if the live session failed (callers
+            should then fall back to transcribing ``audio``)
+        """
+        if not self._connected.wait(self.CONNECT_TIMEOUT_SECS) or self.failed or self._live is None:
+            self.close()
+            return None
+        
+        try:
+            future = asyncio.run_coroutine_threadsafe(self._live.finish(), self._loop)
+            future.result(timeout_secs)
+        except Exception as e:
+            print(f"Live transcription did not finish cleanly: {e}")
+            record_provider_error("deepgram", "stt_live")
+            self.failed = True
+            return None
+        finally:
+            self.close()
+        
+        return " ".join(self._final_segments).strip()
+    
+    def close(self):
+        """Stop the session's event loop without waiting for results."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        except RuntimeError:
+            # Loop already closed (connection failed)
+            pass
+
+
 class LiveKitService:
     """Service for managing LiveKit rooms and tokens."""
     
+    # Empty rooms are closed by LiveKit after this long
+    ROOM_EMPTY_TIMEOUT_SECS = 60 * 60
+    PARTICIPANT_TOKEN_TTL_SECS = 60 * 60
+    API_TOKEN_TTL_SECS = 10 * 60
+    # Signed tokens are reused until this long before they expire
+    TOKEN_REFRESH_MARGIN_SECS = 60
+    MAX_CACHED_TOKENS = 10000
+    
     def __init__(self):
         self.api_key = livekit_api_key
         self.api_secret = livekit_api_secret
         self.url = livekit_url
+        self.timeout_secs = float(os.getenv("LIVEKIT_TIMEOUT", "10"))
+        self._tokens: "OrderedDict[tuple, tuple]" = OrderedDict()  # key -> (expires at, token)
+        self._tokens_lock = threading.Lock()
+    
+    def _cached_token(self, key: tuple, ttl_secs: int, sign: Callable[[int], str]) -> str:
+        # ``sign`` receives the issue time; tokens are signed again shortly before they expire
+        now = int(time.time())
+        with self._tokens_lock:
+            entry = self._tokens.get(key)
+            if entry is not None and entry[0] - self.TOKEN_REFRESH_MARGIN_SECS > now:
+                self._tokens.move_to_end(key)
+                return entry[1]
+        token = sign(now)
+        with self._tokens_lock:
+            self._tokens[key] = (now + ttl_secs, token)
+            self._tokens.move_to_end(key)
+            while len(self._tokens) > self.MAX_CACHED_TOKENS:
+                self._tokens.popitem(last=False)
+        return token
     
     def create_room(self, room_name: str) -> Optional[str]:
         """Create a LiveKit room for the interview."""
@@ -385,87 +712,71 @@ class LiveKitService:
             
             data = {
                 'name': room_name,
-                'emptyTimeout': 60 * 60,  # 1 hour timeout
+                'emptyTimeout': self.ROOM_EMPTY_TIMEOUT_SECS,
                 'maxParticipants': 2      # Just the candidate and AI
             }
             
             response = requests.post(
                 f'{self.url}/rooms',
                 headers=headers,
-                json=data
+                json=data,
+                timeout=self.timeout_secs
             )
             
             if response.status_code in [200, 201]:
                 return room_name
             else:
                 print(f"Error creating room: {response.text}")
+                record_provider_error("livekit", "create_room")
                 return None
         except Exception as e:
             print(f"Error creating LiveKit room: {e}")
+            record_provider_error("livekit", "create_room")
             return None
     
     def create_token(self, room_name: str, participant_name: str, is_admin: bool = False) -> Optional[str]:
-        """Create a LiveKit token for a participant."""
+        """Create a LiveKit token for a participant (reused until shortly before it expires)."""
         try:
-            permissions = []
-            
-            if is_admin:
-                permissions = ["room-admin", "room-join", "publish", "subscribe"]
-            else:
-                permissions = ["room-join", "publish", "subscribe"]
-            
-            # Create JWT token manually
-            now = int(time.time())
-            
-            payload = {
-                "iss": self.api_key,
-                "sub": participant_name,
-                "exp": now + 60 * 60,  # 1 hour token
-                "nbf": now,
-                "iat": now,
-                "jti": f"{participant_name}-{int(time.time())}",
-                "video": {
-                    "room": room_name,
-                    "roomJoin": True,
-                    "roomAdmin": is_admin,
-                    "canPublish": True,
-                    "canSubscribe": True
-                },
-                "metadata": json.dumps({"role": "admin" if is_admin else "candidate"})
-            }
-            
-            token = jwt.encode(
-                payload,
-                self.api_secret,
-                algorithm="HS256"
-            )
+            def sign(now: int) -> str:
+                payload = {
+                    "iss": self.api_key,
+                    "sub": participant_name,
+                    "exp": now + self.PARTICIPANT_TOKEN_TTL_SECS,
+                    "nbf": now,
+                    "iat": now,
+                    "jti": f"{participant_name}-{now}",
+                    "video": {
+                        "room": room_name,
+                        "roomJoin": True,
+                        "roomAdmin": is_admin,
+                        "canPublish": True,
+                        "canSubscribe": True
+                    },
+                    "metadata": json.dumps({"role": "admin" if is_admin else "candidate"})
+                }
+                return jwt.encode(payload, self.api_secret, algorithm="HS256")
             
-            return token
+            return self._cached_token(("participant", room_name, participant_name, is_admin),
+                                      self.PARTICIPANT_TOKEN_TTL_SECS, sign)
         except Exception as e:
             print(f"Error creating LiveKit token: {e}")
             return None
     
     def generate_api_token(self) -> str:
-        """Generate a JWT token for API access."""
+        """Generate a JWT token for API access (reused until shortly before it expires)."""
         try:
-            now = int(time.time())
-            
-            payload = {
-                "iss": self.api_key,
-                "sub": self.api_key,
-                "exp": now + 60,  # 1 minute token for API access
-                "nbf": now,
-                "iat": now,
-                "jti": f"api-{int(time.time())}",
-            }
-            
-            token = jwt.encode(
-                payload,
-                self.api_secret,
-                algorithm="HS256"
-            )
+            def sign(now: int) -> str:
+                payload = {
+                    "iss": self.api_key,
+                    "sub": self.api_key,
+                    "exp": now + self.API_TOKEN_TTL_SECS,
+                    "nbf": now,
+                    "iat": now,
+                    "jti": f"api-{now}",
+                }
+                return jwt.encode(payload, self.api_secret, algorithm="HS256")
             
-            return token
+            return self._cached_token(("api",), self.API_TOKEN_TTL_SECS, sign)
         except Exception as e:
             print(f"Error generating API token: {e}")
             return "" 
\ No newline at end of file
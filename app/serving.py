@@ -0,0 +1,101 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from app.metrics import metrics
+
+metrics.describe("in_flight_turns", "gauge", "Interview turns currently being processed.")
+metrics.describe("socketio_connections", "gauge", "Open Socket.IO connections.")
+metrics.describe("socketio_connections_rejected_total", "counter", "Socket.IO connections refused by the connection limit or during shutdown.")
+
+
+class InFlightTurns:
+    """
+    Counts interview turns that are being processed so a graceful shutdown can
+    stop accepting new turns and wait for the running ones to finish.
+    """
+
+    def __init__(self):
+        self._count = 0
+        self._draining = False
+        self._condition = threading.Condition()
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def draining(self) -> bool:
+        return self._draining
+
+    def begin(self):
+        with self._condition:
+            self._count += 1
+            metrics.set_gauge("in_flight_turns", self._count)
+
+    def end(self):
+        with self._condition:
+            self._count = max(0, self._count - 1)
+            metrics.set_gauge("in_flight_turns", self._count)
+            self._condition.notify_all()
+
+    @contextmanager
+    def track(self):
+        """Count the enclosed block as one in-flight turn."""
+        self.begin()
+        try:
+            yield
+        finally:
+            self.end()
+
+    def start_draining(self):
+        """Refuse new turns from now on; turns already running carry on."""
+        self._draining = True
+
+    def wait_idle(self, timeout_secs: float) -> bool:
+        """
+        Wait until no turns are in flight.
+
+        Returns:
+            bool: True if all turns finished, False if the timeout expired first
+        """
+        deadline = time.monotonic() + timeout_secs
+        with self._condition:
+            while self._count > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(min(remaining, 0.5))
+            return True
+
+
+class ConnectionCounter:
+    """Tracks open Socket.IO connections and enforces an optional limit (0 = unlimited)."""
+
+    def __init__(self):
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def acquire(self, limit: int) -> bool:
+        """Register a new connection, or return False if the limit is reached."""
+        with self._lock:
+            if limit and self._count >= limit:
+                metrics.inc("socketio_connections_rejected_total", reason="limit")
+                return False
+            self._count += 1
+            metrics.set_gauge("socketio_connections", self._count)
+            return True
+
+    def release(self):
+        with self._lock:
+            self._count = max(0, self._count - 1)
+            metrics.set_gauge("socketio_connections", self._count)
+
+
+# Process-wide state shared by the Socket.IO handlers and run.py
+in_flight_turns = InFlightTurns()
+connections = ConnectionCounter()
@@ -0,0 +1,121 @@
+/**
+ * Admin dashboard: loads past interviews page by page from /api/interviews
+ */
+
+const PAGE_SIZE = 30;
+
+let nextCursor = null;
+let loadingPage = false;
+// Incremented whenever the filters change so responses for old filters are dropped
+let listGeneration = 0;
+
+function listQuery(cursor) {
+    const params = new URLSearchParams({ limit: PAGE_SIZE, sort: document.getElementById('filter-sort').value });
+    const completed = document.getElementById('filter-completed').value;
+    const minRating = document.getElementById('filter-min-rating').value;
+    const maxRating = document.getElementById('filter-max-rating').value;
+    if (completed) params.set('completed', completed);
+    if (minRating) params.set('min_rating', minRating);
+    if (maxRating) params.set('max_rating', maxRating);
+    if (cursor) params.set('cursor', cursor);
+    return '/api/interviews?' + params.toString();
+}
+
+function renderInterviewCard(interview) {
+    const col = document.createElement('div');
+    col.className = 'col-md-4 mb-4';
+
+    const card = document.createElement('div');
+    card.className = 'card';
+    const body = document.createElement('div');
+    body.className = 'card-body';
+
+    const title = document.createElement('h5');
+    title.className = 'card-title';
+    title.textContent = 'Interview ' + interview.id.slice(0, 8);
+
+    const text = document.createElement('p');
+    text.className = 'card-text';
+    text.appendChild(document.createTextNode('Created: ' + formatDate(interview.created_at)));
+    text.appendChild(document.createElement('br'));
+    const badge = document.createElement('span');
+    if (interview.completed) {
+        badge.className = 'badge bg-success';
+        badge.textContent = 'Completed';
+        text.appendChild(badge);
+        text.appendChild(document.createElement('br'));
+        text.appendChild(document.createTextNode('Rating: ' + interview.rating + '/10'));
+    } else {
+        badge.className = 'badge bg-warning';
+        badge.textContent = 'Pending';
+        text.appendChild(badge);
+    }
+
+    const view = document.createElement('a');
+    view.href = '/interview/' + interview.id;
+    view.className = 'btn btn-sm btn-primary';
+    view.textContent = 'View';
+
+    body.append(title, text, view);
+    if (!interview.completed) {
+        const link = document.createElement('a');
+        link.href = '/interview/' + interview.id + '/link';
+        link.className = 'btn btn-sm btn-outline-primary ms-1';
+        link.textContent = 'Get Link';
+        body.appendChild(link);
+    }
+    card.appendChild(body);
+    col.appendChild(card);
+    return col;
+}
+
+function loadNextPage(reset = false) {
+    if (loadingPage && !reset) return;
+    if (reset) {
+        listGeneration++;
+        nextCursor = null;
+        document.getElementById('interview-list').innerHTML = '';
+    } else if (!nextCursor) {
+        return;
+    }
+
+    const generation = listGeneration;
+    const button = document.getElementById('load-more');
+    loadingPage = true;
+
+    fetch(listQuery(nextCursor))
+        .then(response => response.json())
+        .then(data => {
+            if (generation !== listGeneration) return;
+            if (data.error) throw new Error(data.error);
+
+            const list = document.getElementById('interview-list');
+            data.interviews.forEach(interview => list.appendChild(renderInterviewCard(interview)));
+            nextCursor = data.next_cursor;
+
+            document.getElementById('interview-list-empty').classList.toggle('d-none', list.children.length > 0);
+            button.classList.toggle('d-none', !nextCursor);
+        })
+        .catch(handleApiError)
+        .finally(() => {
+            if (generation === listGeneration) loadingPage = false;
+        });
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    if (!document.getElementById('interview-list')) return;
+
+    ['filter-sort', 'filter-completed', 'filter-min-rating', 'filter-max-rating'].forEach(id => {
+        document.getElementById(id).addEventListener('change', () => loadNextPage(true));
+    });
+    document.getElementById('load-more').addEventListener('click', () => loadNextPage());
+
+    // Fetch the next page when the "Load more" button scrolls into view
+    if ('IntersectionObserver' in window) {
+        new IntersectionObserver(entries => {
+            if (entries.some(entry => entry.isIntersecting)) loadNextPage();
+        }).observe(document.getElementById('load-more'));
+    }
+
+    loadNextPage(true);
+});
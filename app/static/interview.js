@@ -7,13 +7,15 @@ const DEBUG = true;
 
 // Initialize variables
 console.log("Initializing Socket.IO connection");
-const socket = io();
+// Connect to the worker that owns this interview, if the server told us which one
+const socket = (typeof socketUrl !== 'undefined' && socketUrl) ? io(socketUrl) : io();
 let mediaRecorder;
 let audioChunks = [];
 let localStream;
 let recordingInterval;
 let isInterviewActive = false;
 let isSpeaking = false;
+let lastAiMessage = null;  // Used to ignore replays of a question already shown
 
 // Global variables for timeout handling
 let aiResponseTimeout = null;
@@ -22,6 +24,11 @@ const AI_RESPONSE_TIMEOUT_MS = 10000; // 10 seconds
 // Quick mode flag for faster responses (skips LLM generation)
 let quickModeEnabled = false;
 
+// Streaming STT: audio chunks are sent while recording so the server can
+// transcribe live (streamingSttEnabled is set by the template)
+const STREAM_TIMESLICE_MS = 250;
+let isStreamingRecording = false;
+
 // Global variables for timing and UI feedback
 let recordingStartTime = 0;
 let recordingEndTime = 0;
@@ -203,6 +210,16 @@ function initializeSocket() {
         
         // Remove the placeholder message
         const placeholders = document.querySelectorAll('.message-candidate');
+        
+        // Nothing was heard: drop the placeholder, the AI will ask again
+        if (data.silent) {
+            const lastMessage = placeholders[placeholders.length - 1];
+            if (lastMessage && lastMessage.querySelector('.message-content').textContent === '...') {
+                lastMessage.remove();
+            }
+            return;
+        }
+        
         if (placeholders.length > 0) {
             const lastPlaceholder = placeholders[placeholders.length - 1];
             if (lastPlaceholder.querySelector('.message-content').textContent === '...') {
@@ -225,6 +242,15 @@ function initializeSocket() {
         }
     });
     
+    socket.on('interim_transcript', function(data) {
+        if (DEBUG) console.log('Interim transcript:', data);
+        
+        // Show what has been heard so far while the candidate is still speaking
+        if (data.transcript) {
+            updateStatus('Hearing: "' + data.transcript + '"');
+        }
+    });
+    
     socket.on('processing_update', function(data) {
         if (DEBUG) console.log('Processing update:', data);
         
@@ -274,6 +300,13 @@ function initializeSocket() {
         } else if (data.status === 'generating') {
             showTypingIndicator('Generating response...');
             updateStatus('AI is generating a response to your answer...');
+        } else if (data.status === 'queued' || data.status === 'assessing') {
+            // The final assessment runs as a background job; don't time out while it waits
+            setResponseTimeout(100000);
+            showTypingIndicator(data.message || 'Preparing your final assessment...');
+            updateStatus(data.status === 'queued'
+                ? 'Your final assessment is queued and will appear here when it is ready...'
+                : 'AI is writing your final assessment...');
         }
     });
     
@@ -295,15 +328,21 @@ function initializeSocket() {
             typingIndicator.remove();
         }
         
-        // Add AI message to the conversation
-        addMessageToConversation('AI Interviewer', data.message, 'ai');
+        // A reconnect replays the pending question; don't show or play it twice
+        const isReplayOfShown = data.replay && data.message === lastAiMessage;
+        lastAiMessage = data.message;
         
-        // Play audio if available
-        if (data.audio_url) {
-            playAudioWithMessage(data.audio_url, data.message);
-        } else {
-            // Use browser TTS as fallback
-            useBrowserTTS(data.message);
+        if (!isReplayOfShown) {
+            // Add AI message to the conversation
+            addMessageToConversation('AI Interviewer', data.message, 'ai');
+            
+            // Play audio if available
+            if (data.audio_url) {
+                playAudioWithMessage(data.audio_url, data.message);
+            } else {
+                // Use browser TTS as fallback
+                useBrowserTTS(data.message);
+            }
         }
         
         // If this is the final message, handle it specially
@@ -483,10 +522,30 @@ function setupMediaRecorder(stream) {
     mediaRecorder = new MediaRecorder(audioStream);
     
     mediaRecorder.ondataavailable = function(event) {
+        if (isStreamingRecording) {
+            // Relay each timeslice to the server's live transcription session
+            if (event.data && event.data.size > 0) {
+                socket.emit('audio_stream_chunk', {
+                    interview_id: interviewId,
+                    chunk: event.data
+                });
+            }
+            return;
+        }
         audioChunks.push(event.data);
     };
     
     mediaRecorder.onstop = function() {
+        if (isStreamingRecording) {
+            // The last chunk has already been sent; the transcript is nearly done
+            isStreamingRecording = false;
+            socket.emit('audio_stream_stop', {
+                interview_id: interviewId,
+                quick_mode: quickModeEnabled
+            });
+            return;
+        }
+        
         const audioBlob = new Blob(audioChunks, { type: 'audio/webm' });
         sendAudioToServer(audioBlob);
         audioChunks = [];
@@ -504,8 +563,16 @@ function startRecording() {
     recordingStartTime = new Date().getTime();
     transcriptionReceived = false;
     
-    // Start recording
-    mediaRecorder.start();
+    // Start recording, streaming chunks to the server if enabled
+    isStreamingRecording = typeof streamingSttEnabled !== 'undefined' && streamingSttEnabled && socket.connected;
+    if (isStreamingRecording) {
+        socket.emit('audio_stream_start', {
+            interview_id: interviewId
+        });
+        mediaRecorder.start(STREAM_TIMESLICE_MS);
+    } else {
+        mediaRecorder.start();
+    }
     
     // Update UI
     holdToSpeakButton.classList.add('recording');
@@ -589,19 +656,17 @@ function startRecordingInterval() {
 
 // Send audio to the server
 function sendAudioToServer(audioBlob) {
-    // Convert blob to base64
-    const reader = new FileReader();
-    reader.readAsDataURL(audioBlob);
-    reader.onloadend = function() {
-        const base64Audio = reader.result;
-        
-        // Send to server via Socket.IO
+    // Send the raw bytes as a binary Socket.IO attachment (no base64 data URL)
+    audioBlob.arrayBuffer().then(function(audioBuffer) {
         socket.emit('candidate_speech', {
             interview_id: interviewId,
-            audio: base64Audio,
+            audio: audioBuffer,
             quick_mode: quickModeEnabled  // Include quick mode flag
         });
-    };
+    }).catch(function(err) {
+        console.error('Error reading recorded audio:', err);
+        updateStatus('Could not read your recording. Please try again or type your response.');
+    });
 }
 
 // End the interview
@@ -1,8 +1,11 @@
 import os
 import json
+import shutil
 import uuid
 from datetime import datetime
 
+from app.models.serialization import read_interview_file
+
 def validate_interview_json(filepath):
     """
     Validate a JSON interview file and repair it if corrupted.
@@ -14,13 +17,12 @@ def validate_interview_json(filepath):
         bool: True if valid or repaired, False if beyond repair
     """
     try:
-        # First, try to load the file to see if it's valid JSON
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        # First, try to load the file to see if it's valid (in any storage format)
+        read_interview_file(filepath)
         
         # If we got this far, the JSON is valid
         return True
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         print(f"JSON error in {filepath}: {e}")
         
         # Try to repair the file
@@ -44,12 +46,8 @@ def repair_interview_json(filepath):
         filename = os.path.basename(filepath)
         backup_path = os.path.join(os.path.dirname(filepath), f"{os.path.splitext(filename)[0]}_corrupted.json")
         
-        with open(filepath, 'r') as src:
-            content = src.read()
-            
-        # Write the backup
-        with open(backup_path, 'w') as dst:
-            dst.write(content)
+        # Write the backup (compressed files are copied as they are)
+        shutil.copyfile(filepath, backup_path)
         
         # Try to create a minimal valid interview object
         interview_id = os.path.splitext(filename)[0]
@@ -0,0 +1,6 @@
+"""Microbenchmarks for the AI Interviewer hot paths.
+
+Run a suite from the repository root, e.g.:
+
+    python -m benchmarks.bench_hot_paths --output bench_output.json
+"""
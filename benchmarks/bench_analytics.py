@@ -0,0 +1,80 @@
+"""
+Benchmark cohort analytics: the first full pass, a delta refresh after a few
+interviews changed, and computing the report, against the old approach of
+loading every interview with InterviewStorage.load_interview.
+
+Usage:
+    python -m benchmarks.bench_analytics [--sizes 1k,10k] [--changed 20] [--output results.json]
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+
+from app.analytics import CACHE_FILENAME, CohortAnalytics
+from app.models import InterviewStorage
+from benchmarks.harness import BenchmarkRun, measure, parse_sizes
+from benchmarks.synthetic import make_interview, populate_storage
+
+
+def load_all_ratings(storage: InterviewStorage):
+    """Baseline: what the ad-hoc report scripts did."""
+    ratings = []
+    for name in os.listdir(storage.storage_dir):
+        if name.endswith(".json"):
+            interview = storage.load_interview(name[:-5])
+            if interview and interview.rating is not None:
+                ratings.append(interview.rating)
+    return ratings
+
+
+def bench_analytics(run: BenchmarkRun, base_dir: str, sizes, changed: int, seed: int, repeat: int):
+    rng = random.Random(seed)
+    for size in sizes:
+        storage = InterviewStorage(storage_dir=os.path.join(base_dir, f"archive_{size}"))
+        ids = populate_storage(storage, size, seed=seed)
+        cache_path = os.path.join(storage.storage_dir, CACHE_FILENAME)
+
+        run.record("load_interview_loop", measure(lambda: load_all_ratings(storage), repeat=min(repeat, 3)), stored=size)
+
+        def full_pass():
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            CohortAnalytics(storage.storage_dir).refresh(force=True)
+        run.record("full_pass", measure(full_pass, repeat=min(repeat, 3)), stored=size)
+
+        analytics = CohortAnalytics(storage.storage_dir)
+        analytics.refresh(force=True)
+
+        def touch_some():
+            for interview_id in rng.sample(ids, changed):
+                interview = storage.load_interview(interview_id)
+                interview.set_rating(rng.randint(1, 10), "Updated")
+                storage.save_interview(interview)
+            storage.save_interview(make_interview(rng, turns=4, cv_chars=800, jd_chars=600, answer_chars=200))
+        run.record("delta_refresh", measure(lambda: analytics.refresh(force=True), repeat=repeat, setup=touch_some),
+                   stored=size, changed=changed + 1)
+        run.record("report", measure(analytics.report, repeat=repeat, number=5), stored=size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1k,10k", help="Archive sizes")
+    parser.add_argument("--changed", type=int, default=20, help="Interviews updated before each delta refresh")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed samples per benchmark")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed for the synthetic data generators")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    run = BenchmarkRun("analytics")
+    base_dir = tempfile.mkdtemp(prefix="analytics_bench_")
+    try:
+        bench_analytics(run, base_dir, parse_sizes(args.sizes), args.changed, args.seed, args.repeat)
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+    run.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
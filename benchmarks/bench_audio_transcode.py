@@ -0,0 +1,85 @@
+"""
+Measure how much the mono/low-rate transcoding stage shrinks recordings per minute of speech.
+
+Uses real recordings passed with --input, or synthesizes a speech-like signal and
+encodes it the way browsers do (48 kHz Opus in webm) as the reference.
+
+Usage:
+    python -m benchmarks.bench_audio_transcode [--input answer.webm ...] [--bitrates 8k,12k,16k,24k]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app import audio as audio_processing
+from benchmarks.harness import BenchmarkRun
+
+
+def synthesize_speech_like(seconds: float, sample_rate: int = 48000, seed: int = 0) -> np.ndarray:
+    """A harmonic signal with syllable-rate amplitude modulation, pauses and background noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pitch = 140 + 25 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 12))
+    syllables = np.clip(np.sin(2 * np.pi * 4 * t), 0, None)
+    pauses = (np.sin(2 * np.pi * 0.15 * t) > -0.6).astype(np.float64)
+    signal = 0.25 * voice * syllables * pauses + rng.normal(0, 0.01, t.size)
+    return np.clip(signal, -1, 1).astype(np.float32)
+
+
+def encode_browser_like(samples: np.ndarray, sample_rate: int = 48000, bitrate: str = "64k", channels: int = 2) -> bytes:
+    """Encode PCM the way MediaRecorder typically does (48 kHz Opus in webm)."""
+    pcm = (samples * 32767).astype(np.int16).tobytes()
+    return audio_processing._run_ffmpeg([
+        "-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "pipe:0",
+        "-ac", str(channels), "-c:a", "libopus", "-b:a", bitrate, "-f", "webm", "pipe:1",
+    ], pcm)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", nargs="*", default=[], help="Recordings to transcode instead of synthetic audio")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Length of the synthetic recording")
+    parser.add_argument("--reference-bitrate", default="64k", help="Bitrate of the synthetic browser-like reference")
+    parser.add_argument("--bitrates", default="8k,12k,16k,24k", help="Target bitrates to compare")
+    parser.add_argument("--sample-rate", type=int, default=16000, help="Target sample rate")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    if not audio_processing.ffmpeg_available():
+        parser.error("ffmpeg is required (install it or set FFMPEG_PATH)")
+
+    clips = []
+    for path in args.input:
+        with open(path, "rb") as f:
+            clips.append((path, f.read()))
+    if not clips:
+        clips.append(("synthetic", encode_browser_like(synthesize_speech_like(args.seconds),
+                                                      bitrate=args.reference_bitrate)))
+
+    run = BenchmarkRun("audio_transcode")
+    for name, data in clips:
+        duration = len(audio_processing.decode_to_pcm(data)) / audio_processing.ANALYSIS_SAMPLE_RATE
+        original_per_min = len(data) * 60.0 / duration
+        run.record("original", {"bytes": len(data), "duration_s": round(duration, 2),
+                                "bytes_per_minute": round(original_per_min)}, clip=name)
+
+        for bitrate in [b.strip() for b in args.bitrates.split(",") if b.strip()]:
+            start = time.perf_counter()
+            encoded = audio_processing.transcode_audio(data, bitrate, args.sample_rate)
+            elapsed = time.perf_counter() - start
+            per_min = len(encoded) * 60.0 / duration
+            run.record("transcoded", {
+                "bytes": len(encoded),
+                "bytes_per_minute": round(per_min),
+                "reduction_pct": round(100.0 * (1 - per_min / original_per_min), 1),
+                "transcode_s": round(elapsed, 4),
+            }, clip=name, bitrate=bitrate, sample_rate=args.sample_rate)
+
+    run.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Compare the legacy base64 data URL audio payload with binary Socket.IO attachments.
+
+Reports bytes on the wire (Socket.IO packet encoding) and the peak server memory
+allocated while receiving, decoding and saving one recording.
+
+Usage:
+    python -m benchmarks.bench_audio_transport [--sizes 250k,1m,4m] [--output results.json]
+"""
+import argparse
+import base64
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from socketio import packet
+
+from app.services import SpeechService
+from benchmarks.harness import BenchmarkRun
+
+
+def _parse_bytes(value: str):
+    sizes = []
+    for part in value.split(","):
+        part = part.strip().lower()
+        multiplier = 1
+        if part.endswith("k"):
+            multiplier, part = 1024, part[:-1]
+        elif part.endswith("m"):
+            multiplier, part = 1024 * 1024, part[:-1]
+        sizes.append(int(float(part) * multiplier))
+    return sizes
+
+
+def encode_payload(audio: bytes, binary: bool):
+    """Encode a candidate_speech event the way the browser client sends it."""
+    if binary:
+        audio_field = audio
+    else:
+        audio_field = "data:audio/webm;base64," + base64.b64encode(audio).decode("ascii")
+    pkt = packet.Packet(packet.EVENT, data=["candidate_speech", {
+        "interview_id": "00000000-0000-0000-0000-000000000000",
+        "audio": audio_field,
+        "quick_mode": False,
+    }], namespace="/")
+    encoded = pkt.encode()
+    return encoded if isinstance(encoded, list) else [encoded]
+
+
+def wire_bytes(frames) -> int:
+    """Total bytes for the encoded Socket.IO frames (text frames as UTF-8)."""
+    return sum(len(f.encode("utf-8")) if isinstance(f, str) else len(f) for f in frames)
+
+
+def receive(frames, filepath: str):
+    """Server side: parse the packet, decode the audio and write the upload file."""
+    pkt = packet.Packet(encoded_packet=frames[0])
+    for attachment in frames[1:]:
+        pkt.add_attachment(attachment)
+    data = pkt.data[1]
+    audio = SpeechService.decode_audio_payload(data["audio"])
+    SpeechService().save_audio(audio, filepath)
+    return len(audio)
+
+
+def bench_transport(run: BenchmarkRun, sizes, repeat: int):
+    workdir = tempfile.mkdtemp(prefix="audio_transport_")
+    try:
+        for size in sizes:
+            audio = os.urandom(size)
+            for binary in (False, True):
+                fmt = "binary" if binary else "base64"
+                frames = encode_payload(audio, binary)
+                filepath = os.path.join(workdir, f"upload_{fmt}.webm")
+
+                peaks = []
+                durations = []
+                for _ in range(repeat):
+                    tracemalloc.start()
+                    start = time.perf_counter()
+                    received = receive(frames, filepath)
+                    durations.append(time.perf_counter() - start)
+                    peaks.append(tracemalloc.get_traced_memory()[1])
+                    tracemalloc.stop()
+                assert received == size
+
+                total = wire_bytes(frames)
+                run.record("audio_upload", {
+                    "wire_bytes": total,
+                    "wire_overhead_pct": round(100.0 * (total - size) / size, 2),
+                    "server_peak_alloc_bytes": max(peaks),
+                    "server_peak_alloc_per_audio_byte": round(max(peaks) / size, 3),
+                    "receive_mean_s": sum(durations) / len(durations),
+                }, format=fmt, audio_bytes=size)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="250k,1m,4m,12m", help="Recording sizes to send")
+    parser.add_argument("--repeat", type=int, default=5, help="Samples per size and format")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    run = BenchmarkRun("audio_transport")
+    bench_transport(run, _parse_bytes(args.sizes), args.repeat)
+    run.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
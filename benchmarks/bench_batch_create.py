@@ -0,0 +1,115 @@
+"""
+Benchmark bulk interview creation: one POST /create_interview per CV against a
+single POST /api/interviews/batch, through the Flask test client. LiveKit is
+simulated with a fixed room creation latency and the question plan LLM call
+returns at once, so only this server's work is timed. Also reports how long
+the rooms of a batch take to be created in the background.
+
+Usage:
+    python -m benchmarks.bench_batch_create [--batch-sizes 100,1k] [--livekit-latency 0.05] [--output results.json]
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+
+from benchmarks.harness import BenchmarkRun, measure, parse_sizes
+from benchmarks.synthetic import make_cv, make_job_description, make_system_prompt
+
+
+def bench_batch_create(run: BenchmarkRun, batch_sizes, livekit_latency: float, seed: int, repeat: int):
+    # Imported lazily: app.routes initializes the provider clients and storage (in the working directory) at import time
+    from app import create_app
+    from app.routes import livekit_service, llm_service, room_pool
+
+    rooms_created = []
+    rooms_lock = threading.Lock()
+
+    def create_room(room_name):
+        time.sleep(livekit_latency)
+        with rooms_lock:
+            rooms_created.append(room_name)
+        return room_name
+
+    livekit_service.create_room = create_room
+    livekit_service.url = livekit_service.url or "https://livekit.invalid"  # Rooms are only created when LiveKit is configured
+    # No pre-created rooms: every room is created on demand, in the background
+    room_pool.size = 0
+    llm_service.generate_question_plan = lambda cv, job_description, system_prompt: []
+
+    client = create_app().test_client()
+    rng = random.Random(seed)
+    job_description = make_job_description(rng)
+    system_prompt = make_system_prompt(rng)
+    requested = 0  # Rooms assigned so far, one per interview created
+
+    def wait_for_rooms(count):
+        while True:
+            with rooms_lock:
+                if len(rooms_created) >= count:
+                    return
+            time.sleep(0.005)
+
+    for size in batch_sizes:
+        cvs = [make_cv(rng, chars=2000) for _ in range(size)]
+
+        def single_posts():
+            for cv in cvs:
+                response = client.post("/create_interview", data={
+                    "cv": cv, "job_description": job_description, "system_prompt": system_prompt,
+                })
+                assert response.status_code == 200, response.data
+
+        def batch_post():
+            response = client.post("/api/interviews/batch", json={
+                "job_description": job_description, "system_prompt": system_prompt, "cvs": cvs,
+            })
+            assert response.status_code == 200, response.data
+
+        for name, create in (("single_posts", single_posts), ("batch_post", batch_post)):
+            stats = measure(create, repeat=repeat)
+            stats["interviews_per_s"] = round(size / stats["median_s"], 1)
+            run.record(name, stats, interviews=size)
+            requested += size * repeat
+
+        # Rooms are created in the background after the response; time until all of them exist,
+        # starting once the rooms of the runs above are done
+        wait_for_rooms(requested)
+        start = time.perf_counter()
+        batch_post()
+        requested += size
+        wait_for_rooms(requested)
+        run.record("rooms_ready", {
+            "seconds": round(time.perf_counter() - start, 3),
+            "serial_seconds": round(size * livekit_latency, 3),
+            "workers": room_pool.workers,
+        }, interviews=size, livekit_latency_s=livekit_latency)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-sizes", default="100,1k", help="Interviews created per batch")
+    parser.add_argument("--livekit-latency", type=float, default=0.05, help="Simulated seconds per LiveKit room creation")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed samples per benchmark")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed for the synthetic data generators")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+    output = os.path.abspath(args.output) if args.output else None
+
+    run = BenchmarkRun("batch_create")
+    base_dir = tempfile.mkdtemp(prefix="batch_create_bench_")
+    cwd = os.getcwd()
+    os.chdir(base_dir)
+    try:
+        bench_batch_create(run, parse_sizes(args.batch_sizes), args.livekit_latency, args.seed, args.repeat)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(base_dir, ignore_errors=True)
+    run.write(output)
+
+
+if __name__ == "__main__":
+    main()
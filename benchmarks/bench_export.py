@@ -0,0 +1,82 @@
+"""
+Benchmark bulk export: streaming gzip NDJSON/CSV against the old approach of
+fetching every interview and serializing the whole list at once. Peak Python
+memory (tracemalloc) shows whether memory use stays flat as the archive grows.
+
+Usage:
+    python -m benchmarks.bench_export [--sizes 1k,10k] [--output results.json]
+"""
+import argparse
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from app.export import export_interviews, select_fields
+from app.models import InterviewStorage
+from benchmarks.harness import BenchmarkRun, measure, parse_sizes
+from benchmarks.synthetic import populate_storage
+
+
+def export_all_at_once(storage: InterviewStorage) -> bytes:
+    """Baseline: one /api/interviews/<id> load per interview, then one big dump."""
+    records = []
+    for summary in storage.list_interviews():
+        records.append(storage.load_interview(summary["id"]).to_dict())
+    return gzip.compress("\n".join(json.dumps(r) for r in records).encode("utf-8"))
+
+
+def drain(chunks) -> int:
+    return sum(len(chunk) for chunk in chunks)
+
+
+def peak_memory(func) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_export(run: BenchmarkRun, base_dir: str, sizes, seed: int, repeat: int):
+    for size in sizes:
+        storage = InterviewStorage(storage_dir=os.path.join(base_dir, f"archive_{size}"))
+        populate_storage(storage, size, seed=seed)
+        no_cv = select_fields(exclude=["cv", "system_prompt"])
+        cases = {
+            "load_all_then_dump": lambda: export_all_at_once(storage),
+            "stream_ndjson": lambda: drain(export_interviews(storage.storage_dir, "ndjson")),
+            "stream_ndjson_no_cv": lambda: drain(export_interviews(storage.storage_dir, "ndjson", no_cv)),
+            "stream_csv": lambda: drain(export_interviews(storage.storage_dir, "csv")),
+            # Nothing changed since the last nightly sync
+            "stream_since_now": lambda: drain(export_interviews(storage.storage_dir, since=time.time())),
+        }
+        for name, func in cases.items():
+            stats = measure(func, repeat=repeat)
+            stats["peak_memory_kb"] = round(peak_memory(func) / 1024)
+            run.record(name, stats, stored=size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1k,10k", help="Archive sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed samples per benchmark")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed for the synthetic data generators")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    run = BenchmarkRun("export")
+    base_dir = tempfile.mkdtemp(prefix="export_bench_")
+    try:
+        bench_export(run, base_dir, parse_sizes(args.sizes), args.seed, args.repeat)
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+    run.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmarks for the storage and prompt-building code paths that run on every turn.
+
+Usage:
+    python -m benchmarks.bench_hot_paths [--sizes 100,10k,100k] [--output results.json]
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+
+from app.models import Interview, InterviewStorage
+from app.utils import validate_all_interview_files
+from benchmarks.harness import BenchmarkRun, measure, parse_sizes
+from benchmarks.synthetic import make_interview, make_transcript_interview, populate_storage
+
+
+def _archive(base_dir: str, size: int, seed: int) -> InterviewStorage:
+    """Return a storage holding exactly ``size`` interviews, reusing a previous archive if present."""
+    storage_dir = os.path.join(base_dir, f"archive_{size}")
+    storage = InterviewStorage(storage_dir=storage_dir)
+    existing = [name for name in os.listdir(storage_dir) if name.endswith(".json")]
+    if len(existing) != size:
+        shutil.rmtree(storage_dir)
+        storage = InterviewStorage(storage_dir=storage_dir)
+        populate_storage(storage, size, seed=seed)
+    return storage
+
+
+def bench_storage(run: BenchmarkRun, base_dir: str, sizes, seed: int, repeat: int):
+    """Benchmark save/load/list/validate against archives of increasing size."""
+    rng = random.Random(seed)
+    for size in sizes:
+        storage = _archive(base_dir, size, seed)
+        ids = [os.path.splitext(name)[0] for name in os.listdir(storage.storage_dir) if name.endswith(".json")]
+        interview = make_interview(rng, turns=10)
+        storage.save_interview(interview)
+
+        run.record("save_interview", measure(lambda: storage.save_interview(interview), repeat=repeat, number=20),
+                   stored=size, turns=10)
+
+        sample_ids = [rng.choice(ids) for _ in range(20)]
+        run.record("load_interview", measure(lambda: [storage.load_interview(i) for i in sample_ids], repeat=repeat),
+                   stored=size, calls=len(sample_ids))
+
+        list_repeat = max(1, min(repeat, 3 if size >= 100000 else repeat))
+        run.record("list_interviews", measure(storage.list_interviews, repeat=list_repeat), stored=size)
+        run.record("list_interviews_page", measure(lambda: storage.index.query(limit=50), repeat=repeat, number=20),
+                   stored=size, limit=50)
+        run.record("list_interviews_page_filtered",
+                   measure(lambda: storage.index.query(sort="rating", min_rating=7, completed=True, limit=50),
+                           repeat=repeat, number=20),
+                   stored=size, limit=50, sort="rating")
+        run.record("validate_all_interview_files",
+                   measure(lambda: validate_all_interview_files(storage.storage_dir), repeat=list_repeat), stored=size)
+
+        # Leave the archive at its nominal size for reuse
+        os.remove(os.path.join(storage.storage_dir, f"{interview.id}.json"))
+        storage.index.remove(interview.id)
+
+
+def bench_serialization(run: BenchmarkRun, seed: int, repeat: int):
+    """Benchmark Interview.to_dict/from_dict for short and long transcripts."""
+    rng = random.Random(seed)
+    for turns in (5, 50, 200):
+        interview = make_interview(rng, turns=turns)
+        data = interview.to_dict()
+        run.record("Interview.to_dict", measure(interview.to_dict, repeat=repeat, number=200), turns=turns)
+        run.record("Interview.from_dict", measure(lambda: Interview.from_dict(data), repeat=repeat, number=200),
+                   turns=turns)
+
+
+def bench_prompt_building(run: BenchmarkRun, seed: int, repeat: int):
+    """Benchmark format_messages_for_llm on long transcripts and get_fallback_question."""
+    # Imported lazily: app.routes initializes the provider clients at import time
+    from app.routes import format_messages_for_llm, get_fallback_question
+
+    rng = random.Random(seed)
+    for turns in (10, 100, 500):
+        interview = make_transcript_interview(rng, turns=turns)
+        run.record("format_messages_for_llm", measure(lambda: format_messages_for_llm(interview), repeat=repeat,
+                                                      number=20), turns=turns)
+
+    interview = make_interview(rng, turns=5)
+    for question_num in (0, 5, 50):
+        run.record("get_fallback_question",
+                   measure(lambda: get_fallback_question(interview, question_num), repeat=repeat, number=1000),
+                   question_num=question_num)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,10k,100k", help="Archive sizes for the storage benchmarks")
+    parser.add_argument("--repeat", type=int, default=7, help="Timed samples per benchmark")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed for the synthetic data generators")
+    parser.add_argument("--data-dir", help="Keep generated archives here and reuse them across runs")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    parser.add_argument("--skip-storage", action="store_true", help="Only run the in-memory benchmarks")
+    args = parser.parse_args(argv)
+
+    run = BenchmarkRun("hot_paths")
+    base_dir = args.data_dir or tempfile.mkdtemp(prefix="interview_bench_")
+    os.makedirs(base_dir, exist_ok=True)
+    try:
+        bench_serialization(run, args.seed, args.repeat)
+        bench_prompt_building(run, args.seed, args.repeat)
+        if not args.skip_storage:
+            bench_storage(run, base_dir, parse_sizes(args.sizes), args.seed, args.repeat)
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(base_dir, ignore_errors=True)
+
+    run.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
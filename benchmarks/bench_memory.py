@@ -0,0 +1,105 @@
+"""
+Benchmark the memory held per active interview: the previous representation
+(the stored dict, with transcript entries as dicts with ISO timestamp strings)
+against the slotted Interview with compact TranscriptEntry records, and the
+messages built for the LLM on every turn (pydantic models before, tuples now).
+
+Usage:
+    python -m benchmarks.bench_memory [--interviews 200] [--turns 10,30] [--output results.json]
+"""
+import argparse
+import gc
+import os
+import random
+import shutil
+import tempfile
+import tracemalloc
+
+from app.models import InterviewStorage
+from app.models.serialization import read_interview_file
+from app.services import Message
+from benchmarks.harness import BenchmarkRun, measure, parse_sizes
+from benchmarks.synthetic import make_interview
+
+try:
+    from pydantic import BaseModel
+
+    class PydanticMessage(BaseModel):
+        """The message model used before."""
+        role: str
+        content: str
+except ImportError:
+    PydanticMessage = None
+
+
+def retained_bytes(build) -> int:
+    """Bytes still allocated by what ``build`` returns."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def build_messages(interview, message_class):
+    messages = [message_class(role="system", content="You are an interviewer.")]
+    for message in interview.transcripts:
+        role = "assistant" if message["role"] == "ai" else "user"
+        messages.append(message_class(role=role, content=message["content"]))
+    return messages
+
+
+def bench_memory(run: BenchmarkRun, base_dir: str, count: int, turn_counts, seed: int, repeat: int):
+    rng = random.Random(seed)
+    for turns in turn_counts:
+        storage = InterviewStorage(storage_dir=os.path.join(base_dir, f"turns_{turns}"))
+        ids = []
+        for _ in range(count):
+            interview = make_interview(rng, turns=turns, completed=False)
+            storage.save_interview(interview)
+            ids.append(interview.id)
+        paths = [os.path.join(storage.storage_dir, f"{interview_id}.json") for interview_id in ids]
+
+        dict_bytes = retained_bytes(lambda: [read_interview_file(path) for path in paths])
+        compact_bytes = retained_bytes(lambda: [storage.load_interview(interview_id) for interview_id in ids])
+        run.record("interview_memory", {
+            "dict_bytes_per_interview": dict_bytes // count,
+            "compact_bytes_per_interview": compact_bytes // count,
+            "saved": f"{1 - compact_bytes / dict_bytes:.0%}",
+        }, interviews=count, turns=turns)
+
+        interview = storage.load_interview(ids[0])
+        classes = {"tuple": Message}
+        if PydanticMessage is not None:
+            classes["pydantic"] = PydanticMessage
+        for name, message_class in classes.items():
+            stats = measure(lambda: build_messages(interview, message_class), repeat=repeat, number=200)
+            stats["bytes"] = retained_bytes(lambda: build_messages(interview, message_class))
+            run.record("build_llm_messages", stats, message=name, turns=turns)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interviews", type=int, default=200, help="Interviews held in memory")
+    parser.add_argument("--turns", default="10,30", help="Question/answer pairs per interview")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed samples per benchmark")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed for the synthetic data generators")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    run = BenchmarkRun("memory")
+    base_dir = tempfile.mkdtemp(prefix="memory_bench_")
+    try:
+        bench_memory(run, base_dir, args.interviews, parse_sizes(args.turns), args.seed, args.repeat)
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+    run.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
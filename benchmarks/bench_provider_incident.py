@@ -0,0 +1,91 @@
+"""
+Simulate a provider incident and compare per-call latency with and without the circuit breaker.
+
+During the incident every request hangs past its deadline. Without a breaker each
+turn waits the full timeout; with it, calls fail fast into the fallback once the
+circuit opens. A second scenario adds occasional slow responses (slower than the 95th percentile) to show hedging.
+
+Usage:
+    python -m benchmarks.bench_provider_incident [--calls 200] [--timeout 2] [--slow-rate 0.03]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.resilience import CircuitBreaker, CircuitOpenError
+from app.services import run_with_timeout
+from benchmarks.harness import BenchmarkRun
+
+
+def _summary(latencies):
+    latencies = sorted(latencies)
+    return {
+        "calls": len(latencies),
+        "median_s": round(statistics.median(latencies), 4),
+        "p95_s": round(latencies[min(len(latencies) - 1, int(0.95 * (len(latencies) - 1) + 0.5))], 4),
+        "max_s": round(latencies[-1], 4),
+        "total_s": round(sum(latencies), 2),
+    }
+
+
+def run_incident(run: BenchmarkRun, calls: int, timeout: float):
+    def hanging_request():
+        time.sleep(timeout * 3)
+        return {"ok": True}
+
+    baseline = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        run_with_timeout(hanging_request, timeout_secs=timeout, default=None)
+        baseline.append(time.perf_counter() - start)
+    run.record("outage_without_breaker", _summary(baseline), timeout_s=timeout)
+
+    breaker = CircuitBreaker("bench_outage", failure_threshold=3, reset_timeout_secs=60)
+    protected = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        try:
+            breaker.call(hanging_request, timeout)
+        except CircuitOpenError:
+            pass
+        protected.append(time.perf_counter() - start)
+    run.record("outage_with_breaker", _summary(protected), timeout_s=timeout, failure_threshold=3)
+
+
+def run_slow_tail(run: BenchmarkRun, calls: int, timeout: float, slow_rate: float, seed: int):
+    rng = random.Random(seed)
+
+    def flaky_request():
+        time.sleep(1.0 if rng.random() < slow_rate else rng.uniform(0.01, 0.03))
+        return {"ok": True}
+
+    for hedging in (False, True):
+        breaker = CircuitBreaker(f"bench_tail_{hedging}", hedging=hedging, hedge_min_samples=10)
+        latencies = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            breaker.call(flaky_request, timeout)
+            latencies.append(time.perf_counter() - start)
+        run.record("slow_tail", _summary(latencies), hedging=hedging, slow_rate=slow_rate)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200, help="Calls per scenario")
+    parser.add_argument("--timeout", type=float, default=2.0, help="Per-call deadline in seconds")
+    parser.add_argument("--slow-rate", type=float, default=0.03,
+                        help="Share of slow responses in the tail scenario (hedging helps while this is below the hedge percentile)")
+    parser.add_argument("--baseline-calls", type=int, default=10, help="Calls without the breaker (each waits the full timeout)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    run = BenchmarkRun("provider_incident")
+    run_incident(run, min(args.calls, args.baseline_calls), args.timeout)
+    run_slow_tail(run, args.calls, args.timeout, args.slow_rate, args.seed)
+    run.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark the full-text search index: incremental updates and ranked queries
+against archives of increasing size.
+
+Usage:
+    python -m benchmarks.bench_search [--sizes 1k,10k,100k] [--output results.json]
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+
+from app.search import SearchIndex
+from benchmarks.harness import BenchmarkRun, measure, parse_sizes
+from benchmarks.synthetic import make_interview
+
+QUERIES = ["python", "kubernetes docker", '"data pipelines"', '"machine learning" mentored', "graphql terraform"]
+
+
+def bench_search(run: BenchmarkRun, base_dir: str, sizes, seed: int, repeat: int):
+    rng = random.Random(seed)
+    index = SearchIndex(os.path.join(base_dir, "search.sqlite3"))
+    indexed = 0
+    for size in sorted(sizes):
+        # Grow the same index to each size
+        while indexed < size:
+            batch = min(1000, size - indexed)
+            index.update_many(
+                make_interview(rng, turns=4, cv_chars=800, jd_chars=200, answer_chars=200).to_dict()
+                for _ in range(batch)
+            )
+            indexed += batch
+
+        # A turn: one new question/answer/evaluation on an indexed interview, then a save
+        interview = make_interview(rng, turns=4, cv_chars=800, jd_chars=200, answer_chars=200)
+        index.update(interview.to_dict())
+
+        def add_turn():
+            interview.add_message("ai", "What did you learn from that project?")
+            interview.add_message("candidate", "I learned to profile the Python services before optimizing them.")
+            interview.add_message("evaluation", "Concrete and reflective answer.")
+            index.update(interview.to_dict())
+
+        run.record("incremental_update", measure(add_turn, repeat=repeat, number=20), stored=size)
+        run.record("unchanged_save", measure(lambda: index.update(interview.to_dict()), repeat=repeat, number=20),
+                   stored=size)
+        for query in QUERIES:
+            run.record("search", measure(lambda: index.search(query, limit=20), repeat=repeat), stored=size, query=query)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1k,10k,100k", help="Archive sizes to query")
+    parser.add_argument("--repeat", type=int, default=7, help="Timed samples per benchmark")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed for the synthetic data generators")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    run = BenchmarkRun("search")
+    base_dir = tempfile.mkdtemp(prefix="search_bench_")
+    try:
+        bench_search(run, base_dir, parse_sizes(args.sizes), args.seed, args.repeat)
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+    run.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark campaigns of interviews that share one job description and system
+prompt: disk usage, load time and memory held by the loaded interviews, with
+the shared texts stored once as blobs against inline in every file.
+
+Usage:
+    python -m benchmarks.bench_shared_texts [--interviews 1000] [--jobs 1,10] [--output results.json]
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+
+from app.models import InterviewStorage
+from benchmarks.bench_memory import retained_bytes
+from benchmarks.harness import BenchmarkRun, measure, parse_sizes
+from benchmarks.synthetic import make_interview, make_job_description, make_system_prompt
+
+
+def disk_bytes(directory: str) -> int:
+    total = 0
+    for root, _, files in os.walk(directory):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files if name.endswith((".json", ".txt")))
+    return total
+
+
+def bench_shared_texts(run: BenchmarkRun, base_dir: str, count: int, job_counts, seed: int, repeat: int):
+    for jobs in job_counts:
+        rng = random.Random(seed)
+        templates = [(make_job_description(rng, 4000), make_system_prompt(rng, questions=8)) for _ in range(jobs)]
+        interviews = []
+        for i in range(count):
+            interview = make_interview(rng, turns=4, completed=False)
+            interview.job_description, interview.system_prompt = templates[i % jobs]
+            interviews.append(interview)
+
+        for share_texts in (False, True):
+            name = "blobs" if share_texts else "inline"
+            storage = InterviewStorage(storage_dir=os.path.join(base_dir, f"{name}_{jobs}"), share_texts=share_texts)
+            storage.save_interviews(interviews)
+            ids = [interview.id for interview in interviews]
+
+            run.record("disk_usage", {"bytes": disk_bytes(storage.storage_dir)}, storage=name, interviews=count, jobs=jobs)
+            run.record("load_all", measure(lambda: [storage.load_interview(i) for i in ids], repeat=repeat),
+                       storage=name, interviews=count, jobs=jobs)
+            held = retained_bytes(lambda: [storage.load_interview(i) for i in ids])
+            run.record("memory", {"bytes_per_interview": held // count}, storage=name, interviews=count, jobs=jobs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interviews", type=int, default=1000, help="Interviews in the campaign")
+    parser.add_argument("--jobs", default="1,10", help="Distinct job descriptions shared by the interviews")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed samples per benchmark")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed for the synthetic data generators")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    run = BenchmarkRun("shared_texts")
+    base_dir = tempfile.mkdtemp(prefix="shared_texts_bench_")
+    try:
+        bench_shared_texts(run, base_dir, args.interviews, parse_sizes(args.jobs), args.seed, args.repeat)
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+    run.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
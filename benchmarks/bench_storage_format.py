@@ -0,0 +1,75 @@
+"""
+Benchmark interview file formats: size on disk and save/load time of the
+legacy pretty-printed JSON (format 1) against compact format 2 and sectioned
+format 3, with and without compression, for transcripts of growing length.
+For format 3 also the lazy load used when a candidate joins (header and last
+transcript message only) against a full load.
+
+Usage:
+    python -m benchmarks.bench_storage_format [--turns 5,20,60] [--output results.json]
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+
+from app.models import InterviewStorage
+from app.models.serialization import COMPACT_VERSION, FORMAT_VERSION, LEGACY_VERSION, decode
+from benchmarks.harness import BenchmarkRun, measure, parse_sizes
+from benchmarks.synthetic import make_interview
+
+FORMATS = {
+    "legacy": {"format_version": LEGACY_VERSION, "compress_completed": False},
+    "compact": {"format_version": COMPACT_VERSION, "compress_completed": False},
+    "compact_gzip": {"format_version": COMPACT_VERSION, "compress_completed": True},
+    "sectioned": {"format_version": FORMAT_VERSION, "compress_completed": False},
+    "sectioned_compressed": {"format_version": FORMAT_VERSION, "compress_completed": True},
+}
+
+
+def join_load(storage: InterviewStorage, interview_id: str):
+    """What a candidate joining the interview reads."""
+    interview = storage.load_interview(interview_id, lazy=True)
+    return interview.transcript_count, interview.transcript_tail(1)
+
+
+def bench_formats(run: BenchmarkRun, base_dir: str, turn_counts, seed: int, repeat: int):
+    for turns in turn_counts:
+        interview = make_interview(random.Random(seed), turns=turns, completed=True)
+        for name, options in FORMATS.items():
+            storage = InterviewStorage(storage_dir=os.path.join(base_dir, f"{name}_{turns}"), **options)
+            path = storage.save_interview(interview)
+            with open(path, "rb") as f:
+                raw = f.read()
+
+            run.record("file_size", {"bytes": len(raw)}, format=name, turns=turns)
+            run.record("save_interview", measure(lambda: storage.save_interview(interview), repeat=repeat, number=20),
+                       format=name, turns=turns)
+            run.record("load_interview", measure(lambda: storage.load_interview(interview.id), repeat=repeat, number=50),
+                       format=name, turns=turns)
+            run.record("decode", measure(lambda: decode(raw), repeat=repeat, number=50), format=name, turns=turns)
+            if options["format_version"] == FORMAT_VERSION:
+                run.record("join_load", measure(lambda: join_load(storage, interview.id), repeat=repeat, number=50),
+                           format=name, turns=turns)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", default="5,20,60", help="Question/answer pairs per interview")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed samples per benchmark")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed for the synthetic data generators")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    run = BenchmarkRun("storage_format")
+    base_dir = tempfile.mkdtemp(prefix="storage_format_bench_")
+    try:
+        bench_formats(run, base_dir, parse_sizes(args.turns), args.seed, args.repeat)
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+    run.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Measure interview turn throughput as the number of worker processes grows.
+
+Each worker process owns a share of the interviews (as the rendezvous routing in
+app.cluster would assign them) and runs simulated turns against the shared
+storage directory: locked load, CPU-bound prompt building and serialization, a
+simulated provider wait, locked save, and an ``ai_message`` emit published
+through the built-in local message queue broker.
+
+Usage:
+    python -m benchmarks.bench_workers [--workers 1,2,4] [--turns 400] [--provider-ms 50]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import secrets
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Client
+
+from app.cluster import LocalQueueBroker, LocalQueueManager, owner_worker
+from app.models import InterviewStorage
+from benchmarks.harness import BenchmarkRun
+from benchmarks.synthetic import make_interview
+
+
+def _simulated_turn(storage: InterviewStorage, manager: LocalQueueManager, interview_id: str,
+                    provider_ms: float, rounds: int):
+    """One candidate turn: read, build a prompt, wait on the provider, write, emit."""
+    with storage.lock(interview_id):
+        interview = storage.load_interview(interview_id)
+    # Prompt building and serialization are CPU-bound and hold the GIL
+    for _ in range(rounds):
+        prompt = json.dumps([{"role": t["role"], "content": t["content"]} for t in interview.transcripts])
+    time.sleep(provider_ms / 1000.0)
+    question = f"Follow-up question {len(prompt)}"
+
+    def mutate(current):
+        current.add_message("candidate", "Simulated answer")
+        current.add_message("ai", question)
+        # Keep the transcript from growing across turns so runs stay comparable
+        del current.transcripts[:-40]
+
+    storage.update_interview(interview_id, mutate)
+    manager.emit("ai_message", {"message": question, "audio_url": None}, room=f"interview_{interview_id}")
+
+
+def _worker(storage_dir: str, queue_url: str, interview_ids, turns: int, threads: int,
+            provider_ms: float, rounds: int, barrier, results):
+    storage = InterviewStorage(storage_dir=storage_dir)
+    manager = LocalQueueManager(queue_url, write_only=True)
+    rng = random.Random(os.getpid())
+    barrier.wait()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [pool.submit(_simulated_turn, storage, manager, rng.choice(interview_ids), provider_ms, rounds)
+                   for _ in range(turns)]
+        for future in futures:
+            future.result()
+    results.put(time.perf_counter() - start)
+
+
+def _count_messages(queue_url: str, counter: dict, stop: threading.Event):
+    """Subscribe to the broker like a worker would and count fanned-out emits."""
+    from app.cluster import _queue_authkey, parse_local_queue_url
+    conn = Client(parse_local_queue_url(queue_url), authkey=_queue_authkey())
+    while not stop.is_set():
+        if conn.poll(0.1):
+            conn.recv_bytes()
+            counter["received"] += 1
+    conn.close()
+
+
+def run_config(run: BenchmarkRun, worker_count: int, storage_dir: str, broker: LocalQueueBroker,
+               interview_ids, args):
+    workers = [f"http://127.0.0.1:{5000 + i}" for i in range(worker_count)]
+    owned = {w: [] for w in workers}
+    for interview_id in interview_ids:
+        owned[owner_worker(interview_id, workers)].append(interview_id)
+
+    counter = {"received": 0}
+    stop = threading.Event()
+    subscriber = threading.Thread(target=_count_messages, args=(broker.url, counter, stop), daemon=True)
+    subscriber.start()
+    time.sleep(0.2)
+
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(worker_count + 1)
+    results = ctx.Queue()
+    turns_per_worker = args.turns // worker_count
+    processes = [
+        ctx.Process(target=_worker, args=(storage_dir, broker.url, owned[w] or interview_ids, turns_per_worker,
+                                          args.threads, args.provider_ms, args.cpu_rounds, barrier, results))
+        for w in workers
+    ]
+    for process in processes:
+        process.start()
+    barrier.wait()
+    start = time.perf_counter()
+    durations = [results.get() for _ in processes]
+    elapsed = time.perf_counter() - start
+    for process in processes:
+        process.join()
+
+    total_turns = turns_per_worker * worker_count
+    deadline = time.time() + 5
+    while counter["received"] < total_turns and time.time() < deadline:
+        time.sleep(0.05)
+    stop.set()
+    subscriber.join()
+
+    run.record("turn_throughput", {
+        "turns": total_turns,
+        "elapsed_s": round(elapsed, 3),
+        "slowest_worker_s": round(max(durations), 3),
+        "turns_per_s": round(total_turns / elapsed, 1),
+        "emits_delivered": counter["received"],
+    }, workers=worker_count, threads=args.threads, provider_ms=args.provider_ms)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4", help="Worker counts to compare")
+    parser.add_argument("--turns", type=int, default=400, help="Total turns per configuration")
+    parser.add_argument("--interviews", type=int, default=64, help="Number of concurrent interviews")
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent turns per worker")
+    parser.add_argument("--provider-ms", type=float, default=50.0, help="Simulated STT/LLM/TTS wait per turn")
+    parser.add_argument("--cpu-rounds", type=int, default=20, help="Prompt serializations per turn (CPU work)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    # Inherited by the worker processes
+    os.environ.setdefault("SOCKETIO_QUEUE_AUTHKEY", secrets.token_hex(32))
+    storage_dir = tempfile.mkdtemp(prefix="bench_workers_")
+    broker = LocalQueueBroker(("127.0.0.1", 0)).start()
+    try:
+        storage = InterviewStorage(storage_dir=storage_dir)
+        rng = random.Random(args.seed)
+        interview_ids = []
+        for _ in range(args.interviews):
+            interview = make_interview(rng, turns=20, completed=False)
+            storage.save_interview(interview)
+            interview_ids.append(interview.id)
+
+        run = BenchmarkRun("workers")
+        for count in [int(c) for c in args.workers.split(",") if c.strip()]:
+            run_config(run, count, storage_dir, broker, interview_ids, args)
+        run.write(args.output)
+    finally:
+        broker.close()
+        shutil.rmtree(storage_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
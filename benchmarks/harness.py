@@ -0,0 +1,110 @@
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+
+def measure(func: Callable[[], Any], repeat: int = 5, number: int = 1, setup: Optional[Callable[[], Any]] = None) -> Dict[str, float]:
+    """
+    Time a callable and summarize the per-call latency.
+
+    Args:
+        func: Zero-argument callable to benchmark
+        repeat: Number of timed samples to collect
+        number: Calls per sample (the sample time is divided by this)
+        setup: Optional callable run (untimed) before every sample
+
+    Returns:
+        dict: Latency statistics in seconds plus throughput in ops/s
+    """
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            samples.append((time.perf_counter() - start) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    samples.sort()
+    p95_index = min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))
+    mean = statistics.fmean(samples)
+    return {
+        "samples": len(samples),
+        "calls_per_sample": number,
+        "mean_s": mean,
+        "median_s": statistics.median(samples),
+        "p95_s": samples[p95_index],
+        "min_s": samples[0],
+        "max_s": samples[-1],
+        "ops_per_s": (1.0 / mean) if mean > 0 else float("inf"),
+    }
+
+
+class BenchmarkRun:
+    """Collects benchmark results and writes them as machine-readable JSON."""
+
+    def __init__(self, suite: str):
+        self.suite = suite
+        self.started_at = datetime.now().isoformat()
+        self.results: List[Dict[str, Any]] = []
+
+    def record(self, name: str, stats: Dict[str, Any], **params):
+        """Record one benchmark result and echo a one-line summary to stderr."""
+        entry = {"name": name, "params": params, **stats}
+        self.results.append(entry)
+
+        label = ", ".join(f"{k}={v}" for k, v in params.items())
+        if "mean_s" in stats:
+            summary = f"mean={stats['mean_s'] * 1000:.3f}ms p95={stats['p95_s'] * 1000:.3f}ms"
+        else:
+            summary = ", ".join(f"{k}={v}" for k, v in stats.items())
+        print(f"[{self.suite}] {name} ({label}): {summary}", file=sys.stderr)
+        return entry
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the run to a dictionary for output."""
+        return {
+            "suite": self.suite,
+            "started_at": self.started_at,
+            "finished_at": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "results": self.results,
+        }
+
+    def write(self, output: Optional[str] = None):
+        """Write results to a JSON file, or to stdout when no path is given."""
+        payload = json.dumps(self.to_dict(), indent=2)
+        if output:
+            with open(output, "w") as f:
+                f.write(payload)
+            print(f"Wrote {len(self.results)} results to {output}", file=sys.stderr)
+        else:
+            print(payload)
+
+
+def parse_sizes(value: str) -> List[int]:
+    """Parse a comma separated list of sizes such as "100,10k,100k"."""
+    sizes = []
+    for part in value.split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        multiplier = 1
+        if part.endswith("k"):
+            multiplier, part = 1000, part[:-1]
+        sizes.append(int(float(part) * multiplier))
+    return sizes
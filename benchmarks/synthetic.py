@@ -0,0 +1,143 @@
+import random
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from app.models import Interview, InterviewStorage
+
+SKILLS = [
+    "Python", "Flask", "PostgreSQL", "Docker", "Kubernetes", "React", "TypeScript",
+    "AWS", "Terraform", "machine learning", "data pipelines", "REST APIs", "GraphQL",
+    "CI/CD", "observability", "distributed systems", "stakeholder management", "Agile",
+]
+
+VERBS = [
+    "designed", "built", "maintained", "migrated", "optimized", "led", "mentored",
+    "shipped", "automated", "scaled", "refactored", "documented",
+]
+
+NOUNS = [
+    "a billing service", "the reporting platform", "an internal API", "the data warehouse",
+    "a recommendation engine", "our deployment pipeline", "the mobile backend",
+    "a customer-facing dashboard", "the search cluster", "a payments integration",
+]
+
+FILLER = [
+    "which reduced latency noticeably", "in close collaboration with product",
+    "under a tight deadline", "while keeping the on-call load low",
+    "with a team of four engineers", "and wrote the runbooks for it",
+]
+
+
+def _sentence(rng: random.Random) -> str:
+    return (
+        f"I {rng.choice(VERBS)} {rng.choice(NOUNS)} using {rng.choice(SKILLS)} "
+        f"and {rng.choice(SKILLS)} {rng.choice(FILLER)}."
+    )
+
+
+def make_text(rng: random.Random, min_chars: int) -> str:
+    """Generate plausible free text of at least ``min_chars`` characters."""
+    parts = []
+    length = 0
+    while length < min_chars:
+        sentence = _sentence(rng)
+        parts.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(parts)
+
+
+def make_cv(rng: random.Random, chars: int = 3000) -> str:
+    """Generate a synthetic CV."""
+    return "Experience:\n" + make_text(rng, chars)
+
+
+def make_job_description(rng: random.Random, chars: int = 2000) -> str:
+    """Generate a synthetic job description with requirement bullets."""
+    bullets = [f"- Experience with {skill}" for skill in rng.sample(SKILLS, 6)]
+    return "About the role:\n" + make_text(rng, chars) + "\nRequirements:\n" + "\n".join(bullets)
+
+
+def make_system_prompt(rng: random.Random, questions: int = 3) -> str:
+    """Generate interviewer instructions containing a few explicit questions."""
+    asks = [f"Ask how the candidate has used {skill} in production?" for skill in rng.sample(SKILLS, questions)]
+    return "Focus on practical experience. " + " ".join(asks)
+
+
+def make_interview(
+    rng: random.Random,
+    turns: int = 10,
+    cv_chars: int = 3000,
+    jd_chars: int = 2000,
+    answer_chars: int = 400,
+    completed: Optional[bool] = None,
+) -> Interview:
+    """
+    Generate a synthetic interview with a realistic transcript.
+
+    Args:
+        rng: Random generator (seed it for reproducible data)
+        turns: Number of question/answer pairs in the transcript
+        cv_chars: Approximate CV length in characters
+        jd_chars: Approximate job description length in characters
+        answer_chars: Approximate length of each candidate answer
+        completed: Force the completed flag; random when None
+
+    Returns:
+        Interview: The generated interview (not saved)
+    """
+    interview = Interview(
+        cv=make_cv(rng, cv_chars),
+        job_description=make_job_description(rng, jd_chars),
+        system_prompt=make_system_prompt(rng),
+    )
+    start = datetime(2025, 1, 1) + timedelta(minutes=rng.randrange(0, 60 * 24 * 365))
+    interview.created_at = start.isoformat()
+
+    clock = start
+    for _ in range(turns):
+        clock += timedelta(seconds=rng.uniform(2, 8))
+        interview.transcripts.append({
+            "role": "ai",
+            "content": f"Can you tell me about a time you {rng.choice(VERBS)} {rng.choice(NOUNS)}?",
+            "timestamp": clock.isoformat(),
+        })
+        clock += timedelta(seconds=rng.uniform(20, 120))
+        interview.transcripts.append({
+            "role": "candidate",
+            "content": make_text(rng, answer_chars),
+            "timestamp": clock.isoformat(),
+        })
+        interview.evaluations.append({
+            "content": "Clear answer with a concrete example. " + make_text(rng, 150),
+            "timestamp": clock.isoformat(),
+        })
+
+    if completed is None:
+        completed = rng.random() < 0.6
+    if completed:
+        interview.set_rating(rng.randint(1, 10), "Solid candidate. " + make_text(rng, 200))
+    return interview
+
+
+def make_transcript_interview(rng: random.Random, turns: int) -> Interview:
+    """Generate an interview with a long transcript for prompt-building benchmarks."""
+    return make_interview(rng, turns=turns, completed=False)
+
+
+def populate_storage(storage: InterviewStorage, count: int, seed: int = 0, turns: int = 4) -> List[str]:
+    """
+    Fill a storage directory with ``count`` synthetic interviews.
+
+    Small transcripts are used so that large archives can be generated quickly;
+    the archive size is what matters for listing and validation.
+
+    Returns:
+        list: IDs of the stored interviews
+    """
+    rng = random.Random(seed)
+    ids = []
+    for _ in range(count):
+        interview = make_interview(rng, turns=turns, cv_chars=800, jd_chars=600, answer_chars=200)
+        storage.save_interview(interview)
+        ids.append(interview.id)
+    return ids
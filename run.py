@@ -1,22 +1,156 @@
-from app import create_app, socketio
+import argparse
 import os
+import signal
+import sys
 
-# Create the Flask application
-app = create_app()
+# Note: the app is imported only after the async mode is chosen, because eventlet
+# and gevent must monkey patch the standard library before anything else loads.
 
-# Enable maximum debugging
-app.config['DEBUG'] = True
-app.config['FLASK_ENV'] = 'development'
-app.config['PROPAGATE_EXCEPTIONS'] = True
+ASYNC_MODES = ("eventlet", "gevent", "threading")
 
-# Create necessary directories
-os.makedirs(os.path.join(os.getcwd(), "app", "static", "temp"), exist_ok=True)
-os.makedirs(os.path.join(os.getcwd(), "interviews"), exist_ok=True)
 
-if __name__ == '__main__':
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the AI Interviewer application")
+    parser.add_argument("--host", default=os.getenv("HOST", "127.0.0.1"), help="Interface to bind")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "5000")), help="Port (first port with --workers)")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WORKERS", "1")),
+                        help="Number of worker processes sharing a Socket.IO message queue")
+    parser.add_argument("--production", action="store_true",
+                        default=os.getenv("APP_ENV", "").lower() == "production",
+                        help="Production profile: cooperative async mode, no debug/reloader, graceful drain")
+    parser.add_argument("--async-mode", default=os.getenv("ASYNC_MODE", "auto"), choices=("auto",) + ASYNC_MODES,
+                        help="Async mode for the production profile (auto tries gevent, then eventlet)")
+    parser.add_argument("--max-connections", type=int, default=int(os.getenv("MAX_CONNECTIONS", "1000")),
+                        help="Maximum concurrent connections per worker in the production profile")
+    parser.add_argument("--drain-timeout", type=float, default=float(os.getenv("DRAIN_TIMEOUT", "60")),
+                        help="Seconds to wait for in-flight turns on shutdown")
+    return parser.parse_args()
+
+
+def select_async_mode(preferred="auto"):
+    """
+    Pick a cooperative async mode and monkey patch the standard library for it.
+
+    gevent is tried first because the Deepgram client runs asyncio event loops
+    inside worker threads, which gevent's patched selectors handle more reliably.
+    Falls back to threading if neither package is installed.
+    """
+    candidates = ("gevent", "eventlet") if preferred == "auto" else (preferred,)
+    for mode in candidates:
+        try:
+            if mode == "gevent":
+                from gevent import monkey
+                monkey.patch_all()
+            elif mode == "eventlet":
+                import eventlet
+                eventlet.monkey_patch()
+            return mode
+        except ImportError:
+            print(f"Async mode {mode} is not installed")
+    print("Warning: falling back to threading mode; install gevent (and gevent-websocket) for production")
+    return "threading"
+
+
+def server_options(async_mode, max_connections):
+    """Keyword arguments for socketio.run() that cap concurrent connections in the chosen server."""
+    if async_mode == "eventlet":
+        return {"max_size": max_connections}
+    if async_mode == "gevent":
+        from gevent.pool import Pool
+        return {"spawn": Pool(max_connections)}
+    return {}
+
+
+def run_production(args):
+    async_mode = select_async_mode(args.async_mode)
+
+    from app import create_app, socketio
+    from app.serving import in_flight_turns
+    create_directories()
+
+    app = create_app(async_mode=async_mode)
+    app.config['DEBUG'] = False
+    app.config['MAX_CONNECTIONS'] = args.max_connections
+
+    # Resume final assessments that were queued or running when the server stopped
+    from app.routes import assessment_jobs, room_pool
+    assessment_jobs.start()
+    # Have LiveKit rooms ready before the first interview is created
+    room_pool.start()
+
+    def drain_and_exit():
+        print(f"Draining {in_flight_turns.count} in-flight turns (timeout {args.drain_timeout:.0f}s)...")
+        if not in_flight_turns.wait_idle(args.drain_timeout):
+            print(f"Drain timed out with {in_flight_turns.count} turns still running")
+        print("Shutdown complete")
+        sys.stdout.flush()
+        os._exit(0)
+
+    def handle_signal(signum, frame):
+        if in_flight_turns.draining:
+            return
+        print(f"Received signal {signum}, refusing new turns")
+        in_flight_turns.start_draining()
+        # Wait in a background task: signal handlers may run on the event loop itself
+        socketio.start_background_task(drain_and_exit)
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    print(f"Starting AI Interviewer (production, {async_mode}) on {args.host}:{args.port}...")
+    socketio.run(app, host=args.host, port=args.port, debug=False, use_reloader=False, log_output=False,
+                 allow_unsafe_werkzeug=(async_mode == "threading"),
+                 **server_options(async_mode, args.max_connections))
+
+
+def run_development(args):
+    from app import create_app, socketio
+    create_directories()
+
+    # Create the Flask application
+    app = create_app()
+
+    # Enable maximum debugging
+    app.config['DEBUG'] = True
+    app.config['FLASK_ENV'] = 'development'
+    app.config['PROPAGATE_EXCEPTIONS'] = True
+
+    # The reloader would fork a second copy of each worker in multi-worker mode
+    use_reloader = "WORKER_INDEX" not in os.environ
+
+    # Resume unfinished final assessments (in the serving process, not the reloader's watcher)
+    if not use_reloader or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        from app.routes import assessment_jobs
+        assessment_jobs.start()
+
     try:
         print("Starting AI Interviewer application...")
-        socketio.run(app, debug=True, allow_unsafe_werkzeug=True)
+        socketio.run(app, host=args.host, port=args.port, debug=True,
+                     use_reloader=use_reloader, allow_unsafe_werkzeug=True)
     except Exception as e:
         print(f"Error starting application: {e}")
-        raise 
\ No newline at end of file
+        raise
+
+
+def create_directories():
+    os.makedirs(os.path.join(os.getcwd(), "app", "static", "temp"), exist_ok=True)
+    os.makedirs(os.path.join(os.getcwd(), "interviews"), exist_ok=True)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+
+    if args.workers > 1:
+        # Supervisor: start workers on consecutive ports behind a shared message queue
+        from app.cluster import run_workers
+        worker_args = []
+        if args.production:
+            worker_args = ["--production", "--async-mode", args.async_mode,
+                           "--max-connections", str(args.max_connections),
+                           "--drain-timeout", str(args.drain_timeout)]
+        print(f"Starting AI Interviewer with {args.workers} workers...")
+        run_workers(args.workers, host=args.host, base_port=args.port, extra_args=worker_args)
+    elif args.production:
+        run_production(args)
+    else:
+        run_development(args)
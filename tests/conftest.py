@@ -0,0 +1,43 @@
+import os
+import sys
+
+# app.routes builds its provider clients at import time; a well-formed dummy key keeps the Deepgram client happy
+os.environ.setdefault("DEEPGRAM_API_KEY", "0" * 40)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def routes(tmp_path_factory):
+    """app.routes, imported from a scratch directory: it creates its storage in the working directory."""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("app"))
+    try:
+        from app import routes
+    finally:
+        os.chdir(cwd)
+    return routes
+
+
+@pytest.fixture(scope="session")
+def flask_app(routes, tmp_path_factory):
+    """The Flask app with its Socket.IO server, for Socket.IO test clients."""
+    from app import create_app
+
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("flask_app"))
+    try:
+        return create_app()
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.fixture
+def storage(routes, tmp_path, monkeypatch):
+    """A fresh InterviewStorage used by the routes for one test."""
+    from app.models import InterviewStorage
+
+    interview_storage = InterviewStorage(storage_dir=str(tmp_path / "interviews"))
+    monkeypatch.setattr(routes, "interview_storage", interview_storage)
+    return interview_storage
@@ -0,0 +1,44 @@
+import time
+
+from app.adaptive import AdaptiveModeController
+from app.resilience import CircuitBreaker, provider_health
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+def test_breaker_is_open_only_until_reset_timeout():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout_secs=0.05)
+    open_breaker(breaker)
+    assert breaker.is_open()
+    assert not breaker.allow_request()
+
+    time.sleep(0.06)
+    assert not breaker.is_open()
+    assert breaker.allow_request()  # The half-open probe
+
+
+def test_open_groq_circuit_downgrades_until_reset_timeout(monkeypatch):
+    breaker = CircuitBreaker("groq", failure_threshold=1, reset_timeout_secs=0.05)
+    monkeypatch.setattr(provider_health, "breaker", lambda name: breaker)
+    controller = AdaptiveModeController(min_hold_secs=0)
+    open_breaker(breaker)
+
+    decision = controller.decide(False, queue_depth=0)
+    assert decision.quick and decision.downgraded and "circuit" in decision.reason
+
+    time.sleep(0.06)
+    # The next turn goes to Groq again, which probes the breaker
+    assert not controller.decide(False, queue_depth=0).quick
+
+
+def test_only_turn_llm_stages_feed_latency():
+    controller = AdaptiveModeController(min_samples=1)
+    for _ in range(5):
+        controller.on_span("assessment", 40.0, False)
+        controller.on_span("question_plan", 30.0, False)
+    assert controller.llm_latency() is None
+    controller.on_span("llm", 1.5, False)
+    assert controller.llm_latency() == 1.5
@@ -0,0 +1,38 @@
+import pytest
+
+from app.analysis import analyze_interview, extract_prompt_questions
+
+
+@pytest.mark.parametrize("instruction, question", [
+    ("Ask how they handled a conflict in their last team?", "Could you tell me how you handled a conflict in your last team?"),
+    ("Ask the candidate how they have grown their skills?", "Could you tell me how you have grown your skills?"),
+    ("Ask what they're looking for and whether the role suits them?",
+     "Could you tell me what you're looking for and whether the role suits you?"),
+    ("Ask how they taught themselves Rust?", "Could you tell me how you taught yourself Rust?"),
+    ("Ask how she managed her team?", "Could you tell me how you managed your team?"),
+    ("Ask what he is most proud of in his career?", "Could you tell me what you are most proud of in your career?"),
+    ("Ask whether the candidate's manager would recommend them?",
+     "Could you tell me whether your manager would recommend you?"),
+    ("Ask how the candidate handles conflict?", "Could you tell me how you handle conflict?"),
+    ("Ask whether he wants to relocate?", "Could you tell me whether you want to relocate?"),
+    ("Ask what the candidate usually does when a deploy fails?",
+     "Could you tell me what you usually do when a deploy fails?"),
+    ("Ask how she focuses her work?", "Could you tell me how you focus your work?"),
+    ("Ask how he fixes flaky tests?", "Could you tell me how you fix flaky tests?"),
+    ("Ask how she tries new tools?", "Could you tell me how you try new tools?"),
+    ("Ask whether she was ever on call?", "Could you tell me whether you were ever on call?"),
+    ("Ask what he would change?", "Could you tell me what you would change?"),
+    ("How would you design a rate limiter?", "How would you design a rate limiter?"),
+])
+def test_prompt_questions_address_the_candidate(instruction, question):
+    assert extract_prompt_questions(f"Be friendly. {instruction}") == [question]
+
+
+def test_question_bank_has_no_third_person():
+    analysis = analyze_interview(
+        "Python developer with five years of Django experience.",
+        "We need a Python engineer.\n- Build and maintain our Django services for customers",
+        "Ask how they keep their code maintainable? Ask what they learned from them?",
+    )
+    for question in analysis["questions"]:
+        assert not any(word in question.lower().split() for word in ("they", "their", "them"))
@@ -0,0 +1,38 @@
+import numpy as np
+
+from app.audio import find_speech_bounds
+
+RATE = 16000
+
+
+def tone(seconds, level_db, rng):
+    t = np.arange(int(seconds * RATE)) / RATE
+    amplitude = 10 ** (level_db / 20) * np.sqrt(2)  # RMS of a sine is amplitude / sqrt(2)
+    # Speech-like: a voiced tone with a little noise, at a steady level
+    return (amplitude * np.sin(2 * np.pi * 220 * t) + rng.normal(0, amplitude / 50, t.size)).astype(np.float32)
+
+
+def noise(seconds, level_db, rng):
+    return rng.normal(0, 10 ** (level_db / 20), int(seconds * RATE)).astype(np.float32)
+
+
+def test_steady_level_speech_is_not_silent():
+    rng = np.random.default_rng(0)
+    assert find_speech_bounds(tone(3.0, -18, rng), RATE) is not None
+
+
+def test_quiet_noise_is_silent():
+    rng = np.random.default_rng(0)
+    assert find_speech_bounds(noise(3.0, -60, rng), RATE) is None
+
+
+def test_steady_low_hum_is_silent():
+    rng = np.random.default_rng(0)
+    assert find_speech_bounds(tone(3.0, -50, rng), RATE) is None
+
+
+def test_speech_between_pauses_is_trimmed():
+    rng = np.random.default_rng(0)
+    samples = np.concatenate([noise(1.0, -60, rng), tone(1.0, -20, rng), noise(1.0, -60, rng)])
+    start, end = find_speech_bounds(samples, RATE, padding_ms=0)
+    assert abs(start - 1.0) < 0.05 and abs(end - 2.0) < 0.05
@@ -0,0 +1,58 @@
+import pickle
+from multiprocessing.connection import Client
+
+import pytest
+
+from app.cluster import LocalQueueBroker, LocalQueueManager, owner_worker, parse_local_queue_url
+
+
+class Exploit:
+    unpickled = False
+
+    def __reduce__(self):
+        return (Exploit._mark, ())
+
+    @staticmethod
+    def _mark():
+        Exploit.unpickled = True
+        return {}
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    monkeypatch.setenv("SOCKETIO_QUEUE_AUTHKEY", "test-queue-key")
+    broker = LocalQueueBroker(("127.0.0.1", 0)).start()
+    yield broker
+    broker.close()
+
+
+@pytest.mark.parametrize("env", [{}, {"SECRET_KEY": "default-secret-key"}])
+def test_manager_requires_explicit_key(monkeypatch, env):
+    monkeypatch.delenv("SOCKETIO_QUEUE_AUTHKEY", raising=False)
+    monkeypatch.delenv("SECRET_KEY", raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    with pytest.raises(RuntimeError):
+        LocalQueueManager("local://127.0.0.1:5590")
+
+
+def test_messages_are_json_and_pickles_are_ignored(broker):
+    sender = Client(parse_local_queue_url(broker.url), authkey=b"test-queue-key")
+    receiver = LocalQueueManager(broker.url)
+    messages = receiver._listen()
+    receiver._connection()
+
+    publisher = LocalQueueManager(broker.url, write_only=True)
+    sender.send_bytes(pickle.dumps({"method": "emit", "payload": Exploit()}))
+    publisher._publish({"method": "emit", "event": "ai_message", "data": {"message": "Hi"}})
+
+    assert next(messages) == {"method": "emit", "event": "ai_message", "data": {"message": "Hi"}}
+    assert not Exploit.unpickled
+    sender.close()
+
+
+def test_owner_worker_is_stable():
+    workers = ["http://a", "http://b", "http://c"]
+    owner = owner_worker("interview-1", workers)
+    assert owner_worker("interview-1", list(reversed(workers))) == owner
+    assert owner_worker("interview-1", []) is None
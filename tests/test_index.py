@@ -0,0 +1,81 @@
+import threading
+
+from app.models.index import InterviewIndex
+
+
+def make_index(tmp_path, interviews=()):
+    return InterviewIndex(str(tmp_path / ".index.jsonl"), rebuild=lambda: list(interviews))
+
+
+def summary(i, rating=None, completed=False):
+    return {"id": f"id-{i}", "created_at": f"2024-01-01T00:00:{i:05d}", "completed": completed, "rating": rating}
+
+
+def run_with_timeout(target, seconds=30):
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(seconds)
+    assert not thread.is_alive(), "index update deadlocked"
+
+
+def test_append_compacts_log_past_threshold(tmp_path):
+    index = make_index(tmp_path)
+
+    def churn():
+        # Re-rating a few interviews grows the log well past 2 * max(interviews, 1000) lines
+        for n in range(2500):
+            index.update(summary(n % 10, rating=n % 7))
+
+    run_with_timeout(churn)
+    with open(index.log_path) as f:
+        lines = f.readlines()
+    assert len(lines) <= 2000
+    assert len(index) == 10
+    assert index.query(sort="created_at", limit=1)[0][0]["rating"] == 2499 % 7
+
+    # The index keeps working (and locking) after compacting
+    run_with_timeout(lambda: index.update(summary(99)))
+    assert len(index) == 11
+
+
+def test_update_many_compacts(tmp_path):
+    index = make_index(tmp_path)
+    run_with_timeout(lambda: [index.update_many([summary(i, rating=n) for i in range(100)]) for n in range(25)])
+    assert len(index) == 100
+    assert all(item["rating"] == 24 for item in index.query(limit=100)[0])
+
+
+def test_compact_keeps_summaries_and_other_instances_reload(tmp_path):
+    index = make_index(tmp_path)
+    other = make_index(tmp_path)
+    for i in range(20):
+        index.update(summary(i, rating=i % 10, completed=i % 2 == 0))
+    index.remove("id-3")
+    assert len(other) == 19
+
+    index.compact()
+    with open(index.log_path) as f:
+        assert len(f.readlines()) == 19
+    other.update(summary(50, rating=10))
+    assert len(index) == 20
+    page, _ = index.query(sort="rating", order="desc", limit=1)
+    assert page[0]["id"] == "id-50"
+
+
+def test_rebuilds_from_scan_when_log_missing(tmp_path):
+    index = make_index(tmp_path, interviews=[summary(i) for i in range(5)])
+    assert len(index) == 5
+
+
+def test_pagination_cursor(tmp_path):
+    index = make_index(tmp_path)
+    for i in range(25):
+        index.update(summary(i, rating=i % 10))
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = index.query(sort="rating", order="desc", limit=10, cursor=cursor, min_rating=3)
+        seen.extend(item["id"] for item in page)
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == sum(1 for i in range(25) if i % 10 >= 3)
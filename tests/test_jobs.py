@@ -0,0 +1,109 @@
+import os
+import threading
+
+from app.jobs import FAILED, JobQueue
+
+
+def make_queue(tmp_path, **kwargs):
+    return JobQueue(storage_dir=str(tmp_path / "jobs"), **kwargs)
+
+
+def wait_for(event, seconds=10):
+    assert event.wait(seconds), "background job did not run"
+
+
+def job_files(queue):
+    return sorted(os.listdir(queue.storage_dir))
+
+
+def wait_until_idle(queue, job_id, seconds=10):
+    # The job's files are removed once it is finished
+    done = threading.Event()
+
+    def poll():
+        while os.path.exists(queue._job_path(job_id)) or os.path.exists(queue._lock_path(job_id)):
+            if done.wait(0.01):
+                return
+        done.set()
+
+    threading.Thread(target=poll, daemon=True).start()
+    wait_for(done, seconds)
+
+
+def test_finished_job_leaves_no_files(tmp_path):
+    queue = make_queue(tmp_path)
+    ran = threading.Event()
+    queue.register("work", lambda job: ran.set())
+    job = queue.submit("work", {"n": 1})
+    wait_for(ran)
+    wait_until_idle(queue, job["id"])
+    assert job_files(queue) == []
+
+
+def test_pending_job_is_not_submitted_twice(tmp_path):
+    queue = make_queue(tmp_path, workers=1)
+    release = threading.Event()
+    runs = []
+
+    def handler(job):
+        runs.append(job["payload"]["n"])
+        release.wait(10)
+
+    queue.register("work", handler)
+    assert queue.submit("work", {"n": 1}, job_id="fixed") is not None
+    assert queue.submit("work", {"n": 2}, job_id="fixed") is None
+    release.set()
+    wait_until_idle(queue, "fixed")
+    assert runs == [1]
+
+
+def test_failed_job_can_be_resubmitted(tmp_path):
+    queue = make_queue(tmp_path, max_attempts=2)
+    attempts = []
+    succeeded = threading.Event()
+
+    def handler(job):
+        attempts.append(job["attempts"])
+        if not job["payload"]["ok"]:
+            raise RuntimeError("provider down")
+        succeeded.set()
+
+    queue.register("work", handler)
+    queue.submit("work", {"ok": False}, job_id="assessment-1")
+    failed = threading.Event()
+
+    def poll():
+        while not failed.is_set():
+            job = queue._read("assessment-1")
+            if job and job["status"] == FAILED:
+                failed.set()
+            else:
+                threading.Event().wait(0.01)
+
+    threading.Thread(target=poll, daemon=True).start()
+    wait_for(failed)
+    assert attempts == [1, 2]
+    assert not os.path.exists(queue._lock_path("assessment-1"))
+
+    job = queue.submit("work", {"ok": True}, job_id="assessment-1")
+    assert job is not None and job["attempts"] == 0
+    wait_for(succeeded)
+    wait_until_idle(queue, "assessment-1")
+    assert attempts == [1, 2, 1]
+    assert job_files(queue) == []
+
+
+def test_recover_requeues_unfinished_jobs_and_drops_stale_locks(tmp_path):
+    stopped = make_queue(tmp_path)
+    # Stored as if the server stopped before a worker got to it
+    stopped._write({"id": "left", "kind": "work", "priority": 0, "payload": {}, "status": "running",
+                    "attempts": 1, "created_at": "", "updated_at": ""})
+    open(stopped._lock_path("gone"), "w").close()
+
+    queue = make_queue(tmp_path)
+    ran = threading.Event()
+    queue.register("work", lambda job: ran.set())
+    queue.start()
+    wait_for(ran)
+    wait_until_idle(queue, "left")
+    assert job_files(queue) == []
@@ -0,0 +1,104 @@
+import threading
+
+import pytest
+
+from app import socketio
+from app.models import Interview
+
+
+@pytest.fixture
+def join(routes, flask_app, storage, monkeypatch):
+    rendered = []
+    questions = []
+
+    def render_speech(text, interview_id=None, mode=None):
+        rendered.append(text)
+        return f"speech_{len(rendered)}.mp3"
+
+    def generate_interview_question(messages):
+        questions.append(messages)
+        return "What did you learn from that project?"
+
+    monkeypatch.setattr(routes, "render_speech", render_speech)
+    monkeypatch.setattr(routes.llm_service, "generate_interview_question", generate_interview_question)
+    client = socketio.test_client(flask_app)
+
+    def join_once(interview_id):
+        client.get_received()
+        client.emit("join_interview", {"interview_id": interview_id})
+        messages = [event["args"][0] for event in client.get_received() if event["name"] == "ai_message"]
+        assert len(messages) == 1
+        return messages[0]
+
+    join_once.rendered = rendered
+    join_once.questions = questions
+    yield join_once
+    client.disconnect()
+
+
+def test_reconnect_replays_greeting(join, storage):
+    interview = Interview("cv", "job description", "system prompt")
+    storage.save_interview(interview)
+
+    first = join(interview.id)
+    assert first["replay"] is False
+    for _ in range(3):
+        again = join(interview.id)
+        assert again["replay"] is True
+        assert again["message"] == first["message"]
+
+    stored = storage.load_interview(interview.id)
+    assert [entry["role"] for entry in stored.transcripts] == ["ai"]
+    assert stored.transcripts[0]["audio_file"] == "speech_1.mp3"
+    assert len(join.rendered) == 1
+
+
+def test_unanswered_answer_gets_one_question(join, storage):
+    interview = Interview("cv", "job description", "system prompt")
+    interview.add_message("ai", "Tell me about a project.")
+    interview.add_message("candidate", "I built a search engine.")
+    storage.save_interview(interview)
+
+    first = join(interview.id)
+    assert first == {"message": "What did you learn from that project?", "audio_url": "", "replay": False}
+    assert join(interview.id)["replay"] is True
+    assert len(join.questions) == 1
+    assert [entry["role"] for entry in storage.load_interview(interview.id).transcripts] == ["ai", "candidate", "ai"]
+
+
+def test_unknown_interview(routes, flask_app, storage):
+    client = socketio.test_client(flask_app)
+    client.emit("join_interview", {"interview_id": "missing"})
+    assert [event["name"] for event in client.get_received()] == ["error"]
+    client.disconnect()
+
+
+def test_question_generated_without_holding_interview_lock(join, routes, storage, monkeypatch):
+    interview = Interview("cv", "job description", "system prompt")
+    interview.add_message("ai", "Tell me about a project.")
+    interview.add_message("candidate", "I built a search engine.")
+    storage.save_interview(interview)
+
+    def generate_interview_question(messages):
+        # Another worker answers meanwhile; it must not wait for this join
+        saver = threading.Thread(target=storage.update_interview,
+                                 args=(interview.id, lambda i: i.add_message("ai", "Saved elsewhere?")))
+        saver.start()
+        saver.join(2)
+        assert not saver.is_alive()
+        return "What did you learn from that project?"
+
+    monkeypatch.setattr(routes.llm_service, "generate_interview_question", generate_interview_question)
+    message = join(interview.id)
+    assert message["message"] == "Saved elsewhere?"
+    assert message["replay"] is True
+    assert [entry["role"] for entry in storage.load_interview(interview.id).transcripts] == ["ai", "candidate", "ai"]
+    assert not routes.join_generations
+
+
+def test_connection_refused_while_draining_is_counted(routes, flask_app, monkeypatch):
+    before = routes.metrics.get_counter("socketio_connections_rejected_total", reason="draining")
+    monkeypatch.setattr(routes.in_flight_turns, "_draining", True)
+    client = socketio.test_client(flask_app)
+    assert not client.is_connected()
+    assert routes.metrics.get_counter("socketio_connections_rejected_total", reason="draining") == before + 1
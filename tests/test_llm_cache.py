@@ -0,0 +1,51 @@
+import pytest
+
+from app import services
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, content):
+        self._content = content
+
+    def json(self):
+        return {"choices": [{"message": {"content": self._content}}]}
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    sent = []
+
+    def post(url, headers=None, json=None, timeout=None):
+        sent.append(json)
+        return FakeResponse(f"reply {len(sent)}")
+
+    monkeypatch.setattr(services.requests, "post", post)
+    return sent
+
+
+def test_cache_does_not_change_scoring_temperature(monkeypatch, calls):
+    monkeypatch.setenv("LLM_CACHE", "true")
+    monkeypatch.delenv("LLM_SCORING_TEMPERATURE", raising=False)
+    llm = services.LLMService()
+    assert llm.cache is not None
+    assert llm.scoring_temperature == 0.7
+
+    messages = [{"role": "user", "content": "Rate this answer"}]
+    for _ in range(2):
+        llm._chat_completion(messages, max_tokens=10, timeout_secs=5, operation="evaluation",
+                             temperature=llm.scoring_temperature)
+    # Sampled calls are never served from the cache
+    assert [call["temperature"] for call in calls] == [0.7, 0.7]
+
+
+def test_deterministic_calls_are_cached(monkeypatch, calls):
+    monkeypatch.setenv("LLM_CACHE", "true")
+    monkeypatch.setenv("LLM_SCORING_TEMPERATURE", "0")
+    llm = services.LLMService()
+    messages = [{"role": "user", "content": "Rate this answer"}]
+    replies = [llm._chat_completion(messages, max_tokens=10, timeout_secs=5, operation="evaluation",
+                                    temperature=llm.scoring_temperature) for _ in range(2)]
+    assert replies == ["reply 1", "reply 1"]
+    assert len(calls) == 1
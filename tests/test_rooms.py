@@ -0,0 +1,50 @@
+import threading
+import time
+
+from app.rooms import RoomPool
+
+
+class FakeLiveKit:
+    ROOM_EMPTY_TIMEOUT_SECS = 3600
+
+    def __init__(self, url):
+        self.url = url
+        self.created = []
+        self.lock = threading.Lock()
+
+    def create_room(self, room_name):
+        with self.lock:
+            self.created.append(room_name)
+        return room_name
+
+
+def wait_until(condition, seconds=5):
+    deadline = time.monotonic() + seconds
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_unconfigured_livekit_creates_no_rooms():
+    livekit = FakeLiveKit(url=None)
+    pool = RoomPool(livekit, size=5, workers=2)
+    rooms = pool.acquire_many(3)
+    assert len(set(rooms)) == 3
+    time.sleep(0.1)
+    assert livekit.created == []
+    assert pool.available == 0
+
+
+def test_pool_hands_out_precreated_rooms_and_refills():
+    livekit = FakeLiveKit(url="https://livekit.example")
+    pool = RoomPool(livekit, size=3, workers=2)
+    pool.start()
+    wait_until(lambda: pool.available == 3)
+    room = pool.acquire()
+    assert room in livekit.created
+    wait_until(lambda: pool.available == 3)
+
+    # More than the pool holds: the rest are created on demand
+    rooms = pool.acquire_many(5)
+    assert len(set(rooms)) == 5
+    wait_until(lambda: all(name in livekit.created for name in rooms))
@@ -0,0 +1,106 @@
+import os
+import shutil
+
+import pytest
+
+from app import migrate
+from app.models import Interview, InterviewStorage
+from app.models import blobs as blob_module
+from app.models.blobs import BLOB_DIR
+from app.models.serialization import COMPACT_VERSION, LEGACY_VERSION, SECTIONED_MAGIC, decode
+from app.utils import validate_all_interview_files
+
+JOB_DESCRIPTION = "We are hiring a backend engineer to build our Python services. " * 10
+SYSTEM_PROMPT = "Be friendly and ask about distributed systems. Ask how they handled outages? " * 5
+
+
+def make_interviews(count):
+    interviews = []
+    for i in range(count):
+        interview = Interview(f"CV of candidate {i}: Python, Django, PostgreSQL.", JOB_DESCRIPTION, SYSTEM_PROMPT)
+        interview.add_message("ai", "Could you tell me about your background?")
+        interview.add_message("candidate", f"I have {i + 2} years of experience.")
+        interview.add_message("evaluation", "Clear and relevant.")
+        interview.question_plan = ["How do you design for failure?"]
+        if i % 2 == 0:
+            interview.completed = True
+            interview.rating = 7
+            interview.verdict = "Hire"
+        interviews.append(interview)
+    return interviews
+
+
+def file_bytes(storage, interview_id):
+    with open(os.path.join(storage.storage_dir, f"{interview_id}.json"), "rb") as f:
+        return f.read()
+
+
+@pytest.fixture
+def legacy_archive(tmp_path):
+    storage = InterviewStorage(storage_dir=str(tmp_path / "interviews"), format_version=LEGACY_VERSION)
+    interviews = make_interviews(4)
+    for interview in interviews:
+        storage.save_interview(interview)
+    return storage.storage_dir, {interview.id: interview.to_dict() for interview in interviews}
+
+
+def migrate_to(storage_dir, version):
+    migrate.main(["--storage-dir", storage_dir, "--format", str(version), "--idle-hours", "0"])
+    return InterviewStorage(storage_dir=storage_dir, format_version=version)
+
+
+def test_legacy_to_sectioned_round_trip_with_blobs(legacy_archive):
+    storage_dir, expected = legacy_archive
+    storage = migrate_to(storage_dir, 3)
+
+    blob_files = os.listdir(os.path.join(storage_dir, BLOB_DIR))
+    assert len(blob_files) == 2  # One job description and one system prompt for all interviews
+    for interview_id, data in expected.items():
+        raw = file_bytes(storage, interview_id)
+        assert raw.startswith(SECTIONED_MAGIC)
+        assert JOB_DESCRIPTION.encode("utf-8") not in raw
+        assert storage.load_interview(interview_id).to_dict() == data
+        assert storage.load_interview(interview_id, lazy=True).to_dict() == data
+
+    # Interviews loaded with the same text share one string
+    first, second = (storage.load_interview(interview_id) for interview_id in list(expected)[:2])
+    assert first.job_description is second.job_description
+
+
+def test_rollback_inlines_shared_texts(legacy_archive):
+    storage_dir, expected = legacy_archive
+    migrate_to(storage_dir, 3)
+    for version in (COMPACT_VERSION, LEGACY_VERSION):
+        storage = migrate_to(storage_dir, version)
+        for interview_id, data in expected.items():
+            # Readable without the blob store
+            data_without_blobs, stored_version, _ = decode(file_bytes(storage, interview_id))
+            assert stored_version == version and data_without_blobs["job_description"] == JOB_DESCRIPTION
+            assert storage.load_interview(interview_id).to_dict() == data
+    # Blobs are left in place (never garbage-collected), but nothing refers to them any more
+    shutil.rmtree(os.path.join(storage_dir, BLOB_DIR))
+    storage = InterviewStorage(storage_dir=storage_dir, format_version=LEGACY_VERSION)
+    assert all(storage.load_interview(interview_id).to_dict() == data for interview_id, data in expected.items())
+
+
+def test_lost_blobs_are_not_repaired(legacy_archive, monkeypatch):
+    storage_dir, expected = legacy_archive
+    migrate_to(storage_dir, 3)
+    shutil.rmtree(os.path.join(storage_dir, BLOB_DIR))
+    monkeypatch.setattr(blob_module, "_stores", {})  # Forget cached texts, like a restarted process
+
+    storage = InterviewStorage(storage_dir=storage_dir)
+    interview_id = next(iter(expected))
+    before = file_bytes(storage, interview_id)
+    assert storage.load_interview(interview_id) is None
+    validate_all_interview_files(storage_dir)
+    assert file_bytes(storage, interview_id) == before
+    assert not any(name.endswith("_corrupted.json") for name in os.listdir(storage_dir))
+
+
+def test_inline_storage_writes_no_blobs(tmp_path):
+    storage = InterviewStorage(storage_dir=str(tmp_path / "interviews"), share_texts=False)
+    interview = make_interviews(1)[0]
+    storage.save_interview(interview)
+    assert not os.path.exists(os.path.join(storage.storage_dir, BLOB_DIR))
+    assert storage.load_interview(interview.id).to_dict() == interview.to_dict()
@@ -0,0 +1,156 @@
+from app import services
+from app.models import Interview
+
+
+def test_turn_save_keeps_plan_stored_meanwhile(routes, storage, monkeypatch):
+    interview = Interview("cv", "job description", "system prompt")
+    storage.save_interview(interview)
+
+    # A turn loads the interview, then the background plan lands before the turn saves
+    turn_copy = storage.load_interview(interview.id)
+    monkeypatch.setattr(routes.llm_service, "generate_question_plan", lambda cv, jd, sp: ["Q1?", "Q2?"])
+    routes.prepare_question_plan(interview.id, "cv", "job description", "system prompt")
+    turn_copy.add_message("candidate", "An answer")
+    routes.save_interview_timed(turn_copy)
+
+    stored = storage.load_interview(interview.id)
+    assert stored.question_plan == ["Q1?", "Q2?"]
+    assert [entry["content"] for entry in stored.transcripts] == ["An answer"]
+
+
+def test_turn_save_without_plan(routes, storage):
+    interview = Interview("cv", "job description", "system prompt")
+    storage.save_interview(interview)
+    interview.add_message("candidate", "An answer")
+    routes.save_interview_timed(interview)
+    assert storage.load_interview(interview.id).question_plan == []
+
+
+class Emitted(list):
+    def __call__(self, event, data=None, **kwargs):
+        self.append((event, data))
+
+
+def stub_turn_services(routes, monkeypatch):
+    emitted = Emitted()
+    monkeypatch.setattr(routes.socketio, "emit", emitted)
+    monkeypatch.setattr(routes, "render_speech", lambda text, interview_id=None, mode=None: None)
+
+    def no_llm(*args, **kwargs):
+        raise AssertionError("quick turns must not call the LLM")
+
+    monkeypatch.setattr(routes.llm_service, "generate_response_evaluation", no_llm)
+    monkeypatch.setattr(routes.llm_service, "generate_interview_question", no_llm)
+    return emitted
+
+
+def test_downgraded_text_turn_is_quick_and_recorded(routes, storage, monkeypatch):
+    from app.adaptive import TurnDecision
+
+    emitted = stub_turn_services(routes, monkeypatch)
+    interview = Interview("cv", "job description", "system prompt")
+    interview.question_plan = ["Planned question?"]
+    interview.add_message("ai", "Welcome!")
+    storage.save_interview(interview)
+
+    decision = TurnDecision(quick=True, downgraded=True, reason="llm_latency 9.0s > 8.0s")
+    routes.handle_text_response(interview, interview.id, "My answer", "quick", decision)
+
+    stored = storage.load_interview(interview.id)
+    assert [entry["content"] for entry in stored.transcripts] == ["Welcome!", "My answer", "Planned question?"]
+    assert stored.evaluations == []
+    assert [d["reason"] for d in stored.mode_decisions] == ["llm_latency 9.0s > 8.0s"]
+    assert ("ai_message", {"message": "Planned question?", "audio_url": ""}) in emitted
+
+
+def test_silent_clip_records_no_decision(routes, storage, monkeypatch):
+    from flask import Flask
+
+    from app.adaptive import TurnDecision
+    from app.audio import PreprocessedAudio
+
+    stub_turn_services(routes, monkeypatch)
+    monkeypatch.setattr(routes.speech_service, "preprocess_audio", lambda audio: PreprocessedAudio(b"", 100, is_silent=True))
+    monkeypatch.setattr(routes.speech_service, "save_audio", lambda audio, path: None)
+    interview = Interview("cv", "job description", "system prompt")
+    storage.save_interview(interview)
+
+    decision = TurnDecision(quick=True, downgraded=True, reason="queue_depth 30 > 20")
+    routes._process_audio_turn(Flask(__name__), b"\0" * 100, interview, interview.id, decision, None)
+
+    assert interview.mode_decisions == []
+    assert storage.load_interview(interview.id).mode_decisions == []
+
+
+def test_streamed_turn_archives_recording_in_background(routes, storage, monkeypatch):
+    from flask import Flask
+
+    from app.adaptive import TurnDecision
+    from app.audio import PreprocessedAudio
+
+    emitted = stub_turn_services(routes, monkeypatch)
+    tasks = []
+    saved = []
+    monkeypatch.setattr(routes.socketio, "start_background_task", lambda target, *args: tasks.append((target, args)))
+    monkeypatch.setattr(routes.speech_service, "save_audio", lambda audio, path: saved.append(audio))
+
+    def preprocess(audio):
+        # Only the archive task may decode the recording, after the transcript went out
+        assert ("transcription_result", {"transcript": "Live answer"}) in emitted
+        return PreprocessedAudio(b"trimmed", len(audio))
+
+    monkeypatch.setattr(routes.speech_service, "preprocess_audio", preprocess)
+    interview = Interview("cv", "job description", "system prompt")
+    interview.question_plan = ["Planned question?"]
+    storage.save_interview(interview)
+
+    routes._process_audio_turn(Flask(__name__), b"raw" * 100, interview, interview.id,
+                               TurnDecision(quick=True, downgraded=True), "Live answer")
+    assert [target for target, _ in tasks] == [routes.archive_recording]
+    assert saved == []
+    target, args = tasks[0]
+    target(*args)
+    assert saved == [b"trimmed"]
+
+
+def test_create_interview_queues_persistent_plan_job(routes, flask_app, storage, monkeypatch):
+    submitted = []
+    monkeypatch.setattr(routes.assessment_jobs, "submit", lambda kind, payload, **kwargs: submitted.append((kind, payload, kwargs)))
+
+    response = flask_app.test_client().post("/create_interview", data={
+        "cv": "cv", "job_description": "job description", "system_prompt": "system prompt",
+    })
+    assert response.status_code == 200
+    interview_id = response.get_json()["interview_id"]
+    assert submitted == [("question_plans", {"interview_ids": [interview_id]},
+                          {"priority": routes.QUESTION_PLAN_PRIORITY_SINGLE, "job_id": f"question-plan-{interview_id}"})]
+
+    # The job prepares and stores the plan, and skips interviews that already have one
+    plans = []
+    monkeypatch.setattr(routes.llm_service, "generate_question_plan", lambda cv, jd, sp: plans.append(cv) or ["Q1?"])
+    job = {"payload": submitted[0][1]}
+    routes.run_question_plans(job)
+    routes.run_question_plans(job)
+    assert storage.load_interview(interview_id).question_plan == ["Q1?"]
+    assert plans == ["cv"]
+
+
+def test_hedged_speech_keeps_voice_and_failure_is_not_retried(routes, monkeypatch):
+    voices = []
+
+    class Response:
+        status_code = 500
+        content = b""
+
+    def post(url, headers=None, json=None, timeout=None):
+        voices.append(json["voice"])
+        return Response()
+
+    def call(func, timeout_secs, operation, hedge_func=None):
+        # Race the hedge as a slow primary would
+        return hedge_func() or func()
+
+    monkeypatch.setattr(services.requests, "post", post)
+    monkeypatch.setattr(routes.provider_health.breaker("deepgram"), "call", call)
+    assert routes.render_speech("Tell me about a project.") is None
+    assert voices == ["aura-professional", "aura-professional"]